@@ -0,0 +1,143 @@
+"""
+Benchmark do andamento local (WSOLA) contra a taxa do Edge TTS
+Mede a latência de mudar a velocidade de um parágrafo já sintetizado e
+compara duração, tom e envelope espectral com o áudio pedido ao servidor
+já na taxa final
+Uso: python benchmarks/bench_andamento.py [--texto TEXTO] [--voz VOZ] [--offline]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'engines'))
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from dsp_audio import esticar_tempo, pcm_para_array
+
+
+FREQUENCIA = 24000
+VELOCIDADES = [-30, -15, 15, 30, 50, 100]
+
+TEXTO_PADRAO = (
+    "Lin Ming respirou fundo e olhou para o vale coberto de névoa. "
+    "Ainda havia muito caminho pela frente, mas pela primeira vez em meses "
+    "ele sentia que cada passo o levava para mais perto do topo da montanha."
+)
+
+
+def carregar(arquivo: str) -> np.ndarray:
+    """Decodifica um MP3 para float32 mono no formato do mixer."""
+    return pcm_para_array(pygame.mixer.Sound(arquivo).get_raw(), 1)
+
+
+def tom_medio(amostras: np.ndarray) -> float:
+    """Frequência fundamental média (autocorrelação em quadros com voz)."""
+    sinal = amostras[:, 0]
+    tamanho = int(0.040 * FREQUENCIA)
+    minimo, maximo = FREQUENCIA // 400, FREQUENCIA // 70
+    energia_min = 0.1 * np.sqrt(np.mean(sinal ** 2))
+    tons = []
+    for inicio in range(0, len(sinal) - tamanho, tamanho):
+        quadro = sinal[inicio:inicio + tamanho]
+        if np.sqrt(np.mean(quadro ** 2)) < energia_min:
+            continue
+        auto = np.correlate(quadro, quadro, mode='full')[tamanho - 1:]
+        atraso = minimo + int(np.argmax(auto[minimo:maximo]))
+        if auto[atraso] > 0.3 * auto[0]:
+            tons.append(FREQUENCIA / atraso)
+    return float(np.median(tons)) if tons else 0.0
+
+
+def envelope(amostras: np.ndarray) -> np.ndarray:
+    """Espectro médio em dB (1024 pontos), independente da duração."""
+    sinal = amostras[:, 0]
+    quadros = [sinal[i:i + 1024] * np.hanning(1024)
+               for i in range(0, len(sinal) - 1024, 512)]
+    espectro = np.mean(np.abs(np.fft.rfft(quadros, axis=1)) ** 2, axis=0)
+    return 10 * np.log10(espectro + 1e-10)
+
+
+def distancia_espectral(a: np.ndarray, b: np.ndarray) -> float:
+    """Distância RMS (dB) entre os envelopes, sem diferença de nível global."""
+    ea, eb = envelope(a), envelope(b)
+    diferenca = (ea - ea.mean()) - (eb - eb.mean())
+    return float(np.sqrt(np.mean(diferenca ** 2)))
+
+
+def sinal_sintetico(segundos: float = 12.0) -> np.ndarray:
+    """Voz aproximada (harmônicos de 140 Hz com sílabas) para o modo offline."""
+    t = np.arange(int(segundos * FREQUENCIA)) / FREQUENCIA
+    sinal = sum(np.sin(2 * np.pi * 140 * h * t) / h for h in range(1, 8))
+    silabas = 0.55 + 0.45 * np.sin(2 * np.pi * 4 * t)
+    return (0.25 * sinal * silabas).astype(np.float32)[:, None]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Andamento local vs taxa do servidor')
+    parser.add_argument('--texto', type=str, default=TEXTO_PADRAO)
+    parser.add_argument('--voz', type=str, default='pt-BR-FranciscaNeural')
+    parser.add_argument('--offline', action='store_true', help='Não usar o Edge TTS')
+    args = parser.parse_args()
+
+    pygame.mixer.init(frequency=FREQUENCIA, size=-16, channels=1)
+
+    servico = None
+    if not args.offline:
+        try:
+            from servico_sintese import ServicoSintese, obter_servico
+            servico = obter_servico()
+            inicio = time.perf_counter()
+            base = carregar(servico.sintetizar(args.texto, args.voz, '+0%').result())
+            print(f"\n🌐 Síntese base: {time.perf_counter() - inicio:.2f}s")
+        except Exception as e:
+            print(f"\n⚠️ Edge TTS indisponível ({e}), usando sinal sintético")
+            servico = None
+    if servico is None:
+        base = sinal_sintetico()
+
+    duracao = len(base) / FREQUENCIA
+    tom_base = tom_medio(base)
+    print(f"🎙️ Parágrafo base: {duracao:.1f}s, tom {tom_base:.0f} Hz\n")
+
+    cabecalho = f"  {'vel':>5} {'local':>9} {'dur':>7} {'tom':>7}"
+    if servico:
+        cabecalho += f" {'servidor':>9} {'dur':>7} {'tom':>7} {'dist':>8}"
+    print(cabecalho)
+
+    for velocidade in VELOCIDADES:
+        fator = 1.0 + velocidade / 100.0
+
+        inicio = time.perf_counter()
+        local = esticar_tempo(base, fator, FREQUENCIA)
+        tempo_local = time.perf_counter() - inicio
+
+        linha = (f"  {velocidade:+4d}% {tempo_local * 1000:7.1f}ms "
+                 f"{len(local) / FREQUENCIA / (duracao / fator):6.2f}x "
+                 f"{tom_medio(local):5.0f}Hz")
+
+        if servico:
+            # Sem o cache em disco do serviço, senão a segunda execução mede o disco
+            rate = ServicoSintese.formatar_taxa(velocidade)
+            inicio = time.perf_counter()
+            remoto = carregar(servico.sintetizar(args.texto + ' ', args.voz, rate).result())
+            tempo_remoto = time.perf_counter() - inicio
+            linha += (f" {tempo_remoto * 1000:7.0f}ms "
+                      f"{len(remoto) / FREQUENCIA / (duracao / fator):6.2f}x "
+                      f"{tom_medio(remoto):5.0f}Hz "
+                      f"{distancia_espectral(local, remoto):6.2f}dB")
+        print(linha)
+
+    print("\n  dur: duração obtida / duração esperada (base ÷ fator)")
+    if servico:
+        print("  dist: diferença RMS entre os espectros médios do local e do servidor")
+
+
+if __name__ == "__main__":
+    main()
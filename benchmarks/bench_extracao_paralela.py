@@ -0,0 +1,171 @@
+"""
+Benchmark da extração paralela contra um servidor HTTP local
+Verifica o espaçamento do token bucket, o backoff em erros transitórios
+(503 e 429 com Retry-After) e a retomada pelo checkpoint, sem acessar o site
+Uso: python benchmarks/bench_extracao_paralela.py [--capitulos N] [--taxa REQ_S] [--trabalhadores N]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from extratores.extracao_paralela import ExtracaoParalela
+
+
+class ServidorCapitulos(ThreadingHTTPServer):
+    """Servidor de capítulos falsos que registra o instante de cada requisição."""
+
+    daemon_threads = True
+
+    def __init__(self, falhas_503=(), falhas_429=()):
+        super().__init__(('127.0.0.1', 0), ManipuladorCapitulos)
+        self.pendentes_503 = set(falhas_503)  # Falham uma vez com 503
+        self.pendentes_429 = set(falhas_429)  # Falham uma vez com 429 + Retry-After
+        self.requisicoes = []  # [(instante, numero)]
+        self.lock = threading.Lock()
+
+    @property
+    def modelo_url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}/capitulo-{{numero}}/'
+
+    def zerar(self):
+        with self.lock:
+            self.requisicoes = []
+
+
+class ManipuladorCapitulos(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        numero = int(self.path.strip('/').split('-')[-1])
+        servidor = self.server
+        with servidor.lock:
+            servidor.requisicoes.append((time.monotonic(), numero))
+            if numero in servidor.pendentes_503:
+                servidor.pendentes_503.discard(numero)
+                status = 503
+            elif numero in servidor.pendentes_429:
+                servidor.pendentes_429.discard(numero)
+                status = 429
+            else:
+                status = 200
+
+        corpo = f'<html><body><h1>Capítulo {numero}</h1><p>Texto do capítulo {numero}.</p></body></html>'
+        dados = corpo.encode('utf-8') if status == 200 else b''
+        self.send_response(status)
+        if status == 429:
+            self.send_header('Retry-After', '1')
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, *args):
+        pass
+
+
+class ExtratorLocal:
+    """Extrator mínimo (baixar_html, processar_html, salvar_capitulo) para o servidor local."""
+
+    def __init__(self):
+        self.session = requests.Session()
+
+    def baixar_html(self, url: str) -> str:
+        resposta = self.session.get(url, timeout=10)
+        resposta.raise_for_status()
+        return resposta.text
+
+    def processar_html(self, html: str, url: str):
+        inicio = html.index('<p>') + 3
+        return {'titulo': url, 'conteudo': [html[inicio:html.index('</p>')]]}
+
+    def salvar_capitulo(self, capitulo, caminho_novel: str):
+        pasta = os.path.join(caminho_novel, 'capitulos')
+        os.makedirs(pasta, exist_ok=True)
+        with open(os.path.join(pasta, f"cap_{capitulo['numero']:04d}.json"), 'w', encoding='utf-8') as f:
+            json.dump(capitulo, f, ensure_ascii=False)
+
+
+def executar(servidor, caminho_novel: str, numeros, taxa: float, trabalhadores: int):
+    """Roda uma extração e retorna (resumo, segundos, requisições feitas)."""
+    servidor.zerar()
+    motor = ExtracaoParalela(ExtratorLocal, caminho_novel, servidor.modelo_url,
+                             trabalhadores=trabalhadores, requisicoes_por_segundo=taxa,
+                             rajada=1, tentativas=3, backoff_base=0.05)
+    inicio = time.perf_counter()
+    resumo = motor.executar(numeros)
+    return resumo, time.perf_counter() - inicio, list(servidor.requisicoes)
+
+
+def verificar(condicao: bool, mensagem: str):
+    print(f"  {'✓' if condicao else '❌'} {mensagem}")
+    if not condicao:
+        raise SystemExit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extração paralela contra um servidor local')
+    parser.add_argument('--capitulos', type=int, default=20)
+    parser.add_argument('--taxa', type=float, default=10.0, help='Requisições por segundo')
+    parser.add_argument('--trabalhadores', type=int, default=4)
+    args = parser.parse_args()
+
+    numeros = list(range(1, args.capitulos + 1))
+    servidor = ServidorCapitulos(falhas_503={5}, falhas_429={9})
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    caminho_novel = tempfile.mkdtemp(prefix='bench_extracao_')
+
+    try:
+        print(f"\n🌐 Servidor local: {servidor.modelo_url}")
+        print(f"📥 {args.capitulos} capítulos, {args.trabalhadores} trabalhadores, {args.taxa:.0f} req/s\n")
+
+        # 1. Extração completa: taxa respeitada, 503 e 429 repetidos com backoff
+        resumo, segundos, requisicoes = executar(servidor, caminho_novel, numeros,
+                                                 args.taxa, args.trabalhadores)
+        instantes = sorted(t for t, _ in requisicoes)
+        intervalos = [b - a for a, b in zip(instantes, instantes[1:])]
+        print(f"Extração: {segundos:.2f}s, {len(requisicoes)} requisições, "
+              f"intervalo mínimo {min(intervalos) * 1000:.0f}ms")
+        verificar(sorted(resumo['sucessos']) == numeros, "todos os capítulos extraídos")
+        verificar(len(requisicoes) == len(numeros) + 2, "uma repetição para o 503 e uma para o 429")
+        taxa_media = (len(instantes) - 1) / (instantes[-1] - instantes[0])
+        verificar(taxa_media <= args.taxa * 1.1,
+                  f"taxa média {taxa_media:.1f} req/s dentro do limite")
+        verificar(min(intervalos) >= 0.8 / args.taxa,
+                  "nenhum par de requisições mais próximo que o token bucket permite")
+        repeticao_429 = [t for t, n in requisicoes if n == 9]
+        verificar(repeticao_429[1] - repeticao_429[0] >= 0.95, "Retry-After do 429 respeitado")
+
+        # 2. Retomada: nada a baixar de novo
+        resumo, _, requisicoes = executar(servidor, caminho_novel, numeros,
+                                          args.taxa, args.trabalhadores)
+        print("\nRetomada:")
+        verificar(not requisicoes and len(resumo['pulados']) == len(numeros),
+                  "capítulos salvos são pulados sem requisições")
+
+        # 3. Arquivo apagado e arquivo corrompido depois do checkpoint
+        pasta = os.path.join(caminho_novel, 'capitulos')
+        os.remove(os.path.join(pasta, 'cap_0003.json'))
+        with open(os.path.join(pasta, 'cap_0004.json'), 'w', encoding='utf-8') as f:
+            f.write('{"numero": 4, "conteu')
+        resumo, _, requisicoes = executar(servidor, caminho_novel, numeros,
+                                          args.taxa, args.trabalhadores)
+        verificar(sorted(n for _, n in requisicoes) == [3, 4] and sorted(resumo['sucessos']) == [3, 4],
+                  "arquivo apagado ou corrompido é baixado de novo apesar do checkpoint")
+        print()
+    finally:
+        servidor.shutdown()
+        shutil.rmtree(caminho_novel, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark da identificação de personagens
+Compara uma regex por personagem (implementação anterior) com o padrão
+único da wiki, em um capítulo com uma wiki de 500 nomes (parte deles
+contida em outros, como "Ming" em "Lin Ming" e "Yi" em "Yi Yun")
+Uso: python benchmarks/bench_identificar_personagens.py [--nomes N] [--repeticoes N]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from wiki_personagens import WikiPersonagens
+
+
+SILABAS = ['yi', 'yun', 'lin', 'xin', 'tong', 'jiang', 'chen', 'bai', 'feng', 'long',
+           'mu', 'qing', 'shan', 'hua', 'zhao', 'wei', 'han', 'li', 'zhu', 'ming']
+
+TITULOS = ['Ancião', 'Mestre', 'Senhor', 'Princesa', 'Imperador', 'Patriarca']
+
+
+def gerar_nomes(quantidade: int, aninhados: int = 40):
+    """
+    Nomes no estilo das novels chinesas (sobrenome + nome, sem repetição).
+
+    Os últimos `aninhados` são o sobrenome ou o nome de outro personagem
+    sozinhos, para testar nomes contidos em nomes mais longos.
+    """
+    nomes = set()
+    while len(nomes) < quantidade - aninhados:
+        sobrenome = random.choice(SILABAS).capitalize()
+        nome = ''.join(random.choice(SILABAS) for _ in range(random.randint(1, 2))).capitalize()
+        nomes.add(f'{sobrenome} {nome}')
+    completos = sorted(nomes)
+    while len(nomes) < quantidade:
+        nomes.add(random.choice(random.choice(completos).split()))
+    return sorted(nomes)
+
+
+def gerar_capitulo(nomes, paragrafos: int = 80):
+    """Capítulo sintético (~5000 palavras) citando alguns personagens."""
+    palavras = ('a energia yuan fluía pelo corpo enquanto os anciões da tribo '
+                'observavam em silêncio a montanha distante sob o céu').split()
+    citados = random.sample(nomes, 25)
+    texto = []
+    for _ in range(paragrafos):
+        frase = [random.choice(palavras) for _ in range(60)]
+        for _ in range(2):
+            frase.insert(random.randrange(len(frase)), random.choice(citados))
+        texto.append(' '.join(frase).capitalize() + '.')
+    return texto
+
+
+def identificar_antigo(personagens, texto):
+    """Implementação anterior: uma regex por personagem a cada texto."""
+    encontrados = []
+    for nome in personagens:
+        if re.search(rf'\b{re.escape(nome)}\b', texto, re.IGNORECASE):
+            encontrados.append(nome)
+    return encontrados
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da identificação de personagens')
+    parser.add_argument('--nomes', type=int, default=500)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(42)
+    nomes = gerar_nomes(args.nomes)
+    paragrafos = gerar_capitulo(nomes)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        wiki = WikiPersonagens(os.path.join(pasta, 'novels', 'bench'), intervalo_descarga=0)
+        for nome in nomes:
+            wiki.personagens[nome] = {'nome': nome, 'aliases': [], 'titulos': []}
+        wiki._identificador = None
+
+        palavras = sum(len(p.split()) for p in paragrafos)
+        simples = [n for n in nomes if ' ' not in n]
+        aninhados = sum(1 for p in paragrafos if identificar_antigo(simples, p))
+        print(f"\n📖 Capítulo com {len(paragrafos)} parágrafos ({palavras} palavras), "
+              f"wiki com {len(nomes)} personagens, {aninhados} parágrafos com nomes aninhados\n")
+
+        # Mesmos resultados, na mesma ordem (antes dos títulos: o antigo não os conhece)
+        for paragrafo in paragrafos:
+            antigo = identificar_antigo(wiki.personagens, paragrafo)
+            novo = wiki.identificar_personagens_texto(paragrafo)
+            assert novo == antigo, (antigo, novo)
+        print("  ✓ Mesmos personagens que a implementação anterior\n")
+
+        # Alguns títulos, para o padrão único ter o mesmo trabalho que terá na prática
+        for nome in random.sample(nomes, 50):
+            wiki.personagens[nome]['titulos'].append(f'{random.choice(TITULOS)} {nome.split()[0]}')
+
+        inicio = time.perf_counter()
+        wiki._identificador = None
+        wiki._obter_identificador()
+        compilacao = (time.perf_counter() - inicio) * 1000
+
+        def medir(funcao):
+            inicio = time.perf_counter()
+            for _ in range(args.repeticoes):
+                for paragrafo in paragrafos:
+                    funcao(paragrafo)
+            return (time.perf_counter() - inicio) / args.repeticoes * 1000
+
+        antigo = medir(lambda t: identificar_antigo(wiki.personagens, t))
+        novo = medir(wiki.identificar_personagens_texto)
+
+        print(f"  {'Uma regex por personagem (antigo)':<36} {antigo:9.1f} ms/capítulo")
+        print(f"  {'Padrão único (trie)':<36} {novo:9.1f} ms/capítulo")
+        print(f"  {'Compilação do padrão (1x por mudança)':<36} {compilacao:9.1f} ms")
+        print(f"\n⚡ Ganho: {antigo / novo:.0f}x\n")
+
+
+if __name__ == "__main__":
+    main()
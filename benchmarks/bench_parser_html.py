@@ -0,0 +1,126 @@
+"""
+Benchmark do parsing de capítulos
+Compara o parser atual (árvore completa com html.parser) com o lxml e com
+a árvore seletiva, em páginas salvas no cache HTTP
+Uso: python benchmarks/bench_parser_html.py [pasta_com_html] [--repeticoes N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from extratores.cache_http import CacheHTTP
+from extratores.centralnovel import ExtratorCentralNovel
+from extratores.parser_html import LXML_DISPONIVEL, criar_soup
+
+
+def carregar_paginas(pasta: str = None, limite: int = 50):
+    """Lê páginas de uma pasta (*.html) ou do cache HTTP dos extratores."""
+    paginas = []
+    if pasta:
+        for nome in sorted(os.listdir(pasta))[:limite]:
+            if nome.endswith(('.html', '.htm')):
+                with open(os.path.join(pasta, nome), 'r', encoding='utf-8', errors='replace') as f:
+                    paginas.append(f.read())
+        return paginas
+
+    cache = CacheHTTP()
+    for url in cache.urls():
+        html = cache.ler(url)
+        if html:
+            paginas.append(html)
+        if len(paginas) >= limite:
+            break
+    return paginas
+
+
+def pagina_sintetica(numero: int) -> str:
+    """Página no formato de um tema WordPress (menu, scripts, comentários, sidebar)."""
+    random.seed(numero)
+    palavras = ('Yi Yun olhou para o céu enquanto a energia yuan fluía pelo seu corpo '
+                'e os anciões da tribo observavam em silêncio a montanha distante').split()
+    frase = lambda n: ' '.join(random.choice(palavras) for _ in range(n))
+
+    menu = ''.join(f'<li class="menu-item"><a href="/pagina-{i}/">{frase(2)}</a></li>' for i in range(80))
+    scripts = ''.join(f'<script type="text/javascript">var dados{i} = {{"a": {i}}};</script>' for i in range(20))
+    paragrafos = ''.join(f'<p>{frase(random.randint(20, 90))}</p>' for _ in range(60))
+    comentarios = ''.join(
+        f'<li class="comment"><div class="comment-body"><p>{frase(15)}</p>'
+        f'<div class="reply"><a href="#">Responder</a></div></div></li>' for _ in range(40)
+    )
+    sidebar = ''.join(f'<div class="widget"><h3>{frase(3)}</h3><ul>{menu[:2000]}</ul></div>' for _ in range(5))
+
+    return (
+        f'<!DOCTYPE html><html lang="pt-BR"><head><meta charset="UTF-8"><title>Capítulo {numero}</title>'
+        f'{scripts}</head><body><header><nav><ul>{menu}</ul></nav></header>'
+        f'<main><h1 class="entry-title">Martial World - Capítulo {numero}</h1>'
+        f'<article class="post"><div class="entry-content">{paragrafos}'
+        f'<p>Prev Índice Next</p></div></article>'
+        f'<section class="comments"><ol>{comentarios}</ol></section></main>'
+        f'<aside>{sidebar}</aside><footer>{frase(30)}</footer></body></html>'
+    )
+
+
+def medir(nome, funcao, paginas, repeticoes):
+    funcao(paginas[0])  # aquecimento
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for html in paginas:
+            funcao(html)
+    por_pagina = (time.perf_counter() - inicio) / (repeticoes * len(paginas)) * 1000
+    print(f"  {nome:<38} {por_pagina:8.2f} ms/capítulo")
+    return por_pagina
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do parsing de capítulos')
+    parser.add_argument('pasta', nargs='?', help='Pasta com páginas .html (padrão: cache HTTP)')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    paginas = carregar_paginas(args.pasta)
+    origem = args.pasta or 'cache HTTP'
+    if not paginas:
+        paginas = [pagina_sintetica(n) for n in range(1, 21)]
+        origem = 'páginas sintéticas (cache vazio)'
+
+    tamanho_medio = sum(len(p) for p in paginas) / len(paginas) / 1024
+    print(f"\n📄 {len(paginas)} páginas de {origem}, {tamanho_medio:.0f} KB em média\n")
+
+    extrator = ExtratorCentralNovel()
+    regioes = ExtratorCentralNovel.REGIOES_CAPITULO
+
+    def extrair(soup):
+        return extrator._extrair_titulo(soup), extrator._extrair_conteudo(soup)
+
+    variantes = [
+        ('html.parser, árvore completa (atual)', lambda h: extrair(BeautifulSoup(h, 'html.parser'))),
+        ('html.parser, só regiões', lambda h: extrair(criar_soup(h, regioes, 'html.parser'))),
+    ]
+    if LXML_DISPONIVEL:
+        variantes += [
+            ('lxml, árvore completa', lambda h: extrair(BeautifulSoup(h, 'lxml'))),
+            ('lxml, só regiões (padrão)', lambda h: extrair(criar_soup(h, regioes, 'lxml'))),
+        ]
+    else:
+        print("⚠️ lxml não instalado: só o html.parser será medido\n")
+
+    # Todas as variantes precisam extrair exatamente o mesmo texto
+    referencia = [variantes[0][1](h) for h in paginas]
+    for nome, funcao in variantes[1:]:
+        diferentes = sum(funcao(h) != ref for h, ref in zip(paginas, referencia))
+        if diferentes:
+            print(f"⚠️ {nome}: {diferentes} páginas com resultado diferente do parser atual")
+
+    tempos = [medir(nome, funcao, paginas, args.repeticoes) for nome, funcao in variantes]
+    print(f"\n⚡ Ganho do padrão sobre o atual: {tempos[0] / tempos[-1]:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,15 @@ Usa Coqui TTS com modelos VITS para múltiplas vozes PT-BR
 """
 
 import os
+import sys
 import json
 from TTS.api import TTS
 import pygame
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'engines'))
+from cache_audio import CacheAudio, obter_cache_global
+from reproducao import ControladorReproducao
+
 
 class GerenciadorVozesMulti:
     """Gerencia múltiplas vozes para diferentes personagens."""
@@ -17,11 +22,14 @@ class GerenciadorVozesMulti:
         self.modelo = None
         self.mapeamento_personagens = {}
         self.cache_dir = './cache_vozes'
+        self.cache = obter_cache_global()
+        self.nome_modelo = None
         
         os.makedirs(self.cache_dir, exist_ok=True)
         
         # Inicializar pygame
         pygame.mixer.init(frequency=22050, size=-16, channels=1, buffer=512)
+        self.reprodutor = ControladorReproducao(pygame.mixer.Channel(0))
     
     def listar_modelos_ptbr(self):
         """Lista todos os modelos disponíveis em PT-BR."""
@@ -61,6 +69,7 @@ class GerenciadorVozesMulti:
                     try:
                         print(f"\n📦 Carregando modelo: {modelo}")
                         self.modelo = TTS(modelo_nome=modelo, progress_bar=True)
+                        self.nome_modelo = modelo
                         print(f"✓ Modelo carregado!")
                         
                         # Verificar se é multi-speaker
@@ -77,11 +86,13 @@ class GerenciadorVozesMulti:
                 
                 print("⚠️ Nenhum modelo PT-BR encontrado, tentando multilíngue...")
                 self.modelo = TTS(model_name="tts_models/multilingual/multi-dataset/your_tts")
+                self.nome_modelo = "tts_models/multilingual/multi-dataset/your_tts"
                 self.vozes_disponiveis = self.modelo.speakers if hasattr(self.modelo, 'speakers') else ["default"]
                 return True
             
             else:
                 self.modelo = TTS(modelo_nome=modelo_nome, progress_bar=True)
+                self.nome_modelo = modelo_nome
                 self.vozes_disponiveis = self.modelo.speakers if hasattr(self.modelo, 'speakers') else ["default"]
                 return True
         
@@ -97,32 +108,44 @@ class GerenciadorVozesMulti:
             texto: Texto para narrar
             voz_id: ID da voz (nome do speaker)
             velocidade: Multiplicador de velocidade
-            arquivo_saida: Caminho do arquivo de saída
+            arquivo_saida: Caminho do arquivo de saída (sem ele, usa o cache em disco)
         """
         if not self.modelo:
             print("❌ Modelo não carregado. Use carregar_modelo() primeiro.")
             return None
         
+        if voz_id and voz_id not in self.vozes_disponiveis:
+            voz_id = None
+        
+        chave = None
+        destino = arquivo_saida
         if not arquivo_saida:
-            arquivo_saida = os.path.join(self.cache_dir, f"temp_{hash(texto)}.wav")
+            engine = f"coqui:{self.nome_modelo}"
+            chave = CacheAudio.gerar_chave(texto, voz_id or 'default', str(velocidade), engine)
+            em_cache = self.cache.obter(chave, '.wav')
+            if em_cache:
+                return em_cache
+            destino = self.cache.caminho_temporario(chave, '.wav')
         
         try:
             # Gerar áudio
-            if voz_id and voz_id in self.vozes_disponiveis:
+            if voz_id:
                 self.modelo.tts_to_file(
                     text=texto,
                     speaker=voz_id,
-                    file_path=arquivo_saida,
+                    file_path=destino,
                     speed=velocidade
                 )
             else:
                 self.modelo.tts_to_file(
                     text=texto,
-                    file_path=arquivo_saida,
+                    file_path=destino,
                     speed=velocidade
                 )
             
-            return arquivo_saida
+            if chave:
+                return self.cache.registrar(chave, destino, '.wav')
+            return destino
         
         except Exception as e:
             print(f"❌ Erro ao gerar áudio: {e}")
@@ -131,11 +154,9 @@ class GerenciadorVozesMulti:
     def reproduzir_audio(self, arquivo: str):
         """Reproduz arquivo de áudio."""
         try:
-            pygame.mixer.music.load(arquivo)
-            pygame.mixer.music.play()
-            
-            while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
+            self.reprodutor.reiniciar()
+            self.reprodutor.tocar(pygame.mixer.Sound(arquivo))
+            self.reprodutor.aguardar_fim()
         
         except Exception as e:
             print(f"❌ Erro ao reproduzir: {e}")
@@ -145,13 +166,8 @@ class GerenciadorVozesMulti:
         arquivo = self.gerar_audio(texto, voz_id, velocidade)
         
         if arquivo:
+            # O arquivo fica no cache em disco para ser reaproveitado
             self.reproduzir_audio(arquivo)
-            
-            # Limpar arquivo temporário
-            try:
-                os.remove(arquivo)
-            except:
-                pass
     
     def associar_personagem_voz(self, personagem: str, voz_id: str):
         """Associa um personagem a uma voz específica."""
@@ -0,0 +1,185 @@
+"""
+Cache de Áudio TTS Persistente
+Armazena em disco os áudios sintetizados, endereçados pelo conteúdo
+"""
+
+import hashlib
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+
+def _diretorio_padrao() -> str:
+    """Retorna a pasta padrão do cache (cache/tts na raiz do projeto)."""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(raiz, 'cache', 'tts')
+
+
+class CacheAudio:
+    """
+    Cache de áudios em disco com limite de tamanho e remoção LRU.
+
+    A chave de cada áudio é um digest estável de (texto, voz, taxa, engine),
+    então o mesmo parágrafo é reaproveitado entre execuções do programa.
+    A ordem de uso é persistida no mtime dos arquivos.
+    """
+
+    def __init__(self, diretorio: Optional[str] = None, tamanho_max_mb: int = 500):
+        """
+        Inicializa o cache.
+
+        Args:
+            diretorio: Pasta onde os áudios são guardados
+            tamanho_max_mb: Tamanho máximo do cache em megabytes
+        """
+        self.diretorio = diretorio or _diretorio_padrao()
+        self.tamanho_max = tamanho_max_mb * 1024 * 1024
+        self.lock = threading.Lock()
+
+        os.makedirs(self.diretorio, exist_ok=True)
+
+        # {nome_arquivo: tamanho_bytes} do menos para o mais recente
+        self.entradas = OrderedDict()
+        self.tamanho_total = 0
+        self._indexar()
+
+    def _indexar(self):
+        """Lê os arquivos existentes e reconstrói a ordem LRU pelo mtime."""
+        arquivos = []
+        for entrada in os.scandir(self.diretorio):
+            if not entrada.is_file() or entrada.name.endswith('.tmp'):
+                continue
+            stat = entrada.stat()
+            arquivos.append((stat.st_mtime, entrada.name, stat.st_size))
+
+        for _, nome, tamanho in sorted(arquivos):
+            self.entradas[nome] = tamanho
+            self.tamanho_total += tamanho
+
+    @staticmethod
+    def gerar_chave(texto: str, voz: str, taxa: str, engine: str = 'edge') -> str:
+        """
+        Gera a chave estável de um áudio.
+
+        Args:
+            texto: Texto sintetizado
+            voz: Identificador da voz
+            taxa: Velocidade no formato do engine (ex: '+10%')
+            engine: Nome do engine TTS
+
+        Returns:
+            Digest hexadecimal SHA-256
+        """
+        dados = '\x1f'.join([engine, voz, str(taxa), texto])
+        return hashlib.sha256(dados.encode('utf-8')).hexdigest()
+
+    def caminho(self, chave: str, extensao: str = '.mp3') -> str:
+        """Retorna o caminho final do arquivo de uma chave."""
+        return os.path.join(self.diretorio, chave + extensao)
+
+    def obter(self, chave: str, extensao: str = '.mp3') -> Optional[str]:
+        """
+        Busca um áudio no cache.
+
+        Args:
+            chave: Chave gerada por gerar_chave()
+            extensao: Extensão do arquivo
+
+        Returns:
+            Caminho do arquivo ou None se não estiver em cache
+        """
+        nome = chave + extensao
+        caminho = os.path.join(self.diretorio, nome)
+
+        with self.lock:
+            if nome not in self.entradas:
+                return None
+
+            if not os.path.exists(caminho):
+                # Removido por fora do programa
+                self.tamanho_total -= self.entradas.pop(nome)
+                return None
+
+            self.entradas.move_to_end(nome)
+
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+
+        return caminho
+
+    def caminho_temporario(self, chave: str, extensao: str = '.mp3') -> str:
+        """
+        Retorna um caminho temporário para gravar um novo áudio.
+
+        O arquivo só passa a valer depois de registrar(). O nome é único
+        por chamada: duas gravações da mesma chave na mesma thread (ex:
+        corrotinas do loop de síntese) nunca compartilham o arquivo.
+        """
+        return os.path.join(self.diretorio, f'{chave}{extensao}.{uuid.uuid4().hex}.tmp')
+
+    def registrar(self, chave: str, caminho_temp: str, extensao: str = '.mp3') -> str:
+        """
+        Move um arquivo gravado para o cache e aplica o limite de tamanho.
+
+        Args:
+            chave: Chave do áudio
+            caminho_temp: Arquivo gravado em caminho_temporario()
+            extensao: Extensão do arquivo
+
+        Returns:
+            Caminho final do áudio
+        """
+        nome = chave + extensao
+        caminho = os.path.join(self.diretorio, nome)
+        os.replace(caminho_temp, caminho)
+        tamanho = os.path.getsize(caminho)
+
+        with self.lock:
+            if nome in self.entradas:
+                self.tamanho_total -= self.entradas.pop(nome)
+            self.entradas[nome] = tamanho
+            self.tamanho_total += tamanho
+            self._remover_excedente(manter=nome)
+
+        return caminho
+
+    def _remover_excedente(self, manter: str):
+        """Remove os áudios menos usados até caber no limite (chamar com lock)."""
+        while self.tamanho_total > self.tamanho_max and len(self.entradas) > 1:
+            nome, tamanho = next(iter(self.entradas.items()))
+            if nome == manter:
+                break
+            del self.entradas[nome]
+            self.tamanho_total -= tamanho
+            try:
+                os.remove(os.path.join(self.diretorio, nome))
+            except OSError:
+                pass
+
+    def limpar(self):
+        """Remove todos os áudios do cache."""
+        with self.lock:
+            for nome in list(self.entradas):
+                try:
+                    os.remove(os.path.join(self.diretorio, nome))
+                except OSError:
+                    pass
+            self.entradas.clear()
+            self.tamanho_total = 0
+
+
+_cache_global = None
+_lock_global = threading.Lock()
+
+
+def obter_cache_global() -> CacheAudio:
+    """Retorna a instância de cache compartilhada por todos os engines."""
+    global _cache_global
+    with _lock_global:
+        if _cache_global is None:
+            _cache_global = CacheAudio()
+        return _cache_global
@@ -0,0 +1,84 @@
+"""
+Cache de Sons Decodificados
+LRU de pygame.mixer.Sound limitado por memória, com chave (voz, taxa, texto)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import pygame
+
+
+class CacheSons:
+    """
+    Sons prontos para tocar, mantidos em memória até um orçamento em bytes.
+
+    A chave inclui voz e taxa, então trocar de voz ou velocidade não
+    invalida nada: as entradas de cada combinação convivem e voltar para
+    uma voz anterior continua instantâneo. Quando o orçamento estoura, os
+    sons usados há mais tempo saem primeiro.
+    """
+
+    def __init__(self, orcamento_mb: float = 192):
+        """
+        Args:
+            orcamento_mb: Memória máxima ocupada pelos sons (MB de PCM)
+        """
+        self.orcamento = int(orcamento_mb * 1024 * 1024)
+        self.ocupado = 0
+        self.sons = OrderedDict()  # {chave: (som, bytes)}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def chave(texto: str, voz: str, taxa: str) -> Tuple[str, str, str]:
+        """Chave (voz, taxa, digest do texto)."""
+        digest = hashlib.sha1(texto.encode('utf-8')).hexdigest()[:16]
+        return (voz, taxa, digest)
+
+    @staticmethod
+    def tamanho(som: pygame.mixer.Sound) -> int:
+        """Bytes de PCM de um som no formato do mixer (sem copiar o áudio)."""
+        frequencia, bits, canais = pygame.mixer.get_init()
+        return int(som.get_length() * frequencia) * canais * (abs(bits) // 8)
+
+    def __contains__(self, chave) -> bool:
+        with self.lock:
+            return chave in self.sons
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.sons)
+
+    def obter(self, chave) -> Optional[pygame.mixer.Sound]:
+        """Retorna o som (marcando como usado agora) ou None."""
+        with self.lock:
+            entrada = self.sons.get(chave)
+            if entrada is None:
+                return None
+            self.sons.move_to_end(chave)
+            return entrada[0]
+
+    def __setitem__(self, chave, som: pygame.mixer.Sound):
+        tamanho = self.tamanho(som)
+        with self.lock:
+            anterior = self.sons.pop(chave, None)
+            if anterior is not None:
+                self.ocupado -= anterior[1]
+            self.sons[chave] = (som, tamanho)
+            self.ocupado += tamanho
+
+            # Descartar os menos usados (sempre mantém o que acabou de entrar)
+            while self.ocupado > self.orcamento and len(self.sons) > 1:
+                _, (_, liberado) = self.sons.popitem(last=False)
+                self.ocupado -= liberado
+
+    def clear(self):
+        with self.lock:
+            self.sons.clear()
+            self.ocupado = 0
+
+    def uso_mb(self) -> float:
+        """Memória ocupada pelos sons, em MB."""
+        return self.ocupado / 1024 / 1024
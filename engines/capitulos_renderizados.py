@@ -0,0 +1,179 @@
+"""
+Capítulos Pré-Renderizados
+Áudio de capítulos inteiros (um MP3 por capítulo) com índice de parágrafos
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from streaming_mp3 import dividir_quadros, pular_id3
+
+
+class CapitulosRenderizados:
+    """
+    Pasta de capítulos renderizados para uma combinação de voz e taxa.
+
+    Cada capítulo vira cap_NNNN.mp3 (os quadros MP3 de todos os parágrafos
+    concatenados) e cap_NNNN.json com o offset em bytes, o início e a duração
+    de cada parágrafo. Como o Edge TTS gera cada parágrafo como um fluxo
+    independente, o trecho de um parágrafo é um MP3 válido por si só e pode
+    ser decodificado sem o resto do capítulo.
+    """
+
+    VERSAO = 1
+
+    def __init__(self, caminho_novel: str, voz: str, taxa: str):
+        """
+        Args:
+            caminho_novel: Pasta da novel
+            voz: Voz do Edge TTS (ex: pt-BR-FranciscaNeural)
+            taxa: Velocidade no formato do Edge TTS (ex: '+10%')
+        """
+        self.voz = voz
+        self.taxa = taxa
+        nome_pasta = f"{voz}_{taxa.replace('%', 'pct')}"
+        self.pasta = os.path.join(caminho_novel, 'audio', nome_pasta)
+        self.lock = threading.Lock()
+        self._sidecars = {}  # {numero: (mtime, dados)}
+
+    @staticmethod
+    def hash_paragrafo(texto: str) -> str:
+        """Digest curto usado para detectar parágrafos alterados depois da renderização."""
+        return hashlib.sha1(texto.encode('utf-8')).hexdigest()[:16]
+
+    def caminho_audio(self, numero: int) -> str:
+        return os.path.join(self.pasta, f"cap_{numero:04d}.mp3")
+
+    def caminho_sidecar(self, numero: int) -> str:
+        return os.path.join(self.pasta, f"cap_{numero:04d}.json")
+
+    def gravar(self, numero: int, titulo: str, paragrafos: List[str],
+               arquivos: List[Optional[str]]) -> Dict:
+        """
+        Monta o áudio de um capítulo a partir dos MP3 de cada parágrafo.
+
+        Args:
+            numero: Número do capítulo
+            titulo: Título do capítulo
+            paragrafos: Textos dos parágrafos
+            arquivos: MP3 de cada parágrafo (None para parágrafos vazios)
+
+        Returns:
+            Dados do sidecar gravado
+        """
+        os.makedirs(self.pasta, exist_ok=True)
+        caminho_mp3 = self.caminho_audio(numero)
+        temp_mp3 = caminho_mp3 + '.tmp'
+
+        entradas = []
+        posicao = 0
+        tempo = 0.0
+        with open(temp_mp3, 'wb') as saida:
+            for indice, (texto, arquivo) in enumerate(zip(paragrafos, arquivos)):
+                duracao = 0.0
+                inicio = posicao
+                if arquivo:
+                    with open(arquivo, 'rb') as f:
+                        dados = f.read()
+                    quadros, _ = dividir_quadros(dados, pular_id3(dados))
+                    if quadros:
+                        # Só os quadros de áudio (sem tags), contíguos
+                        trecho = dados[quadros[0][0]:quadros[-1][1]]
+                        saida.write(trecho)
+                        posicao += len(trecho)
+                        duracao = sum(q.amostras / q.taxa_amostragem for _, _, q in quadros)
+
+                entradas.append({
+                    'indice': indice,
+                    'hash': self.hash_paragrafo(texto),
+                    'byte_inicio': inicio,
+                    'byte_fim': posicao,
+                    'inicio': round(tempo, 3),
+                    'duracao': round(duracao, 3),
+                    'palavras': len(texto.split())
+                })
+                tempo += duracao
+
+        sidecar = {
+            'versao': self.VERSAO,
+            'numero': numero,
+            'titulo': titulo,
+            'voz': self.voz,
+            'taxa': self.taxa,
+            'duracao_total': round(tempo, 3),
+            'paragrafos': entradas
+        }
+
+        temp_json = self.caminho_sidecar(numero) + '.tmp'
+        with open(temp_json, 'w', encoding='utf-8') as f:
+            json.dump(sidecar, f, ensure_ascii=False, indent=2)
+
+        # MP3 antes do sidecar: um sidecar existente sempre descreve um MP3 completo
+        os.replace(temp_mp3, caminho_mp3)
+        os.replace(temp_json, self.caminho_sidecar(numero))
+
+        with self.lock:
+            self._sidecars.pop(numero, None)
+        return sidecar
+
+    def obter_sidecar(self, numero: int) -> Optional[Dict]:
+        """Lê (com cache) o índice de parágrafos de um capítulo renderizado."""
+        caminho = self.caminho_sidecar(numero)
+        try:
+            mtime = os.stat(caminho).st_mtime_ns
+        except OSError:
+            return None
+
+        with self.lock:
+            em_cache = self._sidecars.get(numero)
+            if em_cache and em_cache[0] == mtime:
+                return em_cache[1]
+
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if dados.get('versao') != self.VERSAO or not os.path.exists(self.caminho_audio(numero)):
+            return None
+
+        with self.lock:
+            self._sidecars[numero] = (mtime, dados)
+        return dados
+
+    def disponivel(self, numero: int) -> bool:
+        """Indica se o capítulo já foi renderizado nesta voz e taxa."""
+        return self.obter_sidecar(numero) is not None
+
+    def ler_paragrafo(self, numero: int, indice: int, texto: str = None) -> Optional[bytes]:
+        """
+        Lê os bytes MP3 de um parágrafo renderizado.
+
+        Args:
+            numero: Número do capítulo
+            indice: Índice do parágrafo (0-based)
+            texto: Texto atual do parágrafo; se informado, o áudio só é usado
+                   quando o texto não mudou desde a renderização
+
+        Returns:
+            Bytes MP3 do parágrafo ou None se não houver áudio válido
+        """
+        sidecar = self.obter_sidecar(numero)
+        if not sidecar or not 0 <= indice < len(sidecar['paragrafos']):
+            return None
+
+        entrada = sidecar['paragrafos'][indice]
+        if texto is not None and entrada['hash'] != self.hash_paragrafo(texto):
+            return None
+        if entrada['byte_fim'] <= entrada['byte_inicio']:
+            return None
+
+        try:
+            with open(self.caminho_audio(numero), 'rb') as f:
+                f.seek(entrada['byte_inicio'])
+                return f.read(entrada['byte_fim'] - entrada['byte_inicio'])
+        except OSError:
+            return None
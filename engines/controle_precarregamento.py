@@ -0,0 +1,139 @@
+"""
+Controle Adaptativo de Pré-carregamento
+Ajusta quantos parágrafos sintetizar à frente e quantas sínteses rodar em
+paralelo para manter um estoque de áudio pronto à frente do playhead
+"""
+
+import math
+import threading
+from typing import Dict, Optional
+
+
+class ControlePrecarregamento:
+    """
+    Controlador da janela de pré-carregamento.
+
+    Mede a latência de cada síntese (do pedido ao MP3 pronto) e a duração
+    do áudio que ela rende, ambas por média móvel exponencial. A cada
+    parágrafo recebe o áudio já pronto à frente do playhead e recalcula:
+
+    - profundidade: parágrafos suficientes para cobrir o alvo em segundos
+      e a latência, mais um ajuste que sobe enquanto o estoque está abaixo
+      da metade do alvo e desce quando passa de 1,5x o alvo;
+    - concorrência: sínteses simultâneas para que a vazão (concorrência /
+      latência) acompanhe o consumo (1 / duração), com uma a mais quando o
+      estoque está baixo.
+
+    Um underrun é um parágrafo que chegou à vez de tocar sem áudio pronto
+    (o primeiro depois de iniciar ou pular não conta).
+    """
+
+    DURACAO_PADRAO = 15.0  # Segundos de áudio por síntese antes de medir
+    LATENCIA_MINIMA = 0.05  # Abaixo disso o áudio veio do cache em disco
+
+    def __init__(self, alvo_segundos: float = 30.0, profundidade_min: int = 1,
+                 profundidade_max: int = 24, concorrencia: int = 3,
+                 concorrencia_max: int = 6, alfa: float = 0.3):
+        """
+        Args:
+            alvo_segundos: Áudio pronto desejado à frente do playhead
+            profundidade_min: Menor janela (a profundidade configurada pelo usuário)
+            profundidade_max: Maior janela
+            concorrencia: Sínteses simultâneas iniciais (também o mínimo)
+            concorrencia_max: Máximo de sínteses simultâneas
+            alfa: Peso da medição nova nas médias móveis
+        """
+        self.alvo = alvo_segundos
+        self.profundidade_min = max(1, profundidade_min)
+        self.profundidade_max = max(self.profundidade_min, profundidade_max)
+        self.concorrencia_min = max(1, concorrencia)
+        self.concorrencia_max = max(self.concorrencia_min, concorrencia_max)
+        self.alfa = alfa
+
+        self.latencia = None  # Segundos do pedido ao MP3 pronto
+        self.duracao = None  # Segundos de áudio por síntese
+        self.buffer = 0.0  # Áudio pronto à frente na última medição
+        self.ajuste = 0  # Correção da profundidade pela realimentação
+        self.profundidade = self.profundidade_min
+        self.concorrencia = self.concorrencia_min
+        self.underruns = 0
+        self.aquecendo = True
+        self.lock = threading.Lock()
+
+    def _media(self, atual: Optional[float], valor: float) -> float:
+        return valor if atual is None else atual + self.alfa * (valor - atual)
+
+    def registrar_latencia(self, segundos: float):
+        """Tempo de uma síntese, do pedido ao arquivo pronto."""
+        if segundos < self.LATENCIA_MINIMA:
+            return
+        with self.lock:
+            self.latencia = self._media(self.latencia, segundos)
+
+    def registrar_duracao(self, segundos: float):
+        """Duração do áudio decodificado de uma síntese."""
+        if segundos <= 0:
+            return
+        with self.lock:
+            self.duracao = self._media(self.duracao, segundos)
+
+    def reiniciar(self):
+        """Início da narração ou salto de posição: o próximo parágrafo ainda não conta."""
+        with self.lock:
+            self.aquecendo = True
+
+    def paragrafo_iniciado(self, pronto: bool):
+        """
+        Informa se o parágrafo que vai tocar já tinha áudio pronto.
+
+        Args:
+            pronto: True se veio do cache em memória ou de renderização
+        """
+        with self.lock:
+            if not pronto and not self.aquecendo:
+                self.underruns += 1
+                self.ajuste += 1  # Faltou áudio: aumentar a janela já
+            self.aquecendo = False
+
+    def atualizar_buffer(self, segundos: float):
+        """
+        Recebe o áudio pronto à frente do playhead e recalcula a janela.
+
+        Returns:
+            (profundidade, concorrência) para os próximos pedidos
+        """
+        with self.lock:
+            self.buffer = segundos
+            if segundos < self.alvo * 0.5:
+                self.ajuste += 1
+            elif segundos > self.alvo * 1.5 and self.ajuste > 0:
+                self.ajuste -= 1
+
+            duracao = self.duracao or self.DURACAO_PADRAO
+            base = math.ceil(self.alvo / duracao)
+            necessarias = 1
+            if self.latencia is not None:
+                base = max(base, math.ceil(self.latencia / duracao) + 1)
+                necessarias = math.ceil(self.latencia / duracao)
+            if segundos < self.alvo * 0.5:
+                necessarias += 1
+
+            # Ajuste não cresce além do que a profundidade máxima comporta
+            self.ajuste = min(self.ajuste, max(0, self.profundidade_max - base))
+            self.profundidade = max(self.profundidade_min,
+                                    min(self.profundidade_max, base + self.ajuste))
+            self.concorrencia = max(self.concorrencia_min,
+                                    min(self.concorrencia_max, necessarias))
+            return self.profundidade, self.concorrencia
+
+    def resumo(self) -> Dict:
+        """Estado atual para a barra de status."""
+        with self.lock:
+            return {
+                'buffer': self.buffer,
+                'alvo': self.alvo,
+                'profundidade': self.profundidade,
+                'concorrencia': self.concorrencia,
+                'latencia': self.latencia,
+                'underruns': self.underruns
+            }
@@ -0,0 +1,251 @@
+"""
+Processamento de Áudio (DSP)
+Ganho em dB, limitador suave, fades, mudança de tom e de andamento sobre
+o PCM decodificado, vetorizado com NumPy
+"""
+
+from typing import Optional
+
+import pygame
+
+try:
+    import numpy as np
+    NUMPY_DISPONIVEL = True
+except ImportError:
+    NUMPY_DISPONIVEL = False
+
+
+# Fades curtos nas bordas evitam estalos ao emendar segmentos
+FADE_ENTRADA_PADRAO = 0.005
+FADE_SAIDA_PADRAO = 0.010
+
+# Acima deste nível (fração da escala) o limitador começa a comprimir
+LIMIAR_LIMITADOR = 0.89
+
+# WSOLA: quadros de 30 ms com 50% de sobreposição, busca de alinhamento em ±12 ms
+JANELA_WSOLA = 0.030
+TOLERANCIA_WSOLA = 0.012
+# A busca compara o sinal reduzido a ~8 kHz (voz) e refina na resolução cheia
+FREQUENCIA_BUSCA_WSOLA = 8000
+
+
+def pcm_para_array(dados: bytes, canais: int = 1) -> 'np.ndarray':
+    """
+    Converte PCM int16 intercalado para float32 em [-1, 1].
+
+    Returns:
+        Array (amostras, canais)
+    """
+    amostras = np.frombuffer(dados, dtype='<i2').astype(np.float32)
+    amostras *= 1.0 / 32768.0
+    return amostras.reshape(-1, canais)
+
+
+def array_para_pcm(amostras: 'np.ndarray') -> bytes:
+    """Converte float32 em [-1, 1] de volta para PCM int16 intercalado."""
+    return np.clip(amostras * 32767.0, -32768, 32767).astype('<i2').tobytes()
+
+
+def aplicar_ganho(amostras: 'np.ndarray', ganho_db: float) -> 'np.ndarray':
+    """Multiplica o sinal pelo ganho em decibéis (no lugar)."""
+    if ganho_db:
+        amostras *= np.float32(10.0 ** (ganho_db / 20.0))
+    return amostras
+
+
+def limitar(amostras: 'np.ndarray', limiar: float = LIMIAR_LIMITADOR) -> 'np.ndarray':
+    """
+    Limitador suave: abaixo do limiar o sinal passa intacto; acima, é
+    comprimido por tanh até no máximo 1.0 (sem clipping duro).
+    """
+    excesso = np.abs(amostras) > limiar
+    if excesso.any():
+        folga = 1.0 - limiar
+        trecho = amostras[excesso]
+        amostras[excesso] = np.sign(trecho) * (
+            limiar + folga * np.tanh((np.abs(trecho) - limiar) / folga)
+        )
+    return amostras
+
+
+def aplicar_fades(amostras: 'np.ndarray', frequencia: int,
+                  entrada: float = FADE_ENTRADA_PADRAO,
+                  saida: float = FADE_SAIDA_PADRAO) -> 'np.ndarray':
+    """Rampas lineares de entrada e saída (em segundos), no lugar."""
+    total = len(amostras)
+    n_entrada = min(int(entrada * frequencia), total)
+    n_saida = min(int(saida * frequencia), total)
+    if n_entrada > 1:
+        amostras[:n_entrada] *= np.linspace(0.0, 1.0, n_entrada, dtype=np.float32)[:, None]
+    if n_saida > 1:
+        amostras[-n_saida:] *= np.linspace(1.0, 0.0, n_saida, dtype=np.float32)[:, None]
+    return amostras
+
+
+def reamostrar(amostras: 'np.ndarray', fator: float) -> 'np.ndarray':
+    """
+    Muda tom e andamento juntos (como rodar a fita mais rápido).
+
+    Args:
+        amostras: Array (amostras, canais)
+        fator: > 1 deixa mais agudo e mais curto; < 1 mais grave e mais longo
+
+    Returns:
+        Novo array com len(amostras) / fator amostras
+    """
+    if fator == 1.0 or len(amostras) < 2:
+        return amostras
+    total = max(1, int(len(amostras) / fator))
+    posicoes = np.arange(total, dtype=np.float64) * fator
+    originais = np.arange(len(amostras), dtype=np.float64)
+    # Interpolação linear por canal (np.interp roda em C)
+    saida = np.empty((total, amostras.shape[1]), dtype=np.float32)
+    for canal in range(amostras.shape[1]):
+        saida[:, canal] = np.interp(posicoes, originais, amostras[:, canal])
+    return saida
+
+
+def esticar_tempo(amostras: 'np.ndarray', fator: float, frequencia: int,
+                  janela: float = JANELA_WSOLA,
+                  tolerancia: float = TOLERANCIA_WSOLA) -> 'np.ndarray':
+    """
+    Muda o andamento sem mudar o tom (WSOLA).
+
+    O sinal é remontado com quadros sobrepostos tirados a um passo de
+    análise fator vezes o passo de síntese; cada quadro é deslocado dentro
+    da tolerância até alinhar com a continuação natural do anterior, o que
+    evita os batimentos de um overlap-add simples.
+
+    Args:
+        amostras: Array (amostras, canais)
+        fator: > 1 acelera (áudio mais curto); < 1 desacelera
+        frequencia: Taxa de amostragem
+        janela: Duração do quadro em segundos
+        tolerancia: Deslocamento máximo do quadro em segundos
+
+    Returns:
+        Novo array com cerca de len(amostras) / fator amostras
+    """
+    total = len(amostras)
+    tamanho = max(8, int(janela * frequencia)) & ~1
+    if fator == 1.0 or total < 2 * tamanho:
+        return amostras
+
+    passo_sintese = tamanho // 2
+    passo_analise = passo_sintese * fator
+    delta = int(tolerancia * frequencia)
+    reducao = max(1, frequencia // FREQUENCIA_BUSCA_WSOLA)
+    saida_total = int(total / fator)
+    quadros = saida_total // passo_sintese + 1
+
+    # Margens de zeros: a busca pode olhar antes do início e depois do fim
+    margem_fim = tamanho + passo_sintese + delta
+    entrada = np.zeros((total + delta + margem_fim, amostras.shape[1]), dtype=np.float32)
+    entrada[delta:delta + total] = amostras
+    guia = entrada.mean(axis=1) if amostras.shape[1] > 1 else entrada[:, 0]
+    guia_reduzida = guia[::reducao]
+
+    # Hann periódica: com 50% de sobreposição as janelas somam 1
+    hann = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(tamanho) / tamanho)).astype(np.float32)
+    saida = np.zeros((quadros * passo_sintese + tamanho, amostras.shape[1]), dtype=np.float32)
+    pesos = np.zeros(len(saida), dtype=np.float32)
+    limite = len(entrada) - tamanho - passo_sintese
+
+    anterior = delta  # Posição (em entrada) do último quadro copiado
+    for k in range(quadros):
+        nominal = min(int(k * passo_analise) + delta, limite - delta)
+        if k == 0:
+            posicao = nominal
+        else:
+            # Alinhar com o que viria logo depois do quadro anterior
+            natural = guia_reduzida[(anterior + passo_sintese) // reducao:
+                                   (anterior + passo_sintese + tamanho) // reducao]
+            inicio = max(0, nominal - delta)
+            regiao = guia_reduzida[inicio // reducao:(nominal + delta + tamanho) // reducao]
+            correlacao = np.correlate(regiao, natural, mode='valid')
+            grosso = inicio + int(np.argmax(correlacao)) * reducao
+            if reducao > 1:
+                # Refinamento fino em volta do melhor deslocamento grosso
+                natural = guia[anterior + passo_sintese:anterior + passo_sintese + tamanho]
+                fino = max(0, grosso - reducao)
+                regiao = guia[fino:min(grosso + reducao, limite) + tamanho]
+                correlacao = np.correlate(regiao, natural, mode='valid')
+                grosso = fino + int(np.argmax(correlacao))
+            posicao = min(grosso, limite)
+
+        destino = k * passo_sintese
+        saida[destino:destino + tamanho] += entrada[posicao:posicao + tamanho] * hann[:, None]
+        pesos[destino:destino + tamanho] += hann
+        anterior = posicao
+
+    saida = saida[:saida_total]
+    pesos = pesos[:saida_total]
+    # Só o começo (antes da primeira sobreposição) fica com peso < 1
+    np.divide(saida, pesos[:, None], out=saida, where=pesos[:, None] > 1e-3)
+    return saida
+
+
+def semitons_para_fator(semitons: float) -> float:
+    """Fator de reamostragem para subir/descer o tom em semitons."""
+    return 2.0 ** (semitons / 12.0)
+
+
+def processar_pcm(dados: bytes, frequencia: int, tamanho: int = -16, canais: int = 1,
+                  ganho_db: float = 0.0, tom: float = 0.0, andamento: float = 1.0,
+                  fade_entrada: Optional[float] = FADE_ENTRADA_PADRAO,
+                  fade_saida: Optional[float] = FADE_SAIDA_PADRAO,
+                  limitador: bool = True) -> bytes:
+    """
+    Aplica a cadeia de efeitos ao PCM de um segmento.
+
+    Ordem: tom -> andamento -> ganho -> limitador -> fades. Sem NumPy, ou em formatos
+    diferentes de int16 com sinal, o áudio é devolvido sem alterações.
+
+    Args:
+        dados: PCM intercalado (formato do mixer)
+        frequencia: Taxa de amostragem do mixer
+        tamanho: Bits por amostra do mixer (negativo = com sinal)
+        canais: Canais do mixer
+        ganho_db: Ganho em decibéis (ex: -10 sussurro, +6 raiva)
+        tom: Mudança de tom em semitons (também muda a duração)
+        andamento: Fator de velocidade mantendo o tom (1.25 = 25% mais rápido)
+        fade_entrada: Duração do fade de entrada em segundos (None = sem fade)
+        fade_saida: Duração do fade de saída em segundos (None = sem fade)
+        limitador: Comprimir picos acima do limiar
+
+    Returns:
+        PCM processado no mesmo formato
+    """
+    if not NUMPY_DISPONIVEL or tamanho != -16 or not dados:
+        return dados
+    # Nenhum efeito pedido
+    if not ganho_db and not tom and andamento == 1.0 and not fade_entrada and not fade_saida:
+        return dados
+
+    amostras = pcm_para_array(dados, canais)
+    if tom:
+        amostras = reamostrar(amostras, semitons_para_fator(tom))
+    if andamento != 1.0:
+        amostras = esticar_tempo(amostras, andamento, frequencia)
+    aplicar_ganho(amostras, ganho_db)
+    if limitador and ganho_db > 0:
+        limitar(amostras)
+    if fade_entrada or fade_saida:
+        aplicar_fades(amostras, frequencia, fade_entrada or 0.0, fade_saida or 0.0)
+    return array_para_pcm(amostras)
+
+
+def processar_som(som, ganho_db: float = 0.0, tom: float = 0.0, andamento: float = 1.0,
+                  **opcoes):
+    """
+    Atalho para pygame.mixer.Sound: retorna um novo Sound processado.
+
+    Se não houver nada a fazer (ganho e tom zerados, andamento 1.0) o mesmo
+    Sound é devolvido, sem copiar o áudio.
+    """
+    if not NUMPY_DISPONIVEL or (not ganho_db and not tom and andamento == 1.0):
+        return som
+    frequencia, tamanho, canais = pygame.mixer.get_init()
+    dados = processar_pcm(som.get_raw(), frequencia, tamanho, canais,
+                          ganho_db=ganho_db, tom=tom, andamento=andamento, **opcoes)
+    return pygame.mixer.Sound(buffer=dados)
@@ -0,0 +1,325 @@
+"""
+Modelo de Taxa de Fala
+Durações reais dos áudios sintetizados por voz e taxa, ajustadas em um
+modelo linear (segundos por caractere) que alimenta tempo restante,
+profundidade de pré-carregamento e agenda de renderização
+Uso: python engines/modelo_fala.py
+"""
+
+import atexit
+import json
+import math
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Union
+
+
+def _arquivo_padrao() -> str:
+    """Arquivo padrão das estatísticas (cache/modelo_fala.json na raiz do projeto)."""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(raiz, 'cache', 'modelo_fala.json')
+
+
+def _percentual(taxa: str) -> int:
+    """'+25%' -> 25 (taxa no formato do Edge TTS)."""
+    try:
+        return int(taxa.strip().rstrip('%'))
+    except (AttributeError, ValueError):
+        return 0
+
+
+class _Regressao:
+    """
+    Somas suficientes de uma regressão y = a + b·x com esquecimento.
+
+    Cada amostra nova pesa 1 e as antigas decaem pelo fator de esquecimento,
+    então o ajuste acompanha mudanças (voz atualizada, rede mais lenta) e o
+    estado continua sendo só seis números.
+    """
+
+    __slots__ = ('n', 'sx', 'sy', 'sxx', 'sxy', 'sw')
+
+    def __init__(self, valores: Optional[Sequence[float]] = None):
+        self.n, self.sx, self.sy, self.sxx, self.sxy, self.sw = valores or (0.0,) * 6
+
+    def adicionar(self, x: float, y: float, palavras: int, esquecimento: float):
+        self.n = self.n * esquecimento + 1
+        self.sx = self.sx * esquecimento + x
+        self.sy = self.sy * esquecimento + y
+        self.sxx = self.sxx * esquecimento + x * x
+        self.sxy = self.sxy * esquecimento + x * y
+        self.sw = self.sw * esquecimento + palavras
+
+    def coeficientes(self):
+        """(a, b) por mínimos quadrados; sem variação em x, reta pela origem."""
+        denominador = self.n * self.sxx - self.sx * self.sx
+        if self.n >= 2 and denominador > 1e-9 * self.n * self.sxx:
+            b = (self.n * self.sxy - self.sx * self.sy) / denominador
+            a = (self.sy - b * self.sx) / self.n
+            if a >= 0 and b > 0:
+                return a, b
+        return 0.0, (self.sy / self.sx if self.sx else 0.0)
+
+    def estimar(self, x: float) -> float:
+        a, b = self.coeficientes()
+        return max(0.0, a + b * x)
+
+    def valores(self) -> List[float]:
+        return [round(v, 4) for v in (self.n, self.sx, self.sy, self.sxx, self.sxy, self.sw)]
+
+
+class ModeloTaxaFala:
+    """
+    Estatísticas compactas de síntese por voz e taxa.
+
+    Para cada (voz, taxa) guarda a regressão duração do áudio × caracteres
+    do texto (e as palavras, para o ritmo em palavras por minuto); para o
+    serviço como um todo guarda tempo de síntese × caracteres. Combinações
+    ainda sem amostras usam a mesma voz em outra taxa (escalada pela taxa)
+    ou os valores padrão.
+    """
+
+    VERSAO = 1
+    MIN_AMOSTRAS = 5
+    ESQUECIMENTO = 0.995  # ~200 amostras de memória efetiva
+    INTERVALO_DESCARGA = 10.0
+
+    # Antes de haver medições
+    PALAVRAS_POR_MINUTO = 150
+    CARACTERES_POR_PALAVRA = 5.8
+    LATENCIA_PADRAO = 1.5  # Segundos por síntese de parágrafo
+
+    def __init__(self, caminho: Optional[str] = None):
+        """
+        Args:
+            caminho: Arquivo JSON das estatísticas (padrão: cache/modelo_fala.json)
+        """
+        self.caminho = caminho or _arquivo_padrao()
+        self.lock = threading.RLock()
+        self.vozes = {}  # {(voz, taxa): _Regressao de duração × caracteres}
+        self.sintese = _Regressao()  # Tempo de síntese × caracteres
+        self.alterado = False
+        self._timer = None
+        self._carregar()
+        atexit.register(self.descarregar)
+
+    # ----- Persistência -----
+
+    def _carregar(self):
+        if not os.path.exists(self.caminho):
+            return
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Modelo de fala ignorado: {e}")
+            return
+        if dados.get('versao') != self.VERSAO:
+            return
+        for chave, valores in dados.get('vozes', {}).items():
+            voz, _, taxa = chave.rpartition('|')
+            self.vozes[(voz, taxa)] = _Regressao(valores)
+        if dados.get('sintese'):
+            self.sintese = _Regressao(dados['sintese'])
+
+    def descarregar(self):
+        """Grava as estatísticas se houver algo novo (substituição atômica)."""
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self.alterado:
+                return
+            dados = {
+                'versao': self.VERSAO,
+                'vozes': {f"{voz}|{taxa}": r.valores() for (voz, taxa), r in self.vozes.items()},
+                'sintese': self.sintese.valores()
+            }
+            self.alterado = False
+
+        temp = self.caminho + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+            with open(temp, 'w', encoding='utf-8') as f:
+                json.dump(dados, f, separators=(',', ':'))
+            os.replace(temp, self.caminho)
+        except OSError as e:
+            print(f"⚠️ Não foi possível salvar o modelo de fala: {e}")
+
+    def _marcar_alterado(self):
+        """Agenda a gravação (várias medições seguidas viram uma escrita)."""
+        self.alterado = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.INTERVALO_DESCARGA, self.descarregar)
+            self._timer.daemon = True
+            self._timer.start()
+
+    # ----- Medições -----
+
+    def registrar(self, texto: str, voz: str, taxa: str, duracao: float,
+                  tempo_sintese: Optional[float] = None):
+        """
+        Registra um áudio sintetizado.
+
+        Args:
+            texto: Texto sintetizado
+            voz: Voz do Edge TTS
+            taxa: Taxa no formato do Edge TTS ('+0%')
+            duracao: Duração do áudio em segundos
+            tempo_sintese: Segundos que a síntese levou (None = não medido)
+        """
+        caracteres = len(texto)
+        if duracao <= 0 or not caracteres:
+            return
+        palavras = len(texto.split())
+        with self.lock:
+            regressao = self.vozes.setdefault((voz, taxa), _Regressao())
+            regressao.adicionar(caracteres, duracao, palavras, self.ESQUECIMENTO)
+            if tempo_sintese is not None and tempo_sintese > 0:
+                self.sintese.adicionar(caracteres, tempo_sintese, palavras, self.ESQUECIMENTO)
+            self._marcar_alterado()
+
+    def _referencia(self, voz: str, taxa: str):
+        """
+        Regressão usada para (voz, taxa) e o fator que converte as durações dela.
+
+        Returns:
+            (regressao ou None, fator de duração)
+        """
+        with self.lock:
+            propria = self.vozes.get((voz, taxa))
+            if propria is not None and propria.n >= self.MIN_AMOSTRAS:
+                return propria, 1.0
+            # Mesma voz em outra taxa: a duração escala com 1 / (1 + taxa)
+            candidatas = [(r.n, t, r) for (v, t), r in self.vozes.items()
+                          if v == voz and r.n >= self.MIN_AMOSTRAS]
+        if candidatas:
+            _, taxa_medida, regressao = max(candidatas, key=lambda c: c[0])
+            fator = (1 + _percentual(taxa_medida) / 100) / (1 + _percentual(taxa) / 100)
+            return regressao, fator
+        return None, 1.0
+
+    # ----- Consultas -----
+
+    def estimar_duracao(self, texto: Union[str, int], voz: str, taxa: str) -> float:
+        """
+        Duração esperada do áudio de um texto.
+
+        Args:
+            texto: Texto ou número de caracteres
+            voz: Voz do Edge TTS
+            taxa: Taxa no formato do Edge TTS
+        """
+        caracteres = texto if isinstance(texto, int) else len(texto)
+        regressao, fator = self._referencia(voz, taxa)
+        if regressao is not None:
+            return regressao.estimar(caracteres) * fator
+        caracteres_por_segundo = self.CARACTERES_POR_PALAVRA * self.PALAVRAS_POR_MINUTO / 60
+        return caracteres / caracteres_por_segundo / (1 + _percentual(taxa) / 100)
+
+    def palavras_por_minuto(self, voz: str, taxa: str) -> float:
+        """Ritmo medido (ou estimado) da voz na taxa."""
+        regressao, fator = self._referencia(voz, taxa)
+        if regressao is not None and regressao.sy > 0:
+            return regressao.sw / regressao.sy * 60 / fator
+        return self.PALAVRAS_POR_MINUTO * (1 + _percentual(taxa) / 100)
+
+    def estimar_tempo_palavras(self, palavras: int, voz: str, taxa: str) -> float:
+        """Segundos de áudio para uma quantidade de palavras (ETA)."""
+        return palavras / self.palavras_por_minuto(voz, taxa) * 60
+
+    def estimar_sintese(self, texto: Union[str, int]) -> float:
+        """Segundos que o serviço costuma levar para sintetizar um texto."""
+        caracteres = texto if isinstance(texto, int) else len(texto)
+        with self.lock:
+            if self.sintese.n >= self.MIN_AMOSTRAS:
+                return self.sintese.estimar(caracteres)
+        return self.LATENCIA_PADRAO
+
+    def profundidade_precarregamento(self, voz: str, taxa: str, caracteres: int,
+                                     concorrencia: int = 3, minimo: int = 1,
+                                     maximo: int = 12) -> int:
+        """
+        Quantos parágrafos à frente sintetizar para não esperar a rede.
+
+        Enquanto um parágrafo toca, o próximo precisa ficar pronto: com
+        latência L por síntese e D segundos de áudio por parágrafo, a janela
+        precisa cobrir L / D parágrafos, mais um se a vazão das sínteses
+        simultâneas não acompanhar a reprodução.
+
+        Args:
+            voz: Voz do Edge TTS
+            taxa: Taxa no formato do Edge TTS
+            caracteres: Tamanho típico dos próximos parágrafos
+            concorrencia: Sínteses simultâneas do serviço
+            minimo: Menor profundidade retornada
+            maximo: Maior profundidade retornada
+        """
+        duracao = self.estimar_duracao(max(1, caracteres), voz, taxa)
+        latencia = self.estimar_sintese(max(1, caracteres))
+        if duracao <= 0:
+            return maximo
+        profundidade = math.ceil(latencia / duracao) + 1
+        if latencia / max(1, concorrencia) > duracao:
+            profundidade += 1  # A fila cresce: começar mais cedo ameniza
+        return max(minimo, min(maximo, profundidade))
+
+    def estimar_renderizacao(self, tamanhos: Sequence[int], concorrencia: int = 4) -> float:
+        """
+        Tempo de parede para sintetizar um lote de parágrafos.
+
+        Args:
+            tamanhos: Caracteres de cada parágrafo
+            concorrencia: Sínteses simultâneas
+        """
+        total = sum(self.estimar_sintese(c) for c in tamanhos if c)
+        return total / max(1, concorrencia)
+
+    def resumo(self) -> List[Dict]:
+        """Uma linha por (voz, taxa) medida, da mais usada para a menos usada."""
+        with self.lock:
+            itens = list(self.vozes.items())
+        linhas = []
+        for (voz, taxa), regressao in sorted(itens, key=lambda i: -i[1].n):
+            a, b = regressao.coeficientes()
+            linhas.append({
+                'voz': voz,
+                'taxa': taxa,
+                'amostras': round(regressao.n, 1),
+                'palavras_por_minuto': round(regressao.sw / regressao.sy * 60, 1) if regressao.sy else 0.0,
+                'segundos_por_caractere': round(b, 4),
+                'segundos_fixos': round(a, 3)
+            })
+        return linhas
+
+
+_modelo_global = None
+_lock_global = threading.Lock()
+
+
+def obter_modelo() -> ModeloTaxaFala:
+    """Retorna o modelo de fala compartilhado pela GUI, pelo CLI e pela renderização."""
+    global _modelo_global
+    with _lock_global:
+        if _modelo_global is None:
+            _modelo_global = ModeloTaxaFala()
+        return _modelo_global
+
+
+def main():
+    """Mostra o modelo medido até agora."""
+    modelo = obter_modelo()
+    linhas = modelo.resumo()
+    if not linhas:
+        print("📭 Nenhuma síntese medida ainda.")
+        return
+    print(f"\n🗣️ Modelo de fala ({modelo.caminho})\n")
+    print(f"  {'voz':<34} {'taxa':>6} {'amostras':>9} {'pal/min':>8} {'s/car':>8}")
+    for linha in linhas:
+        print(f"  {linha['voz']:<34} {linha['taxa']:>6} {linha['amostras']:>9.1f} "
+              f"{linha['palavras_por_minuto']:>8.1f} {linha['segundos_por_caractere']:>8.4f}")
+    print(f"\n  ⏱️ Síntese de 500 caracteres: ~{modelo.estimar_sintese(500):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
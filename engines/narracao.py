@@ -6,11 +6,14 @@ Usa Microsoft Edge TTS com 5 vozes em português
 import os
 import sys
 import tempfile
-import time
-import asyncio
-import edge_tts
+from concurrent.futures import CancelledError
+from typing import Dict, List
 import pygame
 
+from servico_sintese import ServicoSintese, obter_servico
+from reproducao import ControladorReproducao
+from dsp_audio import processar_pcm, processar_som
+
 
 class EngineNarracao:
     """Engine de narração multi-vozes com Edge TTS."""
@@ -24,13 +27,18 @@ class EngineNarracao:
         'Duarte': 'pt-PT-DuarteNeural'             # Masculino PT
     }
     
-    def __init__(self, voz_padrao='Francisca'):
+    def __init__(self, voz_padrao='Francisca', servico: ServicoSintese = None):
         self.temp_dir = tempfile.gettempdir()
+        self.servico = servico if servico else obter_servico()
+        self.futuro_atual = None
+        self.futuros_paragrafo = []  # Sínteses do parágrafo tocando agora
+        self.preparados = []  # Sínteses adiantadas do próximo parágrafo
         self.voz_atual = self.VOZES.get(voz_padrao, self.VOZES['Francisca'])
         self.mapeamento_personagens = {}
         
         # Inicializar pygame
         pygame.mixer.init(frequency=22050, size=-16, channels=1, buffer=512)
+        self.reprodutor = ControladorReproducao(pygame.mixer.Channel(0))
         
         print(f"✓ Engine iniciado com voz: {voz_padrao}")
     
@@ -48,18 +56,133 @@ class EngineNarracao:
             return True
         return False
     
-    async def _gerar_audio_async(self, texto: str, voz: str, velocidade: float):
-        """Gera áudio usando Edge TTS (async)."""
-        temp_file = os.path.join(self.temp_dir, f'tts_{hash(texto)}.mp3')
-        
+    @staticmethod
+    def _taxa(velocidade: float) -> str:
+        """Converte o multiplicador de velocidade para o formato do Edge TTS (+XX%)."""
+        return ServicoSintese.formatar_taxa(int((velocidade - 1.0) * 100))
+    
+    def _gerar_audio(self, texto: str, voz: str, velocidade: float):
+        """Solicita o áudio ao serviço de síntese e aguarda o arquivo."""
         # Ajustar taxa de velocidade (Edge TTS usa formato: +XX% ou -XX%)
-        rate_pct = int((velocidade - 1.0) * 100)
-        rate_str = f"+{rate_pct}%" if rate_pct >= 0 else f"{rate_pct}%"
+        rate_str = self._taxa(velocidade)
+        
+        self.futuro_atual = self.servico.sintetizar(texto, voz, rate_str)
+        try:
+            return self.futuro_atual.result()
+        finally:
+            self.futuro_atual = None
+    
+    def cancelar_sintese(self):
+        """Cancela as sínteses em andamento (se houver)."""
+        futuro = self.futuro_atual
+        if futuro:
+            futuro.cancel()
+        for futuro in self.futuros_paragrafo + self.preparados:
+            futuro.cancel()
+        self.preparados = []
+    
+    def _sintetizar_segmentos(self, segmentos: List[Dict], prioridade: int):
+        """Submete todos os segmentos ao serviço de síntese (em paralelo)."""
+        return [
+            self.servico.sintetizar(
+                seg['texto'],
+                seg.get('voz') or self.voz_atual,
+                self._taxa(seg['config'].get('velocidade', 1.0)),
+                prioridade=prioridade
+            )
+            for seg in segmentos
+        ]
+    
+    def preparar_paragrafo(self, segmentos: List[Dict]):
+        """
+        Adianta a síntese de um parágrafo (ex: o próximo, enquanto o atual toca).
+        
+        Os arquivos ficam no cache em disco; narrar_paragrafo() depois os
+        encontra prontos ou se junta à síntese em andamento.
+        
+        Args:
+            segmentos: Mesma lista aceita por narrar_paragrafo()
+        """
+        anteriores = self.preparados
+        self.preparados = self._sintetizar_segmentos(segmentos, prioridade=1)
+        for futuro in anteriores:
+            futuro.cancel()
+    
+    @staticmethod
+    def _silencio(segundos: float) -> bytes:
+        """PCM de silêncio no formato do mixer."""
+        frequencia, tamanho, canais = pygame.mixer.get_init()
+        amostras = int(segundos * frequencia) * canais
+        if tamanho < 0:
+            return bytes(amostras * (abs(tamanho) // 8))
+        # Formatos sem sinal: silêncio é o meio da escala
+        return (b'\x80' if tamanho == 8 else b'\x00\x80') * amostras
+    
+    def narrar_paragrafo(self, segmentos: List[Dict], controlador=None,
+                         proximo: List[Dict] = None) -> bool:
+        """
+        Narra um parágrafo inteiro como um fluxo contínuo.
         
-        communicate = edge_tts.Communicate(texto, voz, rate=rate_str)
-        await communicate.save(temp_file)
+        Todos os segmentos são sintetizados ao mesmo tempo. Cada um vira um
+        bloco PCM com o volume (dB) e o tom da emoção aplicados e as pausas
+        inseridas como silêncio (pausa_antes e pausa_depois); os blocos entram
+        em ordem na fila do canal, então não há lacuna entre segmentos e a rede
+        não espera a reprodução.
         
-        return temp_file
+        Args:
+            segmentos: Lista de {'texto', 'config' (da emoção), 'voz' (opcional)}
+            controlador: Controlador de narração (opcional)
+            proximo: Segmentos do próximo parágrafo, sintetizados logo depois
+                     dos deste (opcional)
+        
+        Returns:
+            True se o parágrafo foi narrado até o fim
+        """
+        segmentos = [seg for seg in segmentos if seg['texto'].strip()]
+        if not segmentos:
+            if proximo:
+                self.preparar_paragrafo(proximo)
+            return True
+        
+        # Pausa, pulo e parada do controlador chegam como notificações no reprodutor
+        self.reprodutor.reiniciar()
+        if controlador:
+            controlador.conectar_reprodutor(self.reprodutor)
+            if controlador.foi_interrompido():
+                return False
+        
+        frequencia, tamanho, canais = pygame.mixer.get_init()
+        self.futuros_paragrafo = self._sintetizar_segmentos(segmentos, prioridade=0)
+        if proximo:
+            self.preparar_paragrafo(proximo)
+        try:
+            for seg, futuro in zip(segmentos, self.futuros_paragrafo):
+                if not self.reprodutor.aguardar_futuro(futuro):
+                    return False
+                try:
+                    som = pygame.mixer.Sound(futuro.result())
+                except CancelledError:
+                    return False
+                except Exception as e:
+                    print(f"   ⚠️ Erro: {e}")
+                    continue
+                
+                config = seg['config']
+                pcm = processar_pcm(som.get_raw(), frequencia, tamanho, canais,
+                                    ganho_db=config.get('volume', 0),
+                                    tom=config.get('tom', 0))
+                bloco = (self._silencio(config.get('pausa_antes', 0))
+                         + pcm
+                         + self._silencio(config.get('pausa_depois', 0.05)))
+                if not self.reprodutor.enfileirar(pygame.mixer.Sound(buffer=bloco)):
+                    return False
+            
+            return self.reprodutor.aguardar_fim()
+        finally:
+            # Interrompido no meio: o resto do parágrafo não é mais necessário
+            for futuro in self.futuros_paragrafo:
+                futuro.cancel()
+            self.futuros_paragrafo = []
     
     def narrar_segmento(self, texto: str, config_emocao: dict, voz_override: str = None, controlador=None):
         """
@@ -74,10 +197,17 @@ class EngineNarracao:
         if not texto.strip():
             return
         
+        # Pausa, pulo e parada do controlador chegam como notificações no reprodutor
+        self.reprodutor.reiniciar()
+        if controlador:
+            controlador.conectar_reprodutor(self.reprodutor)
+            if controlador.foi_interrompido():
+                return
+        
         # Pausa antes
         pausa_antes = config_emocao.get('pausa_antes', 0)
-        if pausa_antes > 0:
-            time.sleep(pausa_antes)
+        if pausa_antes > 0 and not self.reprodutor.aguardar(pausa_antes):
+            return
         
         # Escolher voz
         voz = voz_override if voz_override else self.voz_atual
@@ -87,44 +217,27 @@ class EngineNarracao:
         
         # Gerar áudio
         try:
-            arquivo = asyncio.run(self._gerar_audio_async(texto, voz, velocidade))
+            arquivo = self._gerar_audio(texto, voz, velocidade)
+            if self.reprodutor.interrompido:
+                return
             
-            # Reproduzir
-            pygame.mixer.music.load(arquivo)
-            pygame.mixer.music.play()
-            
-            estava_pausado = False
-            while pygame.mixer.music.get_busy():
-                # Verificar controles
-                if controlador:
-                    # Verificar se deve parar ou pular (interrompe imediatamente)
-                    if controlador.foi_interrompido():
-                        pygame.mixer.music.stop()
-                        break
-                    
-                    # Pausar
-                    if controlador.deve_pausar() and not estava_pausado:
-                        pygame.mixer.music.pause()
-                        estava_pausado = True
-                    elif not controlador.deve_pausar() and estava_pausado:
-                        pygame.mixer.music.unpause()
-                        estava_pausado = False
-                
-                time.sleep(0.05)
-            
-            # Limpar
-            try:
-                os.remove(arquivo)
-            except:
-                pass
+            # Reproduzir e dormir até o fim (ou até pausa/pulo/parada)
+            som = processar_som(pygame.mixer.Sound(arquivo),
+                                ganho_db=config_emocao.get('volume', 0),
+                                tom=config_emocao.get('tom', 0))
+            self.reprodutor.tocar(som)
+            if not self.reprodutor.aguardar_fim():
+                return
         
+        except CancelledError:
+            return
         except Exception as e:
             print(f"   ⚠️ Erro: {e}")
         
         # Pausa depois
         pausa_depois = config_emocao.get('pausa_depois', 0.05)
         if pausa_depois > 0:
-            time.sleep(pausa_depois)
+            self.reprodutor.aguardar(pausa_depois)
     
     def finalizar(self):
         """Libera recursos."""
@@ -0,0 +1,194 @@
+"""
+Controle de Reprodução Orientado a Eventos
+Aguarda o fim do áudio com uma Condition em vez de polling do canal
+"""
+
+import threading
+import time
+from collections import deque
+
+import pygame
+
+
+class ControladorReproducao:
+    """
+    Toca sons em um pygame.mixer.Channel e espera o fim sem busy-wait.
+
+    O fim de cada som é previsto pela duração (Sound.get_length()), e a
+    thread de narração dorme na Condition até esse instante. Pausar,
+    retomar e interromper são notificações que acordam quem está esperando,
+    então o custo de CPU ocioso é praticamente zero.
+    """
+
+    # Folga para o mixer terminar o último buffer depois do fim previsto
+    TOLERANCIA_FIM = 0.02
+
+    def __init__(self, canal: pygame.mixer.Channel):
+        """
+        Args:
+            canal: Canal do mixer usado para a narração
+        """
+        self.canal = canal
+        self.condicao = threading.Condition()
+        self.pausado = False
+        self.interrompido = False
+        self._fins = deque()  # Instantes previstos de término (tocando + fila)
+        self._inicio_pausa = None
+
+    def _descartar_terminados(self, agora: float):
+        while self._fins and self._fins[0] <= agora:
+            self._fins.popleft()
+
+    def reiniciar(self):
+        """Libera o reprodutor depois de uma interrupção, para um novo trecho."""
+        with self.condicao:
+            self.interrompido = False
+
+    def tocar(self, som: pygame.mixer.Sound):
+        """Toca um som imediatamente, substituindo o que estiver no canal."""
+        with self.condicao:
+            agora = time.monotonic()
+            self.canal.play(som)
+            if self.pausado:
+                self.canal.pause()
+                self._inicio_pausa = agora
+            self._fins = deque([agora + som.get_length()])
+            self.condicao.notify_all()
+
+    def enfileirar(self, som: pygame.mixer.Sound) -> bool:
+        """
+        Agenda um som para tocar logo após os atuais, sem lacuna.
+
+        O canal do pygame só guarda um som na fila, então espera (dormindo)
+        até a vaga abrir.
+
+        Returns:
+            False se a reprodução foi interrompida enquanto esperava
+        """
+        with self.condicao:
+            while not self.interrompido:
+                agora = time.monotonic()
+                self._descartar_terminados(agora)
+
+                if not self._fins and not self.pausado:
+                    # Nada tocando: começar direto
+                    self.canal.play(som)
+                    self._fins.append(agora + som.get_length())
+                    return True
+
+                if len(self._fins) < 2 and self.canal.get_queue() is None:
+                    if self.canal.get_busy():
+                        self.canal.queue(som)
+                    else:
+                        self.canal.play(som)
+                        if self.pausado:
+                            self.canal.pause()
+                    base = self._fins[-1] if self._fins else (self._inicio_pausa or agora)
+                    self._fins.append(base + som.get_length())
+                    return True
+
+                if self.pausado:
+                    self.condicao.wait()
+                else:
+                    self.condicao.wait(max(self._fins[0] - agora, 0) + self.TOLERANCIA_FIM)
+            return False
+
+    def aguardar_fim(self) -> bool:
+        """
+        Bloqueia até todos os sons agendados terminarem.
+
+        Returns:
+            True se terminou normalmente, False se foi interrompido
+        """
+        with self.condicao:
+            while not self.interrompido:
+                if self.pausado:
+                    self.condicao.wait()
+                    continue
+
+                agora = time.monotonic()
+                self._descartar_terminados(agora)
+                if self._fins:
+                    self.condicao.wait(self._fins[-1] - agora)
+                    continue
+
+                if self.canal.get_busy():
+                    # O mixer ainda esvaziando o buffer
+                    self.condicao.wait(self.TOLERANCIA_FIM)
+                    continue
+                return True
+            return False
+
+    def aguardar(self, segundos: float) -> bool:
+        """
+        Espera um intervalo (ex: pausa entre segmentos) respeitando pausa e parada.
+
+        Returns:
+            False se foi interrompido durante a espera
+        """
+        with self.condicao:
+            restante = segundos
+            while restante > 0 and not self.interrompido:
+                if self.pausado:
+                    self.condicao.wait()
+                    continue
+                inicio = time.monotonic()
+                self.condicao.wait(restante)
+                restante -= time.monotonic() - inicio
+            return not self.interrompido
+
+    def aguardar_futuro(self, futuro) -> bool:
+        """
+        Espera um Future (ex: uma síntese) sem polling.
+
+        Returns:
+            False se a reprodução foi interrompida antes do Future terminar
+        """
+        def _notificar(_):
+            with self.condicao:
+                self.condicao.notify_all()
+
+        futuro.add_done_callback(_notificar)
+        with self.condicao:
+            while not futuro.done():
+                if self.interrompido:
+                    return False
+                self.condicao.wait()
+            return not self.interrompido
+
+    def pausar(self):
+        """Pausa o canal e congela a previsão de término."""
+        with self.condicao:
+            if self.pausado:
+                return
+            self.pausado = True
+            self._inicio_pausa = time.monotonic()
+            self.canal.pause()
+            self.condicao.notify_all()
+
+    def retomar(self):
+        """Retoma o canal e adia a previsão de término pelo tempo pausado."""
+        with self.condicao:
+            if not self.pausado:
+                return
+            self.pausado = False
+            if self._inicio_pausa is not None:
+                atraso = time.monotonic() - self._inicio_pausa
+                self._fins = deque(fim + atraso for fim in self._fins)
+            self._inicio_pausa = None
+            self.canal.unpause()
+            self.condicao.notify_all()
+
+    def interromper(self):
+        """Para o canal e libera quem estiver esperando."""
+        with self.condicao:
+            self.interrompido = True
+            self.canal.stop()
+            self._fins.clear()
+            self.condicao.notify_all()
+
+    def ocupado(self) -> bool:
+        """Indica se ainda há som agendado ou tocando."""
+        with self.condicao:
+            self._descartar_terminados(time.monotonic())
+            return bool(self._fins) or self.canal.get_busy()
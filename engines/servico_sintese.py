@@ -0,0 +1,338 @@
+"""
+Serviço de Síntese TTS
+Mantém um único event loop asyncio em background para todas as sínteses
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
+import edge_tts
+
+from cache_audio import CacheAudio, obter_cache_global
+from modelo_fala import ModeloTaxaFala, obter_modelo
+from streaming_mp3 import estimar_duracao
+
+
+class _PortaoPrioridade:
+    """
+    Limita a concorrência do loop liberando vagas pela menor prioridade.
+
+    Deve ser usado apenas de dentro do event loop do serviço.
+    """
+
+    def __init__(self, limite: int):
+        self.limite = limite
+        self.ativos = 0
+        self.fila = []  # heap de [prioridade, seq, future, chave, valida]
+        self.entradas = {}  # {chave: entrada na fila}
+        self.contador = itertools.count()
+
+    async def entrar(self, prioridade: int, chave: str):
+        """Aguarda uma vaga; pedidos de menor prioridade passam primeiro."""
+        if self.ativos < self.limite and not self.fila:
+            self.ativos += 1
+            return
+
+        futuro = asyncio.get_running_loop().create_future()
+        entrada = [prioridade, next(self.contador), futuro, chave, True]
+        heapq.heappush(self.fila, entrada)
+        self.entradas[chave] = entrada
+
+        try:
+            await futuro
+        except asyncio.CancelledError:
+            if futuro.done() and not futuro.cancelled():
+                # A vaga foi concedida, mas o pedido foi cancelado antes de usá-la
+                self.sair()
+            raise
+        finally:
+            atual = self.entradas.get(chave)
+            if atual is not None and atual[2] is futuro:
+                del self.entradas[chave]
+
+    def repriorizar(self, chave: str, prioridade: int):
+        """Antecipa um pedido que ainda está esperando vaga."""
+        entrada = self.entradas.get(chave)
+        if entrada is None or prioridade >= entrada[0]:
+            return
+        entrada[4] = False
+        nova = [prioridade, next(self.contador), entrada[2], chave, True]
+        heapq.heappush(self.fila, nova)
+        self.entradas[chave] = nova
+
+    def sair(self):
+        """Libera uma vaga e acorda o próximo pedido da fila."""
+        self.ativos -= 1
+        self._acordar()
+
+    def definir_limite(self, limite: int):
+        """Muda o número de vagas (quem já está ativo termina normalmente)."""
+        self.limite = limite
+        self._acordar()
+
+    def _acordar(self):
+        while self.ativos < self.limite and self.fila:
+            entrada = heapq.heappop(self.fila)
+            futuro = entrada[2]
+            if not entrada[4] or futuro.done():
+                continue
+            self.ativos += 1
+            futuro.set_result(None)
+
+
+class ServicoSintese:
+    """
+    Serviço de síntese Edge TTS com loop de eventos de longa duração.
+
+    A GUI e o narrador CLI submetem pedidos de qualquer thread e recebem
+    um concurrent.futures.Future com o caminho do áudio. O loop é criado
+    uma única vez, o número de sínteses simultâneas é limitado e as vagas
+    são liberadas por prioridade (0 = mais urgente). Cada pedido pode ser
+    cancelado pelo próprio Future. Toda síntese nova (fora do cache) tem a
+    duração do áudio e o tempo gasto registrados no modelo de fala.
+
+    Pedidos iguais (mesmo texto, voz e taxa) compartilham uma única síntese,
+    inclusive entre sintetizar() e transmitir(): quem transmite recebe os
+    pedaços que já chegaram e depois os novos, conforme a síntese avança.
+    """
+
+    def __init__(self, max_concorrencia: int = 3, cache: Optional[CacheAudio] = None,
+                 modelo: Optional[ModeloTaxaFala] = None):
+        """
+        Inicia o serviço e a thread do event loop.
+
+        Args:
+            max_concorrencia: Máximo de sínteses em paralelo
+            cache: Cache de áudio em disco (usa o global se omitido)
+            modelo: Modelo de taxa de fala que recebe as medições (usa o global se omitido)
+        """
+        self.cache = cache if cache else obter_cache_global()
+        self.modelo = modelo if modelo else obter_modelo()
+        self.max_concorrencia = max_concorrencia
+
+        # Tarefas em andamento por chave, compartilhadas entre pedidos iguais
+        self._tarefas = {}
+        self._interessados = {}
+        self._recebidos = {}  # {chave: pedaços de MP3 já recebidos}
+        self._ouvintes = {}  # {chave: funções que recebem os próximos pedaços}
+
+        self.loop = asyncio.new_event_loop()
+        self._pronto = threading.Event()
+        self.thread = threading.Thread(
+            target=self._executar_loop,
+            name='ServicoSintese',
+            daemon=True
+        )
+        self.thread.start()
+        self._pronto.wait()
+
+    def _executar_loop(self):
+        """Corpo da thread: roda o event loop até finalizar()."""
+        asyncio.set_event_loop(self.loop)
+        self.portao = _PortaoPrioridade(self.max_concorrencia)
+        self._pronto.set()
+        self.loop.run_forever()
+
+    @staticmethod
+    def formatar_taxa(percentual: int) -> str:
+        """Converte um percentual inteiro para o formato do Edge TTS (+XX%)."""
+        return f"{int(percentual):+d}%"
+
+    def sintetizar(self, texto: str, voz: str, taxa: str = '+0%',
+                   prioridade: int = 0) -> Future:
+        """
+        Solicita a síntese de um texto.
+
+        Args:
+            texto: Texto a sintetizar
+            voz: Voz do Edge TTS (ex: pt-BR-FranciscaNeural)
+            taxa: Velocidade no formato do Edge TTS (ex: '+10%')
+            prioridade: Ordem de atendimento (0 = tocar agora, N = N parágrafos à frente)
+
+        Returns:
+            Future que resolve para o caminho do arquivo MP3
+        """
+        chave = CacheAudio.gerar_chave(texto, voz, taxa, 'edge')
+
+        # Caminho rápido: já está em disco, nem passa pelo loop
+        arquivo = self.cache.obter(chave)
+        if arquivo:
+            futuro = Future()
+            futuro.set_result(arquivo)
+            return futuro
+
+        return asyncio.run_coroutine_threadsafe(
+            self._aguardar(
+                chave,
+                lambda: self._sintetizar(texto, voz, taxa, chave, prioridade),
+                prioridade
+            ),
+            self.loop
+        )
+
+    def em_cache(self, texto: str, voz: str, taxa: str = '+0%') -> Optional[str]:
+        """Retorna o caminho do áudio se ele já estiver no cache em disco."""
+        return self.cache.obter(CacheAudio.gerar_chave(texto, voz, taxa, 'edge'))
+
+    def transmitir(self, texto: str, voz: str, taxa: str, ao_receber,
+                   prioridade: int = 0) -> Future:
+        """
+        Sintetiza em modo streaming, entregando o MP3 conforme ele chega.
+
+        Args:
+            texto: Texto a sintetizar
+            voz: Voz do Edge TTS
+            taxa: Velocidade no formato do Edge TTS (ex: '+10%')
+            ao_receber: Função chamada (na thread do loop) com cada pedaço de bytes
+            prioridade: Ordem de atendimento (0 = mais urgente)
+
+        Returns:
+            Future que resolve para o caminho do áudio completo no cache
+        """
+        chave = CacheAudio.gerar_chave(texto, voz, taxa, 'edge')
+        return asyncio.run_coroutine_threadsafe(
+            self._aguardar(
+                chave,
+                lambda: self._sintetizar(texto, voz, taxa, chave, prioridade),
+                prioridade,
+                ao_receber
+            ),
+            self.loop
+        )
+
+    def definir_concorrencia(self, limite: int):
+        """Ajusta o máximo de sínteses em paralelo (vale para os próximos pedidos)."""
+        limite = max(1, int(limite))
+        if limite == self.max_concorrencia:
+            return
+        self.max_concorrencia = limite
+        self.loop.call_soon_threadsafe(self.portao.definir_limite, limite)
+
+    def executar(self, corrotina) -> Future:
+        """Agenda uma corrotina qualquer no loop do serviço."""
+        return asyncio.run_coroutine_threadsafe(corrotina, self.loop)
+
+    async def _aguardar(self, chave: str, fabrica, prioridade: int = 0, ao_receber=None):
+        """
+        Aguarda a tarefa de uma chave, criando-a se necessário.
+
+        Pedidos iguais compartilham a mesma síntese. Cancelar um pedido só
+        cancela a síntese quando ninguém mais está esperando por ela.
+
+        Args:
+            ao_receber: Recebe os pedaços de MP3 da síntese (os já chegados
+                        primeiro), para quem toca em streaming
+        """
+        tarefa = self._tarefas.get(chave)
+        if tarefa is None:
+            tarefa = self.loop.create_task(fabrica())
+            self._tarefas[chave] = tarefa
+            self._interessados[chave] = 0
+            self._recebidos[chave] = []
+            self._ouvintes[chave] = []
+
+            def _remover(t, chave=chave):
+                if self._tarefas.get(chave) is t:
+                    del self._tarefas[chave]
+                    del self._interessados[chave]
+                    del self._recebidos[chave]
+                    del self._ouvintes[chave]
+
+            tarefa.add_done_callback(_remover)
+        else:
+            self.portao.repriorizar(chave, prioridade)
+
+        ouvintes = self._ouvintes[chave]
+        if ao_receber is not None:
+            # Mesmo thread do loop: nenhum pedaço chega entre o replay e a inscrição
+            for pedaco in self._recebidos[chave]:
+                ao_receber(pedaco)
+            ouvintes.append(ao_receber)
+
+        self._interessados[chave] += 1
+        try:
+            return await asyncio.shield(tarefa)
+        except asyncio.CancelledError:
+            if self._tarefas.get(chave) is tarefa:
+                self._interessados[chave] -= 1
+                if self._interessados[chave] <= 0:
+                    tarefa.cancel()
+            raise
+        finally:
+            if ao_receber is not None and ao_receber in ouvintes:
+                ouvintes.remove(ao_receber)
+
+    def _distribuir(self, chave: str, pedaco: bytes):
+        """Guarda um pedaço de MP3 e repassa para quem está transmitindo a chave."""
+        self._recebidos[chave].append(pedaco)
+        for ouvinte in list(self._ouvintes[chave]):
+            ouvinte(pedaco)
+
+    async def _sintetizar(self, texto: str, voz: str, taxa: str, chave: str,
+                          prioridade: int = 0) -> str:
+        """
+        Sintetiza respeitando o limite de concorrência.
+
+        Consome Communicate.stream() gravando no cache e repassando cada
+        pedaço aos ouvintes da chave (ver _aguardar).
+        """
+        await self.portao.entrar(prioridade, chave)
+        try:
+            arquivo = self.cache.obter(chave)
+            if arquivo:
+                if self._ouvintes[chave]:
+                    with open(arquivo, 'rb') as f:
+                        self._distribuir(chave, f.read())
+                return arquivo
+
+            temp_file = self.cache.caminho_temporario(chave)
+            inicio = self.loop.time()
+            try:
+                with open(temp_file, 'wb') as saida:
+                    communicate = edge_tts.Communicate(texto, voz, rate=taxa)
+                    async for pedaco in communicate.stream():
+                        if pedaco['type'] == 'audio':
+                            saida.write(pedaco['data'])
+                            self._distribuir(chave, pedaco['data'])
+            except BaseException:
+                try:
+                    os.remove(temp_file)
+                except OSError:
+                    pass
+                raise
+
+            self._medir(texto, voz, taxa, temp_file, self.loop.time() - inicio)
+            return self.cache.registrar(chave, temp_file)
+        finally:
+            self.portao.sair()
+
+    def _medir(self, texto: str, voz: str, taxa: str, arquivo: str, tempo_sintese: float):
+        """Registra duração do áudio e tempo de síntese no modelo de fala."""
+        try:
+            self.modelo.registrar(texto, voz, taxa, estimar_duracao(arquivo), tempo_sintese)
+        except Exception as e:
+            print(f"⚠️ Falha ao medir síntese: {e}")
+
+    def finalizar(self):
+        """Para o event loop e aguarda a thread terminar."""
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=2.0)
+
+
+_servico_global = None
+_lock_global = threading.Lock()
+
+
+def obter_servico() -> ServicoSintese:
+    """Retorna o serviço de síntese compartilhado pela GUI e pelo CLI."""
+    global _servico_global
+    with _lock_global:
+        if _servico_global is None:
+            _servico_global = ServicoSintese()
+        return _servico_global
@@ -0,0 +1,269 @@
+"""
+Decodificação Incremental de MP3
+Divide um fluxo MP3 em quadros e decodifica blocos para pygame.Sound
+conforme os bytes chegam, sem esperar o arquivo completo
+"""
+
+import io
+import os
+import struct
+from collections import namedtuple
+from typing import List, Optional, Tuple
+
+import pygame
+
+
+QuadroMP3 = namedtuple('QuadroMP3', ['tamanho', 'amostras', 'taxa_amostragem', 'bitrate'])
+
+# Tabelas do cabeçalho MPEG Layer III
+_BITRATES = {
+    'mpeg1': [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    'mpeg2': [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_TAXAS_AMOSTRAGEM = {
+    3: [44100, 48000, 32000],  # MPEG1
+    2: [22050, 24000, 16000],  # MPEG2
+    0: [11025, 12000, 8000],   # MPEG2.5
+}
+
+
+def ler_cabecalho(dados, pos: int = 0) -> Optional[QuadroMP3]:
+    """
+    Interpreta o cabeçalho de um quadro MP3 (Layer III).
+
+    Args:
+        dados: Bytes do fluxo
+        pos: Posição do início do quadro
+
+    Returns:
+        QuadroMP3 ou None se não houver um cabeçalho válido na posição
+    """
+    if pos + 4 > len(dados):
+        return None
+
+    b1, b2, b3 = dados[pos + 1], dados[pos + 2], dados[pos + 3]
+    if dados[pos] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    versao = (b1 >> 3) & 0x03
+    camada = (b1 >> 1) & 0x03
+    if versao == 1 or camada != 1:  # versão reservada ou não é Layer III
+        return None
+
+    indice_bitrate = (b2 >> 4) & 0x0F
+    indice_taxa = (b2 >> 2) & 0x03
+    if indice_bitrate in (0, 15) or indice_taxa == 3:
+        return None
+
+    padding = (b2 >> 1) & 0x01
+    taxa = _TAXAS_AMOSTRAGEM[versao][indice_taxa]
+
+    if versao == 3:
+        bitrate = _BITRATES['mpeg1'][indice_bitrate] * 1000
+        amostras = 1152
+        tamanho = 144 * bitrate // taxa + padding
+    else:
+        bitrate = _BITRATES['mpeg2'][indice_bitrate] * 1000
+        amostras = 576
+        tamanho = 72 * bitrate // taxa + padding
+
+    # b3 (modo de canal, etc.) não afeta o tamanho do quadro
+    return QuadroMP3(tamanho, amostras, taxa, bitrate)
+
+
+def pular_id3(dados) -> int:
+    """Retorna o tamanho de uma tag ID3v2 no início dos dados (0 se não houver)."""
+    if len(dados) >= 10 and dados[:3] == b'ID3':
+        tamanho = ((dados[6] & 0x7F) << 21 | (dados[7] & 0x7F) << 14 |
+                   (dados[8] & 0x7F) << 7 | (dados[9] & 0x7F))
+        return 10 + tamanho
+    return 0
+
+
+def dividir_quadros(dados, inicio: int = 0) -> Tuple[List[Tuple[int, int, QuadroMP3]], int]:
+    """
+    Localiza os quadros completos em um buffer.
+
+    Args:
+        dados: Bytes do fluxo
+        inicio: Posição onde começar a busca
+
+    Returns:
+        (lista de (início, fim, quadro), posição do primeiro byte não consumido)
+    """
+    quadros = []
+    pos = inicio
+    total = len(dados)
+
+    while pos + 4 <= total:
+        quadro = ler_cabecalho(dados, pos)
+        if quadro is None:
+            pos += 1  # ressincronizar
+            continue
+        fim = pos + quadro.tamanho
+        if fim > total:
+            break
+        quadros.append((pos, fim, quadro))
+        pos = fim
+
+    return quadros, pos
+
+
+def estimar_duracao(caminho: str) -> float:
+    """
+    Estima a duração de um arquivo MP3 lendo só o início dele.
+
+    Usa a contagem de quadros do cabeçalho Xing/Info ou VBRI quando existe
+    (arquivos VBR) e, caso contrário, o tamanho do arquivo e o bitrate do
+    primeiro quadro (CBR). Não decodifica áudio.
+
+    Args:
+        caminho: Caminho do arquivo MP3
+
+    Returns:
+        Duração em segundos (0.0 se não for possível determinar)
+    """
+    try:
+        tamanho_arquivo = os.path.getsize(caminho)
+        with open(caminho, 'rb') as f:
+            cabecalho = f.read(10)
+            inicio = pular_id3(cabecalho)
+            f.seek(inicio)
+            dados = f.read(16384)
+            tem_id3v1 = False
+            if tamanho_arquivo >= 128:
+                f.seek(tamanho_arquivo - 128)
+                tem_id3v1 = f.read(3) == b'TAG'
+    except OSError:
+        return 0.0
+
+    # Primeiro quadro válido (confirmado pelo quadro seguinte quando possível)
+    pos = 0
+    quadro = None
+    while pos + 4 <= len(dados):
+        quadro = ler_cabecalho(dados, pos)
+        if quadro:
+            seguinte = pos + quadro.tamanho
+            if seguinte + 4 > len(dados) or ler_cabecalho(dados, seguinte):
+                break
+        quadro = None
+        pos += 1
+    if quadro is None:
+        return 0.0
+
+    # Cabeçalho VBR: fica logo após a side info do primeiro quadro
+    mpeg1 = quadro.amostras == 1152
+    mono = (dados[pos + 3] >> 6) == 3
+    if mpeg1:
+        deslocamento_xing = 4 + (17 if mono else 32)
+    else:
+        deslocamento_xing = 4 + (9 if mono else 17)
+
+    xing = pos + deslocamento_xing
+    if dados[xing:xing + 4] in (b'Xing', b'Info') and len(dados) >= xing + 12:
+        flags = struct.unpack('>I', dados[xing + 4:xing + 8])[0]
+        if flags & 0x01:
+            total_quadros = struct.unpack('>I', dados[xing + 8:xing + 12])[0]
+            return total_quadros * quadro.amostras / quadro.taxa_amostragem
+
+    vbri = pos + 36
+    if dados[vbri:vbri + 4] == b'VBRI' and len(dados) >= vbri + 18:
+        total_quadros = struct.unpack('>I', dados[vbri + 14:vbri + 18])[0]
+        return total_quadros * quadro.amostras / quadro.taxa_amostragem
+
+    # CBR: bytes de áudio / bytes por segundo
+    bytes_audio = tamanho_arquivo - inicio - pos - (128 if tem_id3v1 else 0)
+    return max(bytes_audio, 0) * 8 / quadro.bitrate
+
+
+class DecodificadorMP3Incremental:
+    """
+    Converte pedaços de um fluxo MP3 em pygame.Sound tocáveis.
+
+    O decodificador do SDL_mixer não mantém estado entre chamadas e um bloco
+    decodificado isoladamente perde quadros (bit reservoir) e desalinha o
+    reamostrador. Por isso cada passo decodifica o fluxo desde o início e
+    entrega só o PCM novo, segurando uma pequena margem no final, que ainda
+    pode mudar quando chegarem mais quadros. Os blocos crescem em progressão
+    geométrica, então o custo total fica em torno de duas decodificações.
+    """
+
+    # Amostras seguradas no fim de cada passo (cauda instável do reamostrador)
+    AMOSTRAS_MARGEM = 2048
+
+    def __init__(self, duracao_primeiro_bloco: float = 0.3, fator_crescimento: float = 2.0):
+        """
+        Args:
+            duracao_primeiro_bloco: Segundos de áudio no primeiro bloco
+            fator_crescimento: Quanto cada bloco é maior que o anterior
+        """
+        self.duracao_proximo_bloco = duracao_primeiro_bloco
+        self.fator_crescimento = fator_crescimento
+
+        self.dados = bytearray()
+        self.pos_analise = None  # Onde continuar procurando quadros
+        self.duracao_total = 0.0  # Segundos em quadros completos recebidos
+        self.duracao_decodificada = 0.0  # Segundos cobertos pelo último passo
+        self.bytes_entregues = 0  # PCM já devolvido como Sound
+        self.blocos_gerados = 0
+
+    def alimentar(self, dados: bytes) -> List[pygame.mixer.Sound]:
+        """
+        Adiciona bytes recebidos e retorna os blocos já decodificáveis.
+
+        Args:
+            dados: Pedaço do fluxo MP3
+
+        Returns:
+            Lista (possivelmente vazia) de sons prontos para tocar em ordem
+        """
+        self.dados.extend(dados)
+
+        if self.pos_analise is None:
+            if len(self.dados) < 10:
+                return []
+            tamanho_id3 = pular_id3(self.dados)
+            if len(self.dados) < tamanho_id3:
+                return []
+            self.pos_analise = tamanho_id3
+
+        quadros, self.pos_analise = dividir_quadros(self.dados, self.pos_analise)
+        for _, _, quadro in quadros:
+            self.duracao_total += quadro.amostras / quadro.taxa_amostragem
+
+        if self.duracao_total - self.duracao_decodificada < self.duracao_proximo_bloco:
+            return []
+
+        self.duracao_decodificada = self.duracao_total
+        self.duracao_proximo_bloco *= self.fator_crescimento
+        som = self._decodificar(bytes(self.dados[:self.pos_analise]), final=False)
+        return [som] if som else []
+
+    def finalizar(self) -> List[pygame.mixer.Sound]:
+        """Decodifica o que restou no fim do fluxo."""
+        if not self.dados:
+            return []
+        som = self._decodificar(bytes(self.dados), final=True)
+        return [som] if som else []
+
+    def _decodificar(self, dados: bytes, final: bool) -> Optional[pygame.mixer.Sound]:
+        """Decodifica o fluxo inteiro e devolve apenas o PCM ainda não entregue."""
+        try:
+            bruto = pygame.mixer.Sound(file=io.BytesIO(dados)).get_raw()
+        except pygame.error as e:
+            print(f"⚠️ Erro ao decodificar MP3: {e}")
+            return None
+
+        fim = len(bruto)
+        if not final:
+            _, formato, canais = pygame.mixer.get_init()
+            bytes_por_amostra = abs(formato) // 8 * canais
+            fim -= self.AMOSTRAS_MARGEM * bytes_por_amostra
+
+        if fim <= self.bytes_entregues:
+            return None
+
+        trecho = bruto[self.bytes_entregues:fim]
+        self.bytes_entregues = fim
+        self.blocos_gerados += 1
+        return pygame.mixer.Sound(buffer=trecho)
@@ -11,6 +11,11 @@ import time
 sys.path.insert(0, os.path.dirname(__file__))
 
 from extratores.centralnovel import ExtratorCentralNovel
+from extratores.extracao_paralela import ExtracaoParalela
+from extratores.cache_http import PaginaNaoEmCache
+
+
+URL_CAPITULO = 'https://centralnovel.com/martial-world-capitulo-{numero}/'
 
 
 def extrair_capitulo_unico(numero: int):
@@ -18,7 +23,7 @@ def extrair_capitulo_unico(numero: int):
     extrator = ExtratorCentralNovel()
     
     # URL do capítulo
-    url = f'https://centralnovel.com/martial-world-capitulo-{numero}/'
+    url = URL_CAPITULO.format(numero=numero)
     
     print(f"\n{'='*60}")
     print(f" EXTRAINDO CAPÍTULO {numero}")
@@ -41,21 +46,32 @@ def extrair_capitulo_unico(numero: int):
         return False
 
 
-def extrair_range_capitulos(inicio: int, fim: int, delay: int = 3):
+def extrair_range_capitulos(inicio: int, fim: int, delay: float = 1.0, trabalhadores: int = 4,
+                            modelo_url: str = URL_CAPITULO):
     """
-    Extrai um intervalo de capítulos.
+    Extrai um intervalo de capítulos em paralelo.
+    
+    Capítulos já salvos são pulados e o progresso fica em
+    extracao_checkpoint.json, então uma execução interrompida continua
+    de onde parou.
     
     Args:
         inicio: Número do primeiro capítulo
         fim: Número do último capítulo (inclusivo)
-        delay: Segundos de espera entre requisições
+        delay: Intervalo médio mínimo (segundos) entre requisições ao site (0 = sem espera)
+        trabalhadores: Downloads simultâneos
+        modelo_url: URL dos capítulos com {numero} (permite apontar para um servidor local)
     """
-    extrator = ExtratorCentralNovel()
     caminho_novel = './novels/martial_world'
+    requisicoes_por_segundo = 1 / delay if delay > 0 else None
     
     print(f"\n{'='*60}")
     print(f" EXTRAINDO MARTIAL WORLD")
     print(f" Capítulos {inicio} a {fim}")
+    if requisicoes_por_segundo:
+        print(f" {trabalhadores} downloads simultâneos, até {requisicoes_por_segundo:.2f} req/s")
+    else:
+        print(f" {trabalhadores} downloads simultâneos, sem limite de taxa")
     print(f"{'='*60}\n")
     
     # Criar metadata se não existir
@@ -68,47 +84,89 @@ def extrair_range_capitulos(inicio: int, fim: int, delay: int = 3):
             'url_original': 'https://centralnovel.com/series/martial-world-20230928/',
             'idioma': 'pt-BR',
             'generos': ['Ação', 'Aventura', 'Fantasia', 'Artes Marciais'],
-            'status': 'Em extração'
+            'status': 'Em extração',
+            'aparicoes_sqlite': True  # Milhares de capítulos: aparições em SQLite
         }
-        extrator.salvar_metadata(metadata, caminho_novel)
+        ExtratorCentralNovel().salvar_metadata(metadata, caminho_novel)
     
-    sucessos = 0
-    falhas = 0
+    motor = ExtracaoParalela(
+        ExtratorCentralNovel,
+        caminho_novel,
+        modelo_url,
+        trabalhadores=trabalhadores,
+        requisicoes_por_segundo=requisicoes_por_segundo
+    )
     
-    for numero in range(inicio, fim + 1):
-        url = f'https://centralnovel.com/martial-world-capitulo-{numero}/'
-        
-        print(f"\n[{numero - inicio + 1}/{fim - inicio + 1}] Capítulo {numero}...")
-        
-        try:
-            capitulo = extrator.extrair_capitulo(url)
-            
-            if capitulo and capitulo['conteudo']:
-                extrator.salvar_capitulo(capitulo, caminho_novel)
-                sucessos += 1
-                print(f"   ✓ Extraído ({len(capitulo['conteudo'])} parágrafos)")
-            else:
-                falhas += 1
-                print(f"   ✗ Sem conteúdo")
-        
-        except Exception as e:
-            falhas += 1
-            print(f"   ✗ Erro: {e}")
-        
-        # Aguarda antes da próxima requisição
-        if numero < fim:
-            print(f"   Aguardando {delay}s...")
-            time.sleep(delay)
+    total = fim - inicio + 1
+    feitos = [0]
+    
+    def ao_concluir(numero, capitulo, erro):
+        feitos[0] += 1
+        if erro:
+            print(f"[{feitos[0]}] ✗ Capítulo {numero}: {erro}")
+        else:
+            print(f"[{feitos[0]}] ✓ Capítulo {numero} ({len(capitulo['conteudo'])} parágrafos)")
+    
+    inicio_execucao = time.time()
+    try:
+        resumo = motor.executar(range(inicio, fim + 1), ao_concluir)
+    except KeyboardInterrupt:
+        print("\n\n⏸️ Extração interrompida. Execute novamente para continuar.")
+        return
     
     print(f"\n{'='*60}")
     print(f" EXTRAÇÃO CONCLUÍDA")
     print(f"{'='*60}")
-    print(f"\n✅ Sucessos: {sucessos}")
-    print(f"❌ Falhas: {falhas}")
+    print(f"\n✅ Sucessos: {len(resumo['sucessos'])}")
+    print(f"⏭️  Já salvos: {len(resumo['pulados'])}")
+    print(f"❌ Falhas: {len(resumo['falhas'])}")
+    if resumo['falhas']:
+        print(f"   {sorted(resumo['falhas'])}")
+    print(f"⏱️ Tempo: {time.time() - inicio_execucao:.0f}s para {total} capítulos")
     print(f"📂 Salvos em: {caminho_novel}/capitulos/")
     print(f"{'='*60}\n")
 
 
+def reprocessar_capitulos(inicio: int, fim: int):
+    """
+    Reextrai capítulos a partir do HTML guardado no cache, sem acessar a rede.
+    
+    Útil depois de corrigir os seletores do extrator: só CPU, nenhuma requisição.
+    
+    Args:
+        inicio: Número do primeiro capítulo
+        fim: Número do último capítulo (inclusivo)
+    """
+    extrator = ExtratorCentralNovel(offline=True)
+    caminho_novel = './novels/martial_world'
+    
+    print(f"\n{'='*60}")
+    print(f" REPROCESSANDO CAPÍTULOS {inicio} a {fim} (offline)")
+    print(f"{'='*60}\n")
+    
+    sucessos = 0
+    sem_cache = []
+    inicio_execucao = time.time()
+    
+    for numero in range(inicio, fim + 1):
+        url = URL_CAPITULO.format(numero=numero)
+        try:
+            html = extrator.baixar_html(url)
+        except PaginaNaoEmCache:
+            sem_cache.append(numero)
+            continue
+        
+        capitulo = extrator.processar_html(html, url)
+        if capitulo and capitulo['conteudo']:
+            capitulo['numero'] = numero
+            extrator.salvar_capitulo(capitulo, caminho_novel)
+            sucessos += 1
+    
+    print(f"\n✅ Reprocessados: {sucessos} em {time.time() - inicio_execucao:.1f}s")
+    if sem_cache:
+        print(f"⚠️ Sem HTML no cache ({len(sem_cache)}): extraia-os primeiro")
+
+
 def menu_interativo():
     """Menu interativo para extração."""
     while True:
@@ -118,7 +176,8 @@ def menu_interativo():
         print("\n1. Extrair capítulo único")
         print("2. Extrair intervalo de capítulos")
         print("3. Extrair capítulo de teste (961)")
-        print("4. Sair")
+        print("4. Reprocessar intervalo a partir do cache (sem rede)")
+        print("5. Sair")
         print("\n" + "-"*60)
         
         escolha = input("\nEscolha uma opção: ").strip()
@@ -134,11 +193,12 @@ def menu_interativo():
             try:
                 inicio = int(input("Capítulo inicial: ").strip())
                 fim = int(input("Capítulo final: ").strip())
-                delay = int(input("Delay entre requisições (segundos, recomendado 3): ").strip() or "3")
+                delay = float(input("Intervalo entre requisições (segundos, recomendado 1): ").strip() or "1")
+                trabalhadores = int(input("Downloads simultâneos (recomendado 4): ").strip() or "4")
                 
                 confirmar = input(f"\nExtrair capítulos {inicio} a {fim}? (s/n): ").strip().lower()
                 if confirmar == 's':
-                    extrair_range_capitulos(inicio, fim, delay)
+                    extrair_range_capitulos(inicio, fim, delay, trabalhadores)
             except ValueError:
                 print("❌ Entrada inválida.")
         
@@ -146,6 +206,14 @@ def menu_interativo():
             extrair_capitulo_unico(961)
         
         elif escolha == '4':
+            try:
+                inicio = int(input("Capítulo inicial: ").strip())
+                fim = int(input("Capítulo final: ").strip())
+                reprocessar_capitulos(inicio, fim)
+            except ValueError:
+                print("❌ Entrada inválida.")
+        
+        elif escolha == '5':
             print("\n👋 Até logo!")
             break
         
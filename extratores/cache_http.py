@@ -0,0 +1,158 @@
+"""
+Cache HTTP dos Extratores
+Guarda o HTML bruto (comprimido) de cada página com ETag/Last-Modified
+para requisições condicionais e reprocessamento sem rede
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Iterator, Optional, Tuple
+
+import requests
+
+
+def _diretorio_padrao() -> str:
+    """Retorna a pasta padrão do cache (cache/html na raiz do projeto)."""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(raiz, 'cache', 'html')
+
+
+class PaginaNaoEmCache(LookupError):
+    """A página pedida em modo offline não está no cache."""
+
+
+class CacheHTTP:
+    """
+    Cache de respostas HTTP por URL.
+
+    Para cada URL são gravados <digest>.html.gz (bytes da resposta, como
+    vieram do servidor) e <digest>.json (URL, ETag, Last-Modified, encoding
+    e data). Com cache presente, a próxima busca envia If-None-Match e
+    If-Modified-Since; um 304 reaproveita o HTML local. Em modo offline
+    nenhuma requisição é feita.
+    """
+
+    def __init__(self, diretorio: Optional[str] = None):
+        """
+        Args:
+            diretorio: Pasta do cache (padrão: cache/html na raiz do projeto)
+        """
+        self.diretorio = diretorio or _diretorio_padrao()
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    @staticmethod
+    def _chave(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _caminhos(self, url: str) -> Tuple[str, str]:
+        chave = self._chave(url)
+        return (os.path.join(self.diretorio, chave + '.html.gz'),
+                os.path.join(self.diretorio, chave + '.json'))
+
+    def _gravar_atomico(self, caminho: str, dados: bytes):
+        temp = f'{caminho}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp, 'wb') as f:
+            f.write(dados)
+        os.replace(temp, caminho)
+
+    def ler_metadados(self, url: str) -> Optional[dict]:
+        """Retorna os metadados guardados de uma URL (ou None)."""
+        caminho_html, caminho_meta = self._caminhos(url)
+        if not os.path.exists(caminho_meta) or not os.path.exists(caminho_html):
+            return None
+        try:
+            with open(caminho_meta, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def ler(self, url: str) -> Optional[str]:
+        """
+        Lê o HTML guardado de uma URL.
+
+        Returns:
+            HTML decodificado ou None se não estiver no cache
+        """
+        meta = self.ler_metadados(url)
+        if meta is None:
+            return None
+        caminho_html, _ = self._caminhos(url)
+        try:
+            with open(caminho_html, 'rb') as f:
+                bruto = gzip.decompress(f.read())
+        except (OSError, EOFError):
+            return None
+        return bruto.decode(meta.get('encoding') or 'utf-8', errors='replace')
+
+    def gravar(self, url: str, resposta: requests.Response):
+        """Guarda o corpo e os validadores de uma resposta 200."""
+        caminho_html, caminho_meta = self._caminhos(url)
+        meta = {
+            'url': url,
+            'etag': resposta.headers.get('ETag'),
+            'last_modified': resposta.headers.get('Last-Modified'),
+            'encoding': resposta.encoding,
+            'data': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        # HTML antes dos metadados: metadados existentes sempre têm HTML completo
+        self._gravar_atomico(caminho_html, gzip.compress(resposta.content, 6))
+        self._gravar_atomico(caminho_meta, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+    def obter_html(self, session: requests.Session, url: str, timeout: int = 30,
+                   offline: bool = False) -> str:
+        """
+        Busca uma página usando o cache.
+
+        Args:
+            session: Sessão HTTP do extrator
+            url: URL da página
+            timeout: Timeout da requisição em segundos
+            offline: Não acessar a rede (só o cache)
+
+        Returns:
+            HTML da página
+
+        Raises:
+            PaginaNaoEmCache: Em modo offline, se a página não estiver no cache
+            requests.RequestException: Erro de rede ou status HTTP de erro
+        """
+        if offline:
+            html = self.ler(url)
+            if html is None:
+                raise PaginaNaoEmCache(f"Página não está no cache: {url}")
+            return html
+
+        meta = self.ler_metadados(url)
+        cabecalhos = {}
+        if meta:
+            if meta.get('etag'):
+                cabecalhos['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                cabecalhos['If-Modified-Since'] = meta['last_modified']
+
+        resposta = session.get(url, timeout=timeout, headers=cabecalhos)
+
+        if resposta.status_code == 304 and meta:
+            html = self.ler(url)
+            if html is not None:
+                return html
+            # Cache corrompido: buscar de novo sem validadores
+            resposta = session.get(url, timeout=timeout)
+
+        resposta.raise_for_status()
+        self.gravar(url, resposta)
+        return resposta.text
+
+    def urls(self) -> Iterator[str]:
+        """Percorre as URLs guardadas no cache."""
+        for entrada in os.scandir(self.diretorio):
+            if entrada.name.endswith('.json'):
+                try:
+                    with open(entrada.path, 'r', encoding='utf-8') as f:
+                        yield json.load(f)['url']
+                except (OSError, ValueError, KeyError):
+                    continue
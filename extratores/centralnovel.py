@@ -11,12 +11,38 @@ import re
 import time
 from typing import Dict, List, Optional
 
+try:
+    from .cache_http import CacheHTTP
+    from .parser_html import PARSER_PADRAO, criar_soup, xpath_classe
+except ImportError:  # Executado como script
+    from cache_http import CacheHTTP
+    from parser_html import PARSER_PADRAO, criar_soup, xpath_classe
+
 
 class ExtratorCentralNovel:
-    def __init__(self):
-        """Inicializa o extrator para Central Novel."""
+    # Regiões da página usadas por _extrair_titulo e _extrair_conteudo
+    REGIOES_CAPITULO = (
+        '(//h1)[1]',
+        '(//article)[1]',
+        xpath_classe('div', 'entry-content'),
+        xpath_classe('div', 'post-content'),
+    )
+    
+    def __init__(self, cache: Optional[CacheHTTP] = None, offline: bool = False,
+                 parser: str = PARSER_PADRAO):
+        """
+        Inicializa o extrator para Central Novel.
+        
+        Args:
+            cache: Cache HTTP (padrão: cache/html na raiz do projeto)
+            offline: Usar só o HTML já guardado, sem acessar a rede
+            parser: Backend do BeautifulSoup ('lxml' ou 'html.parser')
+        """
         self.url_base = 'https://centralnovel.com'
         self.nome_site = 'centralnovel'
+        self.cache = cache if cache else CacheHTTP()
+        self.offline = offline
+        self.parser = parser
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
@@ -35,13 +61,41 @@ class ExtratorCentralNovel:
         print(f"Extraindo: {url_capitulo}")
         
         try:
-            response = self.session.get(url_capitulo, timeout=30)
-            response.raise_for_status()
+            html = self.baixar_html(url_capitulo)
         except Exception as e:
             print(f"Erro ao acessar URL: {e}")
             return None
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        return self.processar_html(html, url_capitulo)
+    
+    def baixar_html(self, url: str) -> str:
+        """
+        Baixa o HTML de uma página.
+        
+        Args:
+            url: URL da página
+            
+        Returns:
+            HTML como texto
+            
+        Raises:
+            requests.RequestException: Erro de rede ou status HTTP de erro
+            PaginaNaoEmCache: Em modo offline, se a página não foi baixada antes
+        """
+        return self.cache.obter_html(self.session, url, timeout=30, offline=self.offline)
+    
+    def processar_html(self, html: str, url_capitulo: str) -> Dict:
+        """
+        Extrai os dados de um capítulo a partir do HTML já baixado.
+        
+        Args:
+            html: HTML da página do capítulo
+            url_capitulo: URL de origem (usada para o número do capítulo)
+            
+        Returns:
+            Dicionário com dados do capítulo
+        """
+        soup = criar_soup(html, self.REGIOES_CAPITULO, self.parser)
         
         # Extrair informações
         titulo = self._extrair_titulo(soup)
@@ -118,7 +172,7 @@ class ExtratorCentralNovel:
         response = self.session.get(url_novel, timeout=30)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = criar_soup(response.text, parser=self.parser)
         
         titulo = soup.find('h1')
         titulo_texto = titulo.text.strip() if titulo else 'Desconhecido'
@@ -145,7 +199,7 @@ class ExtratorCentralNovel:
         response = self.session.get(url_novel, timeout=30)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = criar_soup(response.text, parser=self.parser)
         
         capitulos = []
         
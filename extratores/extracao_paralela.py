@@ -0,0 +1,303 @@
+"""
+Extração Paralela de Capítulos
+Baixa vários capítulos ao mesmo tempo com limite de taxa por host,
+novas tentativas com backoff e checkpoint para retomar
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+import requests
+
+
+class LimitadorTaxa:
+    """
+    Token bucket: no máximo `taxa` requisições por segundo em média, com
+    rajadas de até `capacidade` requisições.
+    """
+
+    def __init__(self, taxa: Optional[float], capacidade: int = 1):
+        """
+        Args:
+            taxa: Fichas repostas por segundo (None = sem limite)
+            capacidade: Máximo de fichas acumuladas (tamanho da rajada)
+        """
+        self.taxa = taxa
+        self.capacidade = max(1, capacidade)
+        self.fichas = float(self.capacidade)
+        self.ultimo = time.monotonic()
+        self.lock = threading.Lock()
+
+    def adquirir(self):
+        """Bloqueia até haver uma ficha disponível e a consome."""
+        if self.taxa is None:
+            return
+        while True:
+            with self.lock:
+                agora = time.monotonic()
+                self.fichas = min(self.capacidade, self.fichas + (agora - self.ultimo) * self.taxa)
+                self.ultimo = agora
+                if self.fichas >= 1:
+                    self.fichas -= 1
+                    return
+                espera = (1 - self.fichas) / self.taxa
+            time.sleep(espera)
+
+    def penalizar(self, segundos: float):
+        """Esvazia o balde por um tempo (ex: após HTTP 429 com Retry-After)."""
+        if self.taxa is None:
+            return  # Sem limite: a espera do backoff já respeita o Retry-After
+        with self.lock:
+            self.fichas = min(self.fichas, 0) - segundos * self.taxa
+
+
+class LimitadoresPorHost:
+    """Um LimitadorTaxa por host, criado sob demanda."""
+
+    def __init__(self, taxa: Optional[float], capacidade: int = 1):
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self.limitadores = {}
+        self.lock = threading.Lock()
+
+    def obter(self, url: str) -> LimitadorTaxa:
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.limitadores:
+                self.limitadores[host] = LimitadorTaxa(self.taxa, self.capacidade)
+            return self.limitadores[host]
+
+
+class ErroDefinitivo(Exception):
+    """Falha que não adianta repetir (ex: HTTP 404)."""
+
+
+class ExtracaoParalela:
+    """
+    Motor de extração concorrente em volta de um extrator de site.
+
+    Cada thread usa o seu próprio extrator (requests.Session não é
+    thread-safe). Todas as requisições passam pelo limitador do host.
+    O checkpoint (extracao_checkpoint.json na pasta da novel) guarda os
+    capítulos concluídos e as falhas; capítulos já salvos são pulados.
+    """
+
+    ARQUIVO_CHECKPOINT = 'extracao_checkpoint.json'
+
+    # Status HTTP que valem nova tentativa
+    STATUS_TRANSITORIOS = {408, 425, 429, 500, 502, 503, 504}
+
+    def __init__(self, fabrica_extrator: Callable, caminho_novel: str, modelo_url: str,
+                 trabalhadores: int = 4, requisicoes_por_segundo: Optional[float] = 1.0,
+                 rajada: int = 2, tentativas: int = 4, backoff_base: float = 2.0):
+        """
+        Args:
+            fabrica_extrator: Função sem argumentos que cria um extrator
+                              (com baixar_html, processar_html e salvar_capitulo)
+            caminho_novel: Pasta da novel
+            modelo_url: URL com {numero} (ex: 'https://site/novel-capitulo-{numero}/')
+            trabalhadores: Threads de download
+            requisicoes_por_segundo: Taxa média máxima por host (None = sem limite)
+            rajada: Requisições permitidas de uma vez por host
+            tentativas: Tentativas por capítulo
+            backoff_base: Espera base (segundos) entre tentativas, dobrada a cada falha
+        """
+        self.fabrica_extrator = fabrica_extrator
+        self.caminho_novel = caminho_novel
+        self.modelo_url = modelo_url
+        self.trabalhadores = max(1, trabalhadores)
+        self.tentativas = max(1, tentativas)
+        self.backoff_base = backoff_base
+        self.limitadores = LimitadoresPorHost(requisicoes_por_segundo, rajada)
+
+        self.pasta_capitulos = os.path.join(caminho_novel, 'capitulos')
+        self.caminho_checkpoint = os.path.join(caminho_novel, self.ARQUIVO_CHECKPOINT)
+        self.lock_checkpoint = threading.Lock()
+        self._local = threading.local()
+        self.parar = threading.Event()
+
+        self.checkpoint = self._carregar_checkpoint()
+
+    def _carregar_checkpoint(self) -> Dict:
+        if os.path.exists(self.caminho_checkpoint):
+            try:
+                with open(self.caminho_checkpoint, 'r', encoding='utf-8') as f:
+                    dados = json.load(f)
+                return {
+                    'concluidos': set(dados.get('concluidos', [])),
+                    'falhas': {int(n): erro for n, erro in dados.get('falhas', {}).items()}
+                }
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Checkpoint ignorado: {e}")
+        return {'concluidos': set(), 'falhas': {}}
+
+    def _salvar_checkpoint(self):
+        """Grava o checkpoint (chamar com lock_checkpoint)."""
+        os.makedirs(self.caminho_novel, exist_ok=True)
+        dados = {
+            'modelo_url': self.modelo_url,
+            'concluidos': sorted(self.checkpoint['concluidos']),
+            'falhas': {str(n): erro for n, erro in sorted(self.checkpoint['falhas'].items())},
+            'atualizado': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        temp = self.caminho_checkpoint + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False, indent=2)
+        os.replace(temp, self.caminho_checkpoint)
+
+    def _registrar(self, numero: int, erro: Optional[str] = None):
+        with self.lock_checkpoint:
+            if erro is None:
+                self.checkpoint['concluidos'].add(numero)
+                self.checkpoint['falhas'].pop(numero, None)
+            else:
+                self.checkpoint['falhas'][numero] = erro
+            self._salvar_checkpoint()
+
+    def _extrator(self):
+        """Extrator exclusivo da thread atual."""
+        extrator = getattr(self._local, 'extrator', None)
+        if extrator is None:
+            extrator = self.fabrica_extrator()
+            self._local.extrator = extrator
+        return extrator
+
+    def capitulo_salvo(self, numero: int) -> bool:
+        """
+        Indica se o capítulo já está salvo em disco e legível.
+
+        O checkpoint sozinho não basta: se o arquivo sumiu ou a gravação
+        falhou depois do registro, o capítulo volta a ser baixado.
+        """
+        encontrado = False
+        for nome in (f'cap_{numero:04d}.json', f'cap_{numero:03d}.json'):
+            caminho = os.path.join(self.pasta_capitulos, nome)
+            if not os.path.exists(caminho):
+                continue
+            encontrado = True
+            try:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    if json.load(f).get('conteudo'):
+                        return True
+            except (OSError, ValueError) as e:
+                print(f"⚠️ {nome} ilegível, baixando de novo: {e}")
+
+        if numero in self.checkpoint['concluidos']:
+            if not encontrado:
+                print(f"⚠️ Capítulo {numero} no checkpoint mas sem arquivo, baixando de novo")
+            with self.lock_checkpoint:
+                self.checkpoint['concluidos'].discard(numero)
+        return False
+
+    def _espera_backoff(self, tentativa: int, erro: Exception) -> float:
+        """Tempo de espera antes da próxima tentativa (respeita Retry-After)."""
+        resposta = getattr(erro, 'response', None)
+        if resposta is not None:
+            retry_after = resposta.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+        # Backoff exponencial com jitter para as threads não sincronizarem
+        return self.backoff_base * (2 ** (tentativa - 1)) * random.uniform(0.5, 1.5)
+
+    def _baixar_com_tentativas(self, url: str) -> str:
+        limitador = self.limitadores.obter(url)
+        extrator = self._extrator()
+
+        for tentativa in range(1, self.tentativas + 1):
+            if self.parar.is_set():
+                raise ErroDefinitivo("Extração cancelada")
+
+            limitador.adquirir()
+            try:
+                return extrator.baixar_html(url)
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status not in self.STATUS_TRANSITORIOS:
+                    raise ErroDefinitivo(f"HTTP {status}") from e
+                erro = e
+            except requests.RequestException as e:
+                erro = e
+
+            if tentativa == self.tentativas:
+                raise erro
+
+            espera = self._espera_backoff(tentativa, erro)
+            if getattr(erro, 'response', None) is not None and erro.response.status_code == 429:
+                limitador.penalizar(espera)  # O host pediu para desacelerar: vale para todas as threads
+            print(f"   ↻ {url} ({erro}); nova tentativa em {espera:.1f}s")
+            self.parar.wait(espera)
+
+    def extrair_um(self, numero: int) -> Optional[Dict]:
+        """
+        Baixa, processa e salva um capítulo.
+
+        Returns:
+            Dados do capítulo ou None se não teve conteúdo
+        """
+        url = self.modelo_url.format(numero=numero)
+        html = self._baixar_com_tentativas(url)
+
+        extrator = self._extrator()
+        capitulo = extrator.processar_html(html, url)
+        if not capitulo or not capitulo.get('conteudo'):
+            return None
+
+        capitulo['numero'] = numero
+        extrator.salvar_capitulo(capitulo, self.caminho_novel)
+        return capitulo
+
+    def executar(self, numeros: Iterable[int], ao_concluir: Callable = None) -> Dict:
+        """
+        Extrai os capítulos em paralelo.
+
+        Args:
+            numeros: Capítulos a extrair
+            ao_concluir: Função opcional chamada com (numero, capitulo ou None, erro ou None)
+
+        Returns:
+            Resumo com listas 'sucessos', 'falhas' e 'pulados'
+        """
+        pendentes = []
+        pulados = []
+        for numero in numeros:
+            (pulados if self.capitulo_salvo(numero) else pendentes).append(numero)
+
+        resumo = {'sucessos': [], 'falhas': [], 'pulados': pulados}
+        if not pendentes:
+            return resumo
+
+        self.parar.clear()
+        executor = ThreadPoolExecutor(max_workers=self.trabalhadores,
+                                      thread_name_prefix='Extracao')
+        futuros = {}
+        try:
+            futuros = {executor.submit(self.extrair_um, numero): numero for numero in pendentes}
+            for futuro in as_completed(futuros):
+                numero = futuros[futuro]
+                try:
+                    capitulo = futuro.result()
+                    erro = None if capitulo else 'Sem conteúdo'
+                except Exception as e:
+                    capitulo = None
+                    erro = str(e) or e.__class__.__name__
+
+                self._registrar(numero, erro)
+                (resumo['falhas'] if erro else resumo['sucessos']).append(numero)
+                if ao_concluir:
+                    ao_concluir(numero, capitulo, erro)
+        except KeyboardInterrupt:
+            # Checkpoint já tem tudo que terminou; o resto fica para a próxima execução
+            self.parar.set()
+            for futuro in futuros:
+                futuro.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=True)
+
+        return resumo
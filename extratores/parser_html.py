@@ -0,0 +1,72 @@
+"""
+Camada de Parsing HTML dos Extratores
+Escolhe o backend (lxml ou html.parser) e monta a árvore BeautifulSoup
+só das regiões que interessam (título e área de conteúdo)
+"""
+
+from typing import Optional, Sequence
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_DISPONIVEL = True
+except ImportError:
+    LXML_DISPONIVEL = False
+
+
+PARSER_PADRAO = 'lxml' if LXML_DISPONIVEL else 'html.parser'
+
+
+def xpath_classe(tag: str, classe: str) -> str:
+    """XPath do primeiro <tag> com a classe CSS (mesma regra do class_= do BeautifulSoup)."""
+    return f"(//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {classe} ')])[1]"
+
+
+def criar_soup(html: str, regioes: Optional[Sequence[str]] = None,
+               parser: Optional[str] = None) -> BeautifulSoup:
+    """
+    Cria o BeautifulSoup de uma página.
+
+    Com lxml disponível e regiões informadas, a página inteira é analisada
+    em C pelo lxml e só as regiões encontradas viram objetos BeautifulSoup.
+    O resultado tem as mesmas tags (na ordem das regiões), então find() e
+    find_all() dos extratores continuam funcionando. Uma região dentro de
+    outra também selecionada (ex: .entry-content dentro de article) não é
+    repetida: só as mais externas entram.
+
+    Args:
+        html: HTML da página
+        regioes: Expressões XPath das regiões a manter (cada uma usa o primeiro resultado)
+        parser: 'lxml' ou 'html.parser' (padrão: lxml se instalado)
+
+    Returns:
+        BeautifulSoup da página ou só das regiões
+    """
+    parser = parser or PARSER_PADRAO
+
+    if regioes and parser == 'lxml' and LXML_DISPONIVEL:
+        try:
+            documento = lxml.html.document_fromstring(html)
+        except ValueError:
+            # Texto com declaração de encoding: o lxml exige bytes
+            documento = lxml.html.document_fromstring(html.encode('utf-8'))
+        except etree.ParserError:
+            return BeautifulSoup(html, parser)
+
+        elementos = []
+        for expressao in regioes:
+            encontrados = documento.xpath(expressao)
+            if encontrados and encontrados[0] not in elementos:
+                elementos.append(encontrados[0])
+
+        selecionados = set(elementos)
+        partes = [
+            etree.tostring(elemento, encoding='unicode', method='html', with_tail=False)
+            for elemento in elementos
+            if not any(ancestral in selecionados for ancestral in elemento.iterancestors())
+        ]
+        return BeautifulSoup(''.join(partes), parser)
+
+    return BeautifulSoup(html, parser)
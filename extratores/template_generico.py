@@ -9,18 +9,38 @@ import json
 import os
 from typing import Dict, List, Optional
 
+try:
+    from .cache_http import CacheHTTP
+    from .parser_html import PARSER_PADRAO, criar_soup, xpath_classe
+except ImportError:  # Executado como script
+    from cache_http import CacheHTTP
+    from parser_html import PARSER_PADRAO, criar_soup, xpath_classe
+
 
 class ExtratorGenerico:
-    def __init__(self, url_base: str, nome_site: str):
+    # TODO: Ajustar às regiões usadas pelos seletores do site específico
+    REGIOES_CAPITULO = (
+        '(//h1)[1]',
+        xpath_classe('div', 'conteudo'),
+    )
+    
+    def __init__(self, url_base: str, nome_site: str, cache: Optional[CacheHTTP] = None,
+                 offline: bool = False, parser: str = PARSER_PADRAO):
         """
         Inicializa o extrator.
         
         Args:
             url_base: URL base do site
             nome_site: Nome identificador do site
+            cache: Cache HTTP (padrão: cache/html na raiz do projeto)
+            offline: Usar só o HTML já guardado, sem acessar a rede
+            parser: Backend do BeautifulSoup ('lxml' ou 'html.parser')
         """
         self.url_base = url_base
         self.nome_site = nome_site
+        self.cache = cache if cache else CacheHTTP()
+        self.offline = offline
+        self.parser = parser
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -36,10 +56,21 @@ class ExtratorGenerico:
         Returns:
             Dicionário com dados do capítulo
         """
-        response = self.session.get(url_capitulo, timeout=30)
-        response.raise_for_status()
+        html = self.cache.obter_html(self.session, url_capitulo, timeout=30, offline=self.offline)
+        return self.processar_html(html, url_capitulo)
+    
+    def processar_html(self, html: str, url_capitulo: str) -> Dict:
+        """
+        Extrai os dados de um capítulo a partir do HTML (baixado ou do cache).
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        Args:
+            html: HTML da página do capítulo
+            url_capitulo: URL de origem
+            
+        Returns:
+            Dicionário com dados do capítulo
+        """
+        soup = criar_soup(html, self.REGIOES_CAPITULO, self.parser)
         
         # TODO: Adaptar seletores CSS para o site específico
         titulo = self._extrair_titulo(soup)
@@ -94,7 +125,7 @@ class ExtratorGenerico:
         response = self.session.get(url_novel, timeout=30)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = criar_soup(response.text, parser=self.parser)
         
         # TODO: Adaptar para o site específico
         capitulos = []
@@ -21,6 +21,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from leitor import LeitorNovel
 from emocoes import ProcessadorEmocoes
 from narracao import EngineNarracao
+from modelo_fala import obter_modelo
 
 
 class ControladorNarracao:
@@ -34,13 +35,34 @@ class ControladorNarracao:
         self.total_paragrafos = 0
         self.capitulo_atual = 0
         self.lock = threading.Lock()
+        self.condicao = threading.Condition(self.lock)  # Acordada por pausa, pulo e parada
         self.audio_interrompido = False
+        self.reprodutor = None  # ControladorReproducao do engine em uso
+    
+    def conectar_reprodutor(self, reprodutor):
+        """Associa o reprodutor do engine para repassar pausa, pulo e parada."""
+        with self.lock:
+            if self.reprodutor is reprodutor:
+                return
+            self.reprodutor = reprodutor
+            if self.pausado:
+                reprodutor.pausar()
+    
+    def _notificar(self):
+        """Acorda quem espera por comandos (chamar com lock)."""
+        self.condicao.notify_all()
     
     def pausar_retomar(self):
         """Alterna entre pausado e reproduzindo."""
         with self.lock:
             self.pausado = not self.pausado
             self.audio_interrompido = False
+            if self.reprodutor:
+                if self.pausado:
+                    self.reprodutor.pausar()
+                else:
+                    self.reprodutor.retomar()
+            self._notificar()
     
     def mostrar_status(self):
         """Mostra status visual no terminal."""
@@ -61,6 +83,9 @@ class ControladorNarracao:
             if self.pular_paragrafo == 0:
                 self.pular_paragrafo = 1
                 self.audio_interrompido = True
+                if self.reprodutor:
+                    self.reprodutor.interromper()
+                self._notificar()
                 print(f"\n⏭️  Próximo parágrafo\n", flush=True)
     
     def paragrafo_anterior(self):
@@ -70,6 +95,9 @@ class ControladorNarracao:
             if self.pular_paragrafo == 0:
                 self.pular_paragrafo = -1
                 self.audio_interrompido = True
+                if self.reprodutor:
+                    self.reprodutor.interromper()
+                self._notificar()
                 if self.paragrafo_atual > 1:
                     print(f"\n⏮️  Parágrafo anterior\n", flush=True)
     
@@ -78,6 +106,9 @@ class ControladorNarracao:
         with self.lock:
             self.parar = True
             self.audio_interrompido = True
+            if self.reprodutor:
+                self.reprodutor.interromper()
+            self._notificar()
             print("\n⏹️  PARANDO...\n", flush=True)
     
     def deve_pausar(self):
@@ -88,6 +119,12 @@ class ControladorNarracao:
         with self.lock:
             return self.parar
     
+    def aguardar_retomada(self):
+        """Bloqueia enquanto pausado, até retomar, pular ou parar."""
+        with self.condicao:
+            while self.pausado and not self.parar and self.pular_paragrafo == 0:
+                self.condicao.wait()
+    
     def verificar_pulo(self):
         """Verifica e reseta comando de pulo."""
         with self.lock:
@@ -107,6 +144,36 @@ class ControladorNarracao:
             self.audio_interrompido = False
 
 
+def preparar_segmentos(processador: ProcessadorEmocoes, paragrafo: str, detectar_auto: bool = True):
+    """
+    Divide um parágrafo em segmentos prontos para o engine.
+    
+    Args:
+        processador: Processador de emoções
+        paragrafo: Texto do parágrafo
+        detectar_auto: Detecta emoção pelo contexto quando não há tags
+    
+    Returns:
+        Lista de {'texto', 'config'} (texto limpo e configuração da emoção)
+    """
+    segmentos = processador.extrair_segmentos(paragrafo)
+    
+    # Se não tem tags e detecção automática está ativa
+    if len(segmentos) == 1 and segmentos[0]['emocao'] == 'normal' and detectar_auto:
+        segmentos[0]['emocao'] = processador.detectar_emocao_contextual(paragrafo)
+    
+    preparados = []
+    for segmento in segmentos:
+        # Processar texto (remover tags, aplicar transformações)
+        texto_limpo = processador.processar_texto(segmento['texto'], segmento['emocao'])
+        if texto_limpo:
+            preparados.append({
+                'texto': texto_limpo,
+                'config': processador.obter_config_emocao(segmento['emocao'])
+            })
+    return preparados
+
+
 def narrar_capitulo(numero: int, detectar_auto: bool = True, voz: str = 'Francisca', controlador_externo=None):
     """
     Narra um capítulo com sistema de emoções customizado e controles interativos.
@@ -147,6 +214,8 @@ def narrar_capitulo(numero: int, detectar_auto: bool = True, voz: str = 'Francis
     
     print(f"📖 {capitulo['titulo']}")
     print(f"📄 {len(capitulo['conteudo'])} parágrafos")
+    segundos = sum(obter_modelo().estimar_duracao(p, engine.voz_atual, '+0%') for p in capitulo['conteudo'])
+    print(f"⏳ ~{segundos / 60:.0f} min de áudio")
     print(f"✨ Detecção automática: {'Ativada' if detectar_auto else 'Desativada'}")
     print("\n" + "="*70)
     print("\n⌨️  CONTROLES:")
@@ -200,17 +269,8 @@ def narrar_capitulo(numero: int, detectar_auto: bool = True, voz: str = 'Francis
             # Atualizar posição
             controlador.paragrafo_atual = i + 1
             
-            # Aguardar se pausado
-            if controlador.deve_pausar():
-                import time
-                while controlador.deve_pausar():
-                    time.sleep(0.1)
-                    if controlador.deve_parar():
-                        break
-                    # Verificar pulo durante pausa
-                    pulo = controlador.verificar_pulo()
-                    if pulo != 0:
-                        break
+            # Aguardar se pausado (acorda ao retomar, pular ou parar)
+            controlador.aguardar_retomada()
             
             if controlador.deve_parar():
                 break
@@ -229,44 +289,21 @@ def narrar_capitulo(numero: int, detectar_auto: bool = True, voz: str = 'Francis
             paragrafo = capitulo['conteudo'][i]
             print(f"[{i+1}/{len(capitulo['conteudo'])}] {paragrafo[:65]}...")
             
-            # Detectar se é momento de clímax
-            is_climax = processador.detectar_climax(paragrafo)
-            
-            # Extrair segmentos com emoções
-            segmentos = processador.extrair_segmentos(paragrafo)
+            # Segmentos com emoções (todos sintetizados juntos e tocados sem lacuna)
+            segmentos = preparar_segmentos(processador, paragrafo, detectar_auto)
             
-            # Se não tem tags e detecção automática está ativa
-            if len(segmentos) == 1 and segmentos[0]['emocao'] == 'normal' and detectar_auto:
-                emocao_detectada = processador.detectar_emocao_contextual(paragrafo)
-                segmentos[0]['emocao'] = emocao_detectada
+            # Próximo parágrafo: sintetizado enquanto este toca
+            proximo = None
+            if i + 1 < len(capitulo['conteudo']):
+                proximo = preparar_segmentos(processador, capitulo['conteudo'][i + 1], detectar_auto)
             
-            # Narrar cada segmento
             paragrafo_interrompido = False
-            for segmento in segmentos:
-                # Processar texto (remover tags, aplicar transformações)
-                texto_limpo = processador.processar_texto(
-                    segmento['texto'],
-                    segmento['emocao']
-                )
-                
-                if not texto_limpo:
-                    continue
-                
-                # Obter configuração da emoção
-                config = processador.obter_config_emocao(segmento['emocao'])
-                
-                # Narrar
-                try:
-                    engine.narrar_segmento(texto_limpo, config, controlador=controlador)
-                    
-                    # Verificar se foi interrompido
-                    if controlador.foi_interrompido():
-                        paragrafo_interrompido = True
-                        break
-                        
-                except Exception as e:
-                    print(f"   ❌ Erro: {e}")
-                    continue
+            try:
+                concluido = engine.narrar_paragrafo(segmentos, controlador=controlador,
+                                                    proximo=proximo)
+                paragrafo_interrompido = not concluido or controlador.foi_interrompido()
+            except Exception as e:
+                print(f"   ❌ Erro: {e}")
             
             # Se não foi interrompido, avançar para próximo parágrafo
             if not paragrafo_interrompido and not controlador.deve_parar():
@@ -274,9 +311,7 @@ def narrar_capitulo(numero: int, detectar_auto: bool = True, voz: str = 'Francis
                 i += 1
                 controlador.limpar_interrupcao()
             else:
-                # Foi interrompido - aguardar pequeno delay para processar comando
-                import time
-                time.sleep(0.2)
+                # Foi interrompido - o comando é tratado no início do laço
                 print()
         
         print("\n" + "="*70)
@@ -473,6 +508,11 @@ def menu_principal():
             if caps:
                 print(f"\n📚 Capítulos disponíveis: {min(caps)} a {max(caps)}")
                 print(f"   Total: {len(caps)} capítulos")
+                palavras = leitor.manifesto.total_palavras()
+                print(f"   Palavras: {palavras:,}".replace(',', '.'))
+                segundos = obter_modelo().estimar_tempo_palavras(
+                    palavras, EngineNarracao.VOZES[voz_atual], '+0%')
+                print(f"   ⏳ Áudio estimado ({voz_atual}): {segundos / 3600:.0f} h")
             else:
                 print("\n❌ Nenhum capítulo disponível.")
         
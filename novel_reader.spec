@@ -12,6 +12,7 @@ a = Analysis(
         ('src', 'src'),
         ('extratores', 'extratores'),
         ('core', 'core'),
+        ('engines', 'engines'),
         ('config', 'config'),
     ],
     hiddenimports=[
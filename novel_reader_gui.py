@@ -8,15 +8,15 @@ import sys
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import threading
-import asyncio
 import pygame
-import edge_tts
 import tempfile
 import time
 import json
+import io
 import shutil
-from queue import Queue
-from collections import OrderedDict
+from queue import PriorityQueue, Queue, Empty
+from collections import OrderedDict, deque
+import itertools
 
 # Função para obter caminho base (funciona com PyInstaller)
 def obter_caminho_base():
@@ -29,7 +29,19 @@ def obter_caminho_base():
 # Adicionar paths
 base_path = obter_caminho_base()
 sys.path.insert(0, os.path.join(base_path, 'src'))
+sys.path.insert(0, os.path.join(base_path, 'engines'))
 from leitor import LeitorNovel
+from divisor_frases import dividir_frases
+from gerenciador_vozes import GerenciadorVozes
+from servico_sintese import ServicoSintese, obter_servico
+from streaming_mp3 import DecodificadorMP3Incremental, estimar_duracao
+from reproducao import ControladorReproducao
+from capitulos_renderizados import CapitulosRenderizados
+from dsp_audio import processar_som
+from cache_sons import CacheSons
+from modelo_fala import obter_modelo
+from controle_precarregamento import ControlePrecarregamento
+from concurrent.futures import CancelledError, Future, wait
 
 
 # ===== TEMA ESCURO MODERNO =====
@@ -220,49 +232,66 @@ class TemaEscuro:
 
 
 class MusicaFundo:
-    """Gerenciador de música de fundo."""
+    """
+    Gerenciador de música de fundo.
     
-    def __init__(self):
+    Na inicialização só indexa os arquivos (nome e duração lida do cabeçalho
+    MP3). A faixa escolhida toca em streaming pelo pygame.mixer.music; faixas
+    curtas são decodificadas e guardadas em um pequeno cache LRU para repetir
+    sem lacuna no canal de música.
+    """
+    
+    # Faixas até esta duração são decodificadas para a memória (loop sem lacuna)
+    DURACAO_MAX_DECODIFICAR = 60.0
+    
+    def __init__(self, max_decodificadas=2):
         pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=256)
         pygame.mixer.set_num_channels(8)
         self.canal_musica = pygame.mixer.Channel(0)
         self.canal_narrador = pygame.mixer.Channel(1)
         
-        # Dicionário para armazenar todas as músicas
-        self.musicas = {}  # {nome_arquivo: pygame.Sound}
+        # Índice das músicas disponíveis
+        self.musicas = {}  # {nome_arquivo: {'caminho': str, 'duracao': float}}
+        
+        # Cache LRU de faixas curtas já decodificadas
+        self.decodificadas = OrderedDict()  # {nome_arquivo: pygame.Sound}
+        self.max_decodificadas = max_decodificadas
         
         # Música selecionada atualmente
         self.musica_atual = None
         
-        self.som_atual = None
+        self.som_atual = None  # Sound em uso (None quando em streaming)
         self.modo_atual = None
         self.volume_musica = 0.3
         self.mutado = False
         
     def carregar_musicas(self):
-        """Carrega todas as músicas de fundo disponíveis."""
+        """Indexa as músicas de fundo disponíveis (sem decodificar o áudio)."""
         base_path = os.path.join(obter_caminho_base(), 'assets', 'audio', 'background')
         
         try:
             if os.path.exists(base_path):
                 arquivos = os.listdir(base_path)
                 
-                # Carregar TODOS os arquivos MP3
+                # Indexar TODOS os arquivos MP3
                 mp3_files = [f for f in arquivos if f.endswith('.mp3')]
                 
                 if mp3_files:
+                    musicas = {}
                     for bgm in mp3_files:
-                        try:
-                            path = os.path.join(base_path, bgm)
-                            self.musicas[bgm] = pygame.mixer.Sound(path)
-                            print(f"✓ Música carregada: {bgm}")
-                        except Exception as e:
-                            print(f"❌ Erro ao carregar {bgm}: {e}")
+                        path = os.path.join(base_path, bgm)
+                        musicas[bgm] = {'caminho': path, 'duracao': estimar_duracao(path)}
+                    self.musicas = musicas
+                    
+                    # Descartar decodificações de arquivos que sumiram
+                    for nome in list(self.decodificadas):
+                        if nome not in self.musicas:
+                            del self.decodificadas[nome]
                     
                     # Selecionar primeira como padrão
-                    if self.musicas:
+                    if self.musica_atual not in self.musicas:
                         self.musica_atual = list(self.musicas.keys())[0]
-                        print(f"🎵 {len(self.musicas)} músicas carregadas")
+                    print(f"🎵 {len(self.musicas)} músicas indexadas")
                 else:
                     print(f"⚠️ Nenhum arquivo MP3 encontrado em {base_path}")
             else:
@@ -274,6 +303,11 @@ class MusicaFundo:
         """Retorna lista de nomes das músicas para o combobox."""
         return list(self.musicas.keys())
     
+    def obter_duracao(self, nome_arquivo):
+        """Retorna a duração (segundos) de uma música indexada."""
+        info = self.musicas.get(nome_arquivo)
+        return info['duracao'] if info else 0.0
+    
     def selecionar_musica(self, nome_arquivo):
         """Seleciona uma música específica."""
         if nome_arquivo in self.musicas:
@@ -282,13 +316,47 @@ class MusicaFundo:
             return True
         return False
     
+    def _obter_decodificada(self, nome_arquivo):
+        """Retorna o Sound de uma faixa curta, decodificando na primeira vez."""
+        if self.max_decodificadas <= 0:
+            return None
+        
+        info = self.musicas[nome_arquivo]
+        if not 0 < info['duracao'] <= self.DURACAO_MAX_DECODIFICAR:
+            return None
+        
+        som = self.decodificadas.get(nome_arquivo)
+        if som is None:
+            som = pygame.mixer.Sound(info['caminho'])
+            self.decodificadas[nome_arquivo] = som
+            while len(self.decodificadas) > self.max_decodificadas:
+                self.decodificadas.popitem(last=False)
+        else:
+            self.decodificadas.move_to_end(nome_arquivo)
+        return som
+    
+    def _aplicar_volume(self):
+        volume = 0 if self.mutado else self.volume_musica
+        if self.som_atual:
+            self.som_atual.set_volume(volume)
+        else:
+            pygame.mixer.music.set_volume(volume)
+    
     def tocar_normal(self):
         """Toca música de fundo."""
         if self.musica_atual and self.musica_atual in self.musicas:
-            self.canal_musica.stop()
-            self.som_atual = self.musicas[self.musica_atual]
-            self.som_atual.set_volume(0 if self.mutado else self.volume_musica)
-            self.canal_musica.play(self.som_atual, loops=-1)
+            self.parar()
+            try:
+                self.som_atual = self._obter_decodificada(self.musica_atual)
+                if self.som_atual:
+                    self.canal_musica.play(self.som_atual, loops=-1)
+                else:
+                    pygame.mixer.music.load(self.musicas[self.musica_atual]['caminho'])
+                    pygame.mixer.music.play(loops=-1)
+                self._aplicar_volume()
+            except Exception as e:
+                print(f"❌ Erro ao tocar {self.musica_atual}: {e}")
+                return
             self.modo_atual = 'normal'
             print(f"▶️ Tocando: {self.musica_atual} (volume: {self.volume_musica:.2f})")
         else:
@@ -297,20 +365,20 @@ class MusicaFundo:
     def mutar(self, mutar=True):
         """Muta/desmuta música."""
         self.mutado = mutar
-        if self.som_atual:
-            self.som_atual.set_volume(0 if self.mutado else self.volume_musica)
+        self._aplicar_volume()
         print(f"🔇 Música {'mutada' if mutar else 'desmutada'}")
     
     def set_volume(self, volume):
         """Define volume da música (0.0 a 1.0)."""
         self.volume_musica = volume
-        if self.som_atual and not self.mutado:
-            self.som_atual.set_volume(volume)
+        if not self.mutado:
+            self._aplicar_volume()
         print(f"🎚️ Volume música: {int(volume * 100)}%")
     
     def parar(self):
         """Para a música."""
         self.canal_musica.stop()
+        pygame.mixer.music.stop()
         self.som_atual = None
 
 
@@ -325,21 +393,70 @@ class EngineNarracaoSimples:
         'Duarte': 'pt-PT-DuarteNeural'
     }
     
-    def __init__(self, voz='Francisca', canal=None):
+    # Parágrafos (ou falas) maiores que isso são sintetizados frase a frase
+    LIMIAR_FRASES = 240
+    
+    def __init__(self, voz='Francisca', canal=None, profundidade_precarregamento=3,
+                 orcamento_cache_mb=192):
         self.voz_atual = self.VOZES.get(voz, self.VOZES['Francisca'])
         self.temp_dir = tempfile.gettempdir()
         self.canal = canal if canal else pygame.mixer.Channel(1)
         self.volume = 1.0
         self.velocidade = 0
-        self.pausado = False
         self.som_atual = None
         
-        # Sistema de cache otimizado com OrderedDict para LRU
-        self.cache_sounds = OrderedDict()  # {hash_texto: pygame.Sound}
-        self.max_cache_size = 10  # Manter últimos 10 parágrafos em cache
+        # Andamento local: sintetiza sempre na taxa base e acelera/desacelera aqui
+        # (WSOLA), então mudar a velocidade não descarta nada nem vai à rede
+        self.andamento_local = False
+        
+        # Durações medidas das sínteses: tempo restante e profundidade da janela
+        self.modelo = obter_modelo()
+        
+        # Reprodução orientada a eventos (pausa/parada acordam a thread de narração)
+        self.reprodutor = ControladorReproducao(self.canal)
+        
+        # Serviço de síntese com loop asyncio único (cache em disco incluso)
+        self.servico = obter_servico()
+        self.futuro_atual = None
+        
+        # Capítulos pré-renderizados (renderizar_capitulos.py), por voz e taxa
+        self.caminho_novel = None
+        self.renderizados = {}  # {(voz, taxa): CapitulosRenderizados}
+        
+        # Streaming: começa a falar antes da síntese terminar (quando não há cache)
+        self.streaming = True
+        
+        # Parágrafos longos por frase: a primeira toca logo, as outras sintetizam em paralelo
+        self.dividir_frases = True
+        self.interrompido = False
+        self.falhou = False  # O último narrar() parou por erro (síntese/decodificação), não por parar()
+        
+        # Vozes por personagem: LeitorNovel que segmenta os parágrafos (None = voz única)
+        self.leitor_vozes = None
+        
+        # Ganho (dB) por voz aplicado ao áudio decodificado, antes de tocar
+        self.ganhos_voz = GerenciadorVozes(
+            os.path.join(obter_caminho_base(), 'config', 'vozes_config.json')
+        ).ganhos_voz_edge()
+        self.futuros_paragrafo = []  # Sínteses das partes do parágrafo tocando agora
+        
+        # Janela de pré-carregamento: quantos parágrafos à frente sintetizar
+        self.profundidade_precarregamento = max(1, int(profundidade_precarregamento))
         
-        # Sistema de pré-carregamento com thread dedicada
-        self.fila_precarregamento = Queue()
+        # Ajusta janela e concorrência para manter ~30s de áudio pronto à frente
+        self.controle = ControlePrecarregamento(profundidade_min=self.profundidade_precarregamento,
+                                                concorrencia=self.servico.max_concorrencia)
+        
+        # Sons decodificados por (voz, taxa, texto): várias vozes convivem até o orçamento
+        self.cache_sounds = CacheSons(orcamento_cache_mb)
+        
+        # Sínteses em andamento da janela atual {hash_texto: Future}
+        self.pendentes = {}
+        self.lock_pendentes = threading.Lock()
+        self.contador_fila = itertools.count()
+        
+        # Sistema de pré-carregamento com thread dedicada (decodifica os áudios prontos)
+        self.fila_precarregamento = PriorityQueue()
         self.thread_precarregamento = None
         self.precarregamento_ativo = False
         self._iniciar_thread_precarregamento()
@@ -354,56 +471,190 @@ class EngineNarracaoSimples:
         self.thread_precarregamento.start()
     
     def _worker_precarregamento(self):
-        """Worker thread que processa fila de pré-carregamento."""
+        """Worker thread que decodifica os áudios da janela assim que ficam prontos."""
         while self.precarregamento_ativo:
             try:
-                # Pegar próximo texto da fila (timeout de 1s)
-                texto = self.fila_precarregamento.get(timeout=1.0)
-                
-                if not texto or not texto.strip():
-                    continue
-                
-                texto_hash = f"{hash(texto)}_{self.velocidade}"
-                
-                # Se já está em cache, pular
-                if texto_hash in self.cache_sounds:
-                    continue
-                
-                # Gerar áudio
-                arquivo = asyncio.run(self._gerar_audio_async(texto))
-                som = pygame.mixer.Sound(arquivo)
-                
-                # Adicionar ao cache (LRU)
-                self.cache_sounds[texto_hash] = som
-                
-                # Limitar tamanho do cache
-                if len(self.cache_sounds) > self.max_cache_size:
-                    # Remover o mais antigo (primeiro item)
-                    self.cache_sounds.popitem(last=False)
-                
-                print(f"✓ Pré-carregado em background")
-                
+                # Próximo áudio pronto, o mais próximo do playhead primeiro
+                _, _, texto_hash, voz, futuro = self.fila_precarregamento.get(timeout=1.0)
+            except Empty:
+                continue  # Timeout é normal quando não há nada na fila
+            
+            with self.lock_pendentes:
+                if self.pendentes.get(texto_hash) is futuro:
+                    del self.pendentes[texto_hash]
+            
+            # Se foi cancelado ou já está em cache, pular
+            if futuro.cancelled() or texto_hash in self.cache_sounds:
+                continue
+            
+            try:
+                arquivo = futuro.result()
+                som = self._pos_processar(pygame.mixer.Sound(arquivo), voz)
             except Exception as e:
-                if not isinstance(e, TimeoutError):
-                    pass  # Timeout é normal quando não há nada na fila
-    
-    async def _gerar_audio_async(self, texto: str):
-        """Gera áudio usando Edge TTS."""
-        texto_hash = f"{hash(texto)}_{self.velocidade}"
-        rate = f"{self.velocidade:+d}%"
-        temp_file = os.path.join(self.temp_dir, f'tts_{texto_hash}.mp3')
-        
-        if not os.path.exists(temp_file):
-            communicate = edge_tts.Communicate(texto, self.voz_atual, rate=rate)
-            await communicate.save(temp_file)
-        
-        return temp_file
+                print(f"⚠️ Falha no pré-carregamento: {e}")
+                continue
+            
+            # Adicionar ao cache (LRU, descarta os mais antigos acima do orçamento)
+            self.cache_sounds[texto_hash] = som
+            self.controle.registrar_duracao(som.get_length() / self._fator_andamento())
+            
+            print(f"✓ Pré-carregado em background")
+    
+    def _pos_processar(self, som, voz=None):
+        """Aplica o ganho da voz ao som decodificado (sem custo se o ganho é 0)."""
+        ganho = self.ganhos_voz.get(voz or self.voz_atual, 0.0)
+        return processar_som(som, ganho_db=ganho, fade_entrada=None, fade_saida=None)
+    
+    def _chave_memoria(self, texto: str, voz=None):
+        """Chave do cache de sons decodificados: (voz, taxa, digest do texto)."""
+        return CacheSons.chave(texto, voz or self.voz_atual, self._taxa_sintese())
+    
+    def _taxa_sintese(self) -> str:
+        """Taxa pedida ao Edge TTS ('+0%' no andamento local)."""
+        return ServicoSintese.formatar_taxa(0 if self.andamento_local else self.velocidade)
+    
+    def _fator_andamento(self) -> float:
+        """Quanto o áudio em cache é acelerado ao tocar (1.0 fora do andamento local)."""
+        return 1.0 + self.velocidade / 100.0 if self.andamento_local else 1.0
+    
+    def _no_andamento(self, som):
+        """Aplica a velocidade ao som da taxa base quando o andamento é local."""
+        if not self.andamento_local or not self.velocidade:
+            return som
+        return processar_som(som, andamento=self._fator_andamento(),
+                             fade_entrada=None, fade_saida=None)
+    
+    def palavras_por_minuto(self) -> float:
+        """Ritmo da voz e velocidade atuais, pelo modelo de fala."""
+        ritmo = self.modelo.palavras_por_minuto(self.voz_atual, self._taxa_sintese())
+        if self.andamento_local:
+            ritmo *= 1.0 + self.velocidade / 100.0
+        return ritmo
+    
+    def profundidade_janela(self, caracteres: int) -> int:
+        """
+        Parágrafos a pré-carregar: a janela do controle adaptativo ou mais, se
+        o modelo de fala indicar que a síntese demora mais que o áudio cobre.
+        
+        Args:
+            caracteres: Tamanho médio dos próximos parágrafos
+        """
+        recomendada = self.modelo.profundidade_precarregamento(
+            self.voz_atual, self._taxa_sintese(), caracteres,
+            concorrencia=self.servico.max_concorrencia
+        )
+        return max(self.controle.profundidade, recomendada)
+    
+    def _solicitar_audio(self, texto: str, prioridade: int = 0, voz=None):
+        """Submete o texto ao serviço de síntese e retorna o Future."""
+        rate = self._taxa_sintese()
+        return self.servico.sintetizar(texto, voz or self.voz_atual, rate, prioridade=prioridade)
+    
+    def definir_multi_vozes(self, leitor):
+        """
+        Ativa as vozes por personagem.
+        
+        Args:
+            leitor: LeitorNovel usado para segmentar os parágrafos e achar a
+                    voz de cada personagem (None volta para a voz única)
+        """
+        if leitor is not self.leitor_vozes:
+            self.leitor_vozes = leitor
+            self.cancelar_precarregamento()
+            print(f"🎭 Vozes por personagem: {'ativadas' if leitor else 'desativadas'}")
+    
+    def _partes_paragrafo(self, texto: str, posicao=None):
+        """
+        Divide o parágrafo em partes de voz única.
+        
+        Segmentos seguidos com a mesma voz são juntados. Sem vozes por
+        personagem, ou quando tudo cai na voz do narrador, o parágrafo
+        inteiro é uma parte só (mesmo áudio e cache da voz única). Partes
+        longas são então divididas em frases.
+        
+        Returns:
+            Lista de (texto, voz do Edge TTS)
+        """
+        if self.leitor_vozes is None:
+            return self._em_frases([(texto, self.voz_atual)])
+        
+        numero, indice = (posicao[0], posicao[1] - 1) if posicao else (None, 0)
+        gerenciador = self.leitor_vozes.gerenciador_vozes
+        partes = []
+        for segmento in self.leitor_vozes.obter_segmentos_paragrafo(numero, indice, texto):
+            trecho = segmento['texto'].strip()
+            if not trecho:
+                continue
+            voz = gerenciador.obter_voz_edge(segmento.get('voz_config'), self.voz_atual)
+            if partes and partes[-1][1] == voz:
+                partes[-1] = (f"{partes[-1][0]} {trecho}", voz)
+            else:
+                partes.append((trecho, voz))
+        
+        if not partes or all(voz == self.voz_atual for _, voz in partes):
+            return self._em_frases([(texto, self.voz_atual)])
+        return self._em_frases(partes)
+    
+    def _em_frases(self, partes):
+        """Divide as partes maiores que LIMIAR_FRASES em frases (mesma voz)."""
+        if not self.dividir_frases:
+            return partes
+        frases = []
+        for texto, voz in partes:
+            if len(texto) > self.LIMIAR_FRASES:
+                frases.extend((frase, voz) for frase in dividir_frases(texto))
+            else:
+                frases.append((texto, voz))
+        return frases
+    
+    def definir_novel(self, caminho_novel):
+        """Informa a pasta da novel para usar capítulos pré-renderizados."""
+        if caminho_novel != self.caminho_novel:
+            self.caminho_novel = caminho_novel
+            self.renderizados = {}
+    
+    def _obter_renderizados(self):
+        """Pasta de renderizações da voz e velocidade atuais (ou None)."""
+        if not self.caminho_novel:
+            return None
+        rate = self._taxa_sintese()
+        chave = (self.voz_atual, rate)
+        if chave not in self.renderizados:
+            self.renderizados[chave] = CapitulosRenderizados(self.caminho_novel, self.voz_atual, rate)
+        return self.renderizados[chave]
+    
+    def capitulo_renderizado(self, numero):
+        """Indica se o capítulo já tem áudio pré-renderizado na voz/velocidade atuais."""
+        if self.leitor_vozes is not None:
+            return False  # Renderizações são em voz única
+        renderizados = self._obter_renderizados()
+        return bool(renderizados and renderizados.disponivel(numero))
+    
+    def _som_renderizado(self, texto, posicao):
+        """Decodifica o parágrafo de um capítulo pré-renderizado (sem TTS)."""
+        renderizados = self._obter_renderizados()
+        if not renderizados or self.leitor_vozes is not None:
+            return None
+        capitulo, paragrafo = posicao
+        dados = renderizados.ler_paragrafo(capitulo, paragrafo - 1, texto)
+        if not dados:
+            return None
+        try:
+            return self._pos_processar(pygame.mixer.Sound(file=io.BytesIO(dados)))
+        except pygame.error as e:
+            print(f"⚠️ Áudio renderizado inválido: {e}")
+            return None
     
     def set_velocidade(self, velocidade):
         """Define velocidade (-50 a +50)."""
         self.velocidade = int(velocidade)
         print(f"⚡ Velocidade narração: {self.velocidade:+d}%")
     
+    def set_andamento_local(self, ativo):
+        """Liga/desliga a mudança de velocidade local (sem nova síntese)."""
+        self.andamento_local = bool(ativo)
+        print(f"⏩ Andamento local: {'ligado' if self.andamento_local else 'desligado'}")
+    
     def set_volume(self, volume):
         """Define volume (0.0 a 1.0)."""
         self.volume = volume
@@ -411,65 +662,340 @@ class EngineNarracaoSimples:
             self.som_atual.set_volume(volume)
         print(f"🎙️ Volume narração: {int(volume * 100)}%")
     
+    @property
+    def pausado(self):
+        return self.reprodutor.pausado
+    
     def pausar(self):
-        """Pausa a narração."""
-        if self.canal.get_busy():
-            self.canal.pause()
-            self.pausado = True
+        """Pausa a narração (vale também para o próximo parágrafo se nada estiver tocando)."""
+        self.reprodutor.pausar()
     
     def despausar(self):
         """Continua a narração."""
-        if self.pausado:
-            self.canal.unpause()
-            self.pausado = False
+        self.reprodutor.retomar()
     
     def parar(self):
-        """Para a narração completamente."""
-        self.canal.stop()
-        self.pausado = False
-    
-    def solicitar_precarregamento(self, texto: str):
-        """Adiciona texto à fila de pré-carregamento."""
-        if texto and texto.strip():
-            # Limpar fila antiga e adicionar novo
-            while not self.fila_precarregamento.empty():
-                try:
-                    self.fila_precarregamento.get_nowait()
-                except:
-                    break
-            self.fila_precarregamento.put(texto)
-    
-    def narrar(self, texto: str, callback_pausado=None):
-        """Narra texto simples com suporte a pausa e cache."""
+        """Para a narração completamente e descarta a janela de pré-carregamento."""
+        futuro = self.futuro_atual
+        if futuro:
+            futuro.cancel()
+        for futuro in self.futuros_paragrafo:
+            futuro.cancel()
+        self.interrompido = True
+        self.cancelar_precarregamento()
+        self.reprodutor.retomar()
+        self.reprodutor.interromper()
+    
+    def solicitar_precarregamento(self, textos, profundidade=None):
+        """
+        Define a janela de pré-carregamento.
+        
+        Args:
+            textos: Parágrafos em ordem de distância do playhead (o primeiro
+                    é o mais urgente). Sínteses que saíram da janela são canceladas.
+            profundidade: Máximo de parágrafos da janela (padrão: a configurada)
+        """
+        if isinstance(textos, str):
+            textos = [textos]
+        profundidade = profundidade or self.profundidade_precarregamento
+        
+        # Realimentação: áudio já pronto à frente define a próxima janela e a concorrência
+        _, concorrencia = self.controle.atualizar_buffer(self._audio_pronto(textos[:profundidade]))
+        self.servico.definir_concorrencia(concorrencia)
+        
+        janela = {}
+        with self.lock_pendentes:
+            for distancia, texto in enumerate(textos[:profundidade]):
+                if not texto or not texto.strip():
+                    continue
+                
+                # Com vozes por personagem ou frases, cada parte do parágrafo é uma síntese
+                for parte, voz in self._partes_paragrafo(texto):
+                    texto_hash = self._chave_memoria(parte, voz)
+                    if texto_hash in self.cache_sounds or texto_hash in janela:
+                        continue
+                    
+                    futuro = self.pendentes.get(texto_hash)
+                    if futuro is None:
+                        futuro = self._solicitar_audio(parte, prioridade=distancia, voz=voz)
+                        futuro.add_done_callback(
+                            lambda f, d=distancia, h=texto_hash, v=voz, t=time.monotonic():
+                                self._ao_sintetizar(f, d, h, v, t)
+                        )
+                    janela[texto_hash] = futuro
+            
+            # Cancelar o que ficou fora da janela
+            for texto_hash, futuro in self.pendentes.items():
+                if texto_hash not in janela:
+                    futuro.cancel()
+            self.pendentes = janela
+    
+    def _ao_sintetizar(self, futuro, distancia, texto_hash, voz, inicio):
+        """Mede a latência da síntese e entrega o áudio ao worker de decodificação."""
+        if not futuro.cancelled() and futuro.exception() is None:
+            self.controle.registrar_latencia(time.monotonic() - inicio)
+        self.fila_precarregamento.put((distancia, next(self.contador_fila), texto_hash, voz, futuro))
+    
+    def _audio_pronto(self, textos) -> float:
+        """Segundos de áudio já decodificado em sequência no começo da janela."""
+        total = 0.0
+        for texto in textos:
+            if not texto or not texto.strip():
+                continue
+            for parte, voz in self._partes_paragrafo(texto):
+                som = self.cache_sounds.obter(self._chave_memoria(parte, voz))
+                if som is None:
+                    return total
+                total += som.get_length() / self._fator_andamento()
+        return total
+    
+    def aguardar_precarregamento(self, texto: str, timeout: float = 15.0) -> bool:
+        """
+        Espera a síntese pendente do começo de um parágrafo (a que vai tocar primeiro).
+        
+        Args:
+            texto: Parágrafo
+            timeout: Espera máxima em segundos
+        
+        Returns:
+            True se terminou (ou não havia nada pendente) dentro do timeout
+        """
+        parte, voz = self._partes_paragrafo(texto)[0]
+        with self.lock_pendentes:
+            futuro = self.pendentes.get(self._chave_memoria(parte, voz))
+        if futuro is None:
+            return True
+        concluidos, _ = wait([futuro], timeout=timeout)
+        return bool(concluidos)
+    
+    def cancelar_precarregamento(self):
+        """Cancela todas as sínteses pendentes da janela (ex: ao pular de posição)."""
+        with self.lock_pendentes:
+            for futuro in self.pendentes.values():
+                futuro.cancel()
+            self.pendentes = {}
+    
+    def narrar(self, texto: str, posicao=None) -> bool:
+        """
+        Narra texto simples com suporte a pausa e cache.
+        
+        Bloqueia até o áudio terminar. Pausar e parar são tratados pelo
+        reprodutor, que acorda esta thread sem polling.
+        
+        Args:
+            texto: Parágrafo a narrar
+            posicao: (capítulo, parágrafo 1-based), para usar o áudio pré-renderizado
+        
+        Returns:
+            True se o parágrafo foi narrado até o fim. Em False, self.falhou
+            distingue um erro de síntese/decodificação de uma interrupção
+        """
         if not texto.strip():
-            return
+            return True
+        
+        self.interrompido = False
+        self.falhou = False
+        self.reprodutor.reiniciar()
         
         try:
-            texto_hash = f"{hash(texto)}_{self.velocidade}"
+            som_renderizado = self._som_renderizado(texto, posicao) if posicao else None
+            
+            # Várias vozes ou várias frases: primeira parte já, as outras em paralelo
+            if som_renderizado is None:
+                partes = self._partes_paragrafo(texto, posicao)
+                if len(partes) > 1 or partes[0][1] != self.voz_atual:
+                    return self._narrar_partes(partes)
+            
+            texto_hash = self._chave_memoria(texto)
+            rate = self._taxa_sintese()
             
             # Tentar obter do cache primeiro
-            if texto_hash in self.cache_sounds:
-                self.som_atual = self.cache_sounds[texto_hash]
+            som_cache = self.cache_sounds.obter(texto_hash)
+            self.controle.paragrafo_iniciado(som_cache is not None or som_renderizado is not None)
+            if som_cache is not None:
+                self.som_atual = som_cache
                 print(f"⚡ Usando áudio do cache (transição instantânea)")
+            elif som_renderizado:
+                self.som_atual = som_renderizado
+            elif (self.streaming and texto_hash not in self.pendentes
+                  and not self.servico.em_cache(texto, self.voz_atual, rate)):
+                # Sem áudio pronto em lugar nenhum: tocar enquanto sintetiza
+                print(f"⚠️ Áudio não estava em cache, narrando em streaming...")
+                return self._narrar_streaming(texto, texto_hash)
             else:
                 # Se não está em cache, gerar agora (fallback)
                 print(f"⚠️ Áudio não estava em cache, gerando...")
-                arquivo = asyncio.run(self._gerar_audio_async(texto))
-                self.som_atual = pygame.mixer.Sound(arquivo)
+                self.futuro_atual = self._solicitar_audio(texto)
+                try:
+                    arquivo = self.futuro_atual.result()
+                finally:
+                    self.futuro_atual = None
+                self.som_atual = self._pos_processar(pygame.mixer.Sound(arquivo))
                 self.cache_sounds[texto_hash] = self.som_atual
             
-            self.som_atual.set_volume(self.volume)
-            self.canal.play(self.som_atual)
+            if self.interrompido:
+                return False
             
-            while self.canal.get_busy() or self.pausado:
-                if callback_pausado and callback_pausado():
-                    if not self.pausado:
-                        self.pausar()
-                elif self.pausado:
-                    self.despausar()
-                time.sleep(0.01)  # Reduzir sleep para melhor responsividade
+            self.som_atual = self._no_andamento(self.som_atual)
+            self.som_atual.set_volume(self.volume)
+            self.reprodutor.tocar(self.som_atual)
+            return self.reprodutor.aguardar_fim()
+        except CancelledError:
+            # Cancelada por parar(); fora disso a síntese saiu da janela e vale tentar de novo
+            self.falhou = not self.interrompido
+            return False
         except Exception as e:
             print(f"Erro ao narrar: {e}")
+            self.falhou = True
+            return False
+    
+    def _iniciar_transmissao(self, texto: str, voz: str):
+        """
+        Inicia a síntese em streaming.
+        
+        Returns:
+            (Future da síntese, fila com os pedaços de MP3 terminada por None)
+        """
+        fila_bytes = Queue()
+        rate = self._taxa_sintese()
+        futuro = self.servico.transmitir(texto, voz, rate, fila_bytes.put)
+        # Sempre termina a fila, inclusive se parar() cancelar a síntese
+        futuro.add_done_callback(lambda f: fila_bytes.put(None))
+        self.futuro_atual = futuro
+        return futuro, fila_bytes
+    
+    def _enfileirar_transmissao(self, futuro, fila_bytes, texto_hash, voz=None) -> bool:
+        """
+        Toca os blocos de uma transmissão conforme chegam.
+        
+        Os blocos decodificados são enfileirados no reprodutor, que espera a
+        vaga na fila do canal sem polling. Retorna quando o último bloco foi
+        agendado (sem esperar tocar); o áudio completo vai para o cache em
+        memória para uma próxima narração instantânea.
+        
+        Returns:
+            True se todos os blocos foram agendados
+        """
+        decodificador = DecodificadorMP3Incremental()
+        brutos = []
+        
+        try:
+            while not self.interrompido:
+                pedaco = fila_bytes.get()
+                if pedaco is None:
+                    break
+                for som in decodificador.alimentar(pedaco):
+                    som = self._pos_processar(som, voz)
+                    brutos.append(som.get_raw())
+                    som = self._no_andamento(som)
+                    som.set_volume(self.volume)
+                    self.som_atual = som
+                    if not self.reprodutor.enfileirar(som):
+                        break
+        finally:
+            self.futuro_atual = None
+        
+        if self.interrompido or futuro.cancelled():
+            return False
+        if futuro.exception() is not None:
+            print(f"Erro ao narrar: {futuro.exception()}")
+            self.falhou = True
+            return False
+        
+        for som in decodificador.finalizar():
+            som = self._pos_processar(som, voz)
+            brutos.append(som.get_raw())
+            som = self._no_andamento(som)
+            som.set_volume(self.volume)
+            self.som_atual = som
+            if not self.reprodutor.enfileirar(som):
+                return False
+        
+        if brutos:
+            self.cache_sounds[texto_hash] = pygame.mixer.Sound(buffer=b''.join(brutos))
+        return True
+    
+    def _narrar_streaming(self, texto: str, texto_hash) -> bool:
+        """
+        Sintetiza via Communicate.stream() e toca os blocos conforme chegam.
+        
+        Returns:
+            True se o parágrafo foi narrado até o fim
+        """
+        futuro, fila_bytes = self._iniciar_transmissao(texto, self.voz_atual)
+        if not self._enfileirar_transmissao(futuro, fila_bytes, texto_hash):
+            return False
+        return self.reprodutor.aguardar_fim()
+    
+    def _narrar_partes(self, partes) -> bool:
+        """
+        Narra um parágrafo em várias partes (vozes por personagem ou frases).
+        
+        Todas as partes são sintetizadas ao mesmo tempo. A primeira toca em
+        streaming quando não há áudio pronto (o início não espera pelas
+        outras partes) e as demais entram na fila do canal em ordem, sem
+        lacuna entre uma parte e outra.
+        
+        Args:
+            partes: Lista de (texto, voz do Edge TTS)
+        
+        Returns:
+            True se o parágrafo foi narrado até o fim
+        """
+        rate = self._taxa_sintese()
+        chaves = [self._chave_memoria(parte, voz) for parte, voz in partes]
+        
+        # A transmissão da primeira parte entra antes das outras no serviço
+        transmissao = None
+        primeira, primeira_voz = partes[0]
+        if (self.streaming and chaves[0] not in self.cache_sounds
+                and chaves[0] not in self.pendentes
+                and not self.servico.em_cache(primeira, primeira_voz, rate)):
+            transmissao = self._iniciar_transmissao(primeira, primeira_voz)
+        
+        # Som já decodificado ou Future da síntese, para cada parte
+        fontes = []
+        with self.lock_pendentes:
+            for i, ((parte, voz), chave) in enumerate(zip(partes, chaves)):
+                if i == 0 and transmissao:
+                    fontes.append(None)
+                    continue
+                som_cache = self.cache_sounds.obter(chave)
+                if som_cache is not None:
+                    fontes.append(som_cache)
+                else:
+                    fontes.append(self.pendentes.get(chave)
+                                  or self._solicitar_audio(parte, prioridade=0, voz=voz))
+        self.futuros_paragrafo = [f for f in fontes if isinstance(f, Future)]
+        self.controle.paragrafo_iniciado(fontes[0] is not None and not isinstance(fontes[0], Future))
+        
+        try:
+            for (_, voz), chave, fonte in zip(partes, chaves, fontes):
+                if self.interrompido:
+                    return False
+                
+                if fonte is None:
+                    if not self._enfileirar_transmissao(*transmissao, chave, primeira_voz):
+                        return False
+                    continue
+                
+                if isinstance(fonte, Future):
+                    som = self._pos_processar(pygame.mixer.Sound(fonte.result()), voz)
+                    self.cache_sounds[chave] = som
+                else:
+                    som = fonte
+                
+                if self.interrompido:
+                    return False
+                som = self._no_andamento(som)
+                som.set_volume(self.volume)
+                self.som_atual = som
+                if not self.reprodutor.enfileirar(som):
+                    return False
+            
+            return self.reprodutor.aguardar_fim()
+        finally:
+            self.futuros_paragrafo = []
     
     def limpar_cache(self):
         """Limpa o cache de áudios."""
@@ -477,12 +1003,11 @@ class EngineNarracaoSimples:
         print("🗑️ Cache de áudio limpo")
     
     def trocar_voz(self, nova_voz):
-        """Troca a voz e limpa o cache."""
+        """Troca a voz (o cache é por voz, então os áudios das outras continuam valendo)."""
         voz_id = self.VOZES.get(nova_voz, self.VOZES['Francisca'])
         if voz_id != self.voz_atual:
             self.voz_atual = voz_id
-            self.limpar_cache()
-            print(f"🎙️ Voz alterada para: {nova_voz}")
+            print(f"🎙️ Voz alterada para: {nova_voz} ({self.cache_sounds.uso_mb():.0f} MB em cache)")
     
     def parar_precarregamento(self):
         """Para a thread de pré-carregamento."""
@@ -494,6 +1019,10 @@ class EngineNarracaoSimples:
 class NovelReaderGUI:
     """Interface gráfica moderna do Novel Reader."""
     
+    # Parágrafo que o Edge TTS não consegue narrar (ex: "***", rede fora) é pulado
+    TENTATIVAS_PARAGRAFO = 3
+    ESPERA_TENTATIVA = 1.0  # Segundos antes da 2ª tentativa, dobrando a cada uma
+    
     def __init__(self, root):
         self.root = root
         self.root.title("📚 Novel Reader - Martial World")
@@ -522,7 +1051,12 @@ class NovelReaderGUI:
         self.tempo_total_narracao = 0
         self.modo_compacto = False  # Controla layout adaptativo
         self.modo_leitura = False  # Modo de leitura focado
+        self.conteudo_exibido = None  # Capítulo montado no modo leitura (None = widget com outro texto)
+        self.sufixos_palavras = (None, [0])  # (capítulo, palavras do parágrafo i até o fim)
+        self.paragrafo_destacado = None
         self.controles_visiveis = True  # Controla visibilidade dos controles
+        self.profundidade_precarregamento = 3  # Parágrafos sintetizados à frente
+        self.capitulo_seguinte = None  # (numero, conteudo) lido antecipadamente
         
         # Configurações de estilização de texto
         self.config_texto = {
@@ -720,7 +1254,7 @@ class NovelReaderGUI:
                                           command=self.capitulo_anterior)
         self.btn_cap_anterior.pack(side='left', padx=(0, 5))
         
-        self.spin_capitulo = ttk.Spinbox(cap_frame, from_=1, to=2266, width=10,
+        self.spin_capitulo = ttk.Spinbox(cap_frame, from_=1, to=max(self.capitulos_disponiveis or [1]), width=10,
                                         command=self.on_capitulo_mudado)
         self.spin_capitulo.set('961')
         self.spin_capitulo.pack(side='left', fill='x', expand=True, padx=(0, 5))
@@ -928,11 +1462,20 @@ class NovelReaderGUI:
                                       values=list(EngineNarracaoSimples.VOZES.keys()),
                                       state='readonly', width=15)
         self.combo_voz.set('Francisca')
-        self.combo_voz.grid(row=0, column=4, columnspan=3, sticky='ew')
+        self.combo_voz.grid(row=0, column=4, columnspan=2, sticky='ew')
         self.combo_voz.bind('<<ComboboxSelected>>', self.on_voz_alterada)
         # Configurar cores após criar
         self.combo_voz.configure(foreground=TemaEscuro.TEXT_PRIMARY)
         
+        # Vozes por personagem (config/vozes_config.json)
+        self.multi_vozes = tk.BooleanVar(value=False)
+        self.check_multi_vozes = ttk.Checkbutton(controls_frame, text="🎭 Personagens",
+                                                 variable=self.multi_vozes,
+                                                 command=self.on_multi_vozes_alterado)
+        self.check_multi_vozes.grid(row=0, column=6, sticky='w', padx=(10, 0))
+        self.criar_tooltip(self.check_multi_vozes,
+                           "Narrar os diálogos com a voz de cada personagem")
+        
         # === LINHA 2: Navegação ===
         # Capítulo
         ttk.Label(controls_frame, text="📑 Capítulo:").grid(row=1, column=0, sticky='w', 
@@ -944,7 +1487,7 @@ class NovelReaderGUI:
                                           command=self.capitulo_anterior)
         self.btn_cap_anterior.pack(side='left', padx=(0, 5))
         
-        self.spin_capitulo = ttk.Spinbox(cap_frame, from_=1, to=2266, width=10,
+        self.spin_capitulo = ttk.Spinbox(cap_frame, from_=1, to=max(self.capitulos_disponiveis or [1]), width=10,
                                         command=self.on_capitulo_mudado)
         self.spin_capitulo.set('961')
         self.spin_capitulo.pack(side='left', padx=(0, 5))
@@ -1073,6 +1616,16 @@ class NovelReaderGUI:
                                        font=('Segoe UI', 9, 'bold'))
         self.lbl_velocidade.pack(side='left', padx=(5, 0))
         
+        # Velocidade aplicada no áudio já baixado (sem nova síntese)
+        self.andamento_local = tk.BooleanVar(value=False)
+        self.check_andamento_local = ttk.Checkbutton(vel_frame, text="⏩ Local",
+                                                     variable=self.andamento_local,
+                                                     command=self.on_andamento_local_alterado)
+        self.check_andamento_local.pack(side='left', padx=(8, 0))
+        self.criar_tooltip(self.check_andamento_local,
+                           "Mudar a velocidade no próprio computador: vale na hora, "
+                           "sem sintetizar de novo")
+        
         # === LINHA 5: Música ===
         musica_frame = ttk.Frame(controls_frame)
         musica_frame.grid(row=4, column=0, columnspan=7, sticky='ew', pady=(10, 0))
@@ -1152,6 +1705,12 @@ class NovelReaderGUI:
                                             font=('Segoe UI', 9),
                                             foreground=TemaEscuro.TEXT_SECONDARY)
         self.lbl_tempo_estimado.pack(side='left')
+        
+        self.lbl_buffer = ttk.Label(time_frame,
+                                    text="📦 Buffer: --",
+                                    font=('Segoe UI', 9),
+                                    foreground=TemaEscuro.TEXT_SECONDARY)
+        self.lbl_buffer.pack(side='left', padx=(20, 0))
     
     def criar_controles_playback(self, parent):
         """Cria controles de playback principais."""
@@ -1316,6 +1875,20 @@ class NovelReaderGUI:
             self.engine.trocar_voz(nova_voz)
             print(f"🎙️ Voz alterada para: {nova_voz}")
     
+    def on_multi_vozes_alterado(self):
+        """Callback quando as vozes por personagem são ligadas ou desligadas."""
+        if self.engine:
+            self.engine.definir_multi_vozes(self.leitor if self.multi_vozes.get() else None)
+            if self.narrando:
+                self.precarregar_janela()
+    
+    def on_andamento_local_alterado(self):
+        """Callback quando o andamento local é ligado ou desligado."""
+        if self.engine:
+            self.engine.set_andamento_local(self.andamento_local.get())
+            if self.narrando:
+                self.precarregar_janela()
+    
     def carregar_capitulos(self):
         """Carrega lista de capítulos disponíveis."""
         self.capitulos_disponiveis = self.leitor.listar_capitulos_disponiveis()
@@ -1330,6 +1903,7 @@ class NovelReaderGUI:
             self.atualizar_display_modo_leitura()
         else:
             # Modo normal: mostrar apenas o parágrafo atual
+            self.conteudo_exibido = None
             self.text_paragrafo.config(state='normal')
             self.text_paragrafo.delete('1.0', 'end')
             self.text_paragrafo.insert('1.0', texto)
@@ -1338,40 +1912,53 @@ class NovelReaderGUI:
             # Aplicar estilo de texto
             self.aplicar_estilo_texto()
     
-    def atualizar_display_modo_leitura(self):
-        """Atualiza display no modo leitura com highlight do parágrafo atual."""
+    def atualizar_display_modo_leitura(self, forcar=False):
+        """
+        Atualiza display no modo leitura com highlight do parágrafo atual.
+        
+        O capítulo é montado no widget uma vez (ao mudar de capítulo); entre
+        parágrafos só a tag 'destaque' muda de lugar.
+        
+        Args:
+            forcar: Remontar o capítulo mesmo que já esteja exibido
+        """
         if not self.conteudo_capitulo:
             return
         
+        if forcar or self.conteudo_exibido is not self.conteudo_capitulo:
+            self.renderizar_capitulo_leitura()
+        self.destacar_paragrafo(self.paragrafo_atual)
+    
+    def renderizar_capitulo_leitura(self):
+        """Monta o capítulo inteiro no widget, com uma tag por parágrafo."""
         self.text_paragrafo.config(state='normal')
         self.text_paragrafo.delete('1.0', tk.END)
+        for tag in self.text_paragrafo.tag_names():
+            if tag.startswith('paragrafo_') and tag != 'paragrafo_num':
+                self.text_paragrafo.tag_delete(tag)
         
         # Inserir todos os parágrafos
         for i, paragrafo in enumerate(self.conteudo_capitulo, 1):
-            # Tag para o parágrafo inteiro
-            tag_paragrafo = f'paragrafo_{i}'
-            
             # Número do parágrafo
             self.text_paragrafo.insert(tk.END, f"[{i}] ", 'paragrafo_num')
-            
-            # Texto do parágrafo
-            inicio = self.text_paragrafo.index(tk.END + '-1c')
-            self.text_paragrafo.insert(tk.END, paragrafo + "\n\n")
-            fim = self.text_paragrafo.index(tk.END + '-1c')
-            
-            # Adicionar tag ao parágrafo
-            self.text_paragrafo.tag_add(tag_paragrafo, inicio, fim)
+            # Texto do parágrafo com a tag do parágrafo inteiro
+            self.text_paragrafo.insert(tk.END, paragrafo, f'paragrafo_{i}')
+            self.text_paragrafo.insert(tk.END, "\n\n")
         
         # Configurar tags
         self.text_paragrafo.tag_config('paragrafo_num', 
                                        foreground=TemaEscuro.ACCENT_SECONDARY,
                                        font=('Segoe UI', 9, 'bold'))
         
-        # Remover highlight anterior (resetar apenas background)
-        for tag in self.text_paragrafo.tag_names():
-            if tag.startswith('paragrafo_'):
-                self.text_paragrafo.tag_config(tag, background='')
+        self.text_paragrafo.config(state='disabled')
+        self.conteudo_exibido = self.conteudo_capitulo
+        self.paragrafo_destacado = None
         
+        # Aplicar estilo de texto
+        self.aplicar_estilo_texto()
+    
+    def destacar_paragrafo(self, numero):
+        """Move o highlight para o parágrafo e rola até ele (sem remontar o texto)."""
         # Definir cor de highlight baseada na paleta
         paleta = self.config_texto.get('paleta', 'padrao')
         highlights_por_paleta = {
@@ -1381,21 +1968,23 @@ class NovelReaderGUI:
             'papel': '#e0e0e0'     # Cinza claro
         }
         cor_highlight = highlights_por_paleta.get(paleta, '#3d3d52')
+        # Apenas background, preserva cor da fonte
+        self.text_paragrafo.tag_config('destaque', background=cor_highlight)
         
-        # Highlight do parágrafo atual (apenas background, preserva cor da fonte)
-        tag_atual = f'paragrafo_{self.paragrafo_atual}'
-        self.text_paragrafo.tag_config(tag_atual, 
-                                       background=cor_highlight)
+        if self.paragrafo_destacado is not None:
+            faixa_anterior = self.text_paragrafo.tag_ranges(f'paragrafo_{self.paragrafo_destacado}')
+            if faixa_anterior:
+                self.text_paragrafo.tag_remove('destaque', *faixa_anterior)
         
-        # Auto-scroll para o parágrafo atual
-        # Calcular linha aproximada (cada parágrafo é ~2 linhas)
-        linha_aprox = (self.paragrafo_atual - 1) * 2 + 1
-        self.text_paragrafo.see(f"{linha_aprox}.0")
-        
-        self.text_paragrafo.config(state='disabled')
+        faixa = self.text_paragrafo.tag_ranges(f'paragrafo_{numero}')
+        self.paragrafo_destacado = numero
+        if not faixa:
+            return
+        self.text_paragrafo.tag_add('destaque', *faixa)
         
-        # Aplicar estilo de texto
-        self.aplicar_estilo_texto()
+        # Auto-scroll: fim e depois início, para mostrar o parágrafo inteiro quando cabe
+        self.text_paragrafo.see(faixa[1])
+        self.text_paragrafo.see(faixa[0])
     
     def atualizar_status(self):
         """Atualiza labels de status."""
@@ -1408,9 +1997,25 @@ class NovelReaderGUI:
         if self.conteudo_capitulo:
             self.lbl_cap_info.config(text=f"✓ Capítulo {self.capitulo_atual} carregado ({total} parágrafos)")
         
+        # Ritmo calibrado pelas durações já tocadas nesta voz/velocidade
+        if self.engine:
+            palavras_por_min = self.engine.palavras_por_minuto()
+        else:
+            palavras_por_min = obter_modelo().palavras_por_minuto(
+                EngineNarracaoSimples.VOZES.get(self.combo_voz.get(), EngineNarracaoSimples.VOZES['Francisca']),
+                ServicoSintese.formatar_taxa(int(self.velocidade_narracao.get()))
+            )
+        palavras_restantes = self.palavras_restantes(self.paragrafo_atual)
+        
         # Atualizar progresso total
-        progresso_pct = (self.capitulo_atual / 2266) * 100
-        self.lbl_progresso_total.config(text=f"📚 Progresso total: Capítulo {self.capitulo_atual}/2266 ({progresso_pct:.1f}%)")
+        ultimo = self.leitor.manifesto.ultimo()
+        if ultimo:
+            progresso_pct = (self.capitulo_atual / ultimo) * 100
+            palavras_novel = palavras_restantes + self.leitor.manifesto.total_palavras(self.capitulo_atual + 1)
+            self.lbl_progresso_total.config(
+                text=f"📚 Progresso total: Capítulo {self.capitulo_atual}/{ultimo} ({progresso_pct:.1f}%)"
+                     f" • ⏳ {self.formatar_minutos(palavras_novel / palavras_por_min)} até o fim"
+            )
         
         # Atualizar barra de progresso do capítulo
         if total > 0:
@@ -1420,13 +2025,18 @@ class NovelReaderGUI:
         
         # Atualizar tempo estimado
         if self.narrando and total > 0:
-            palavras_por_min = 150
-            texto_restante = ' '.join(self.conteudo_capitulo[self.paragrafo_atual-1:])
-            palavras_restantes = len(texto_restante.split())
             minutos_estimados = palavras_restantes / palavras_por_min
-            horas = int(minutos_estimados // 60)
-            mins = int(minutos_estimados % 60)
-            self.lbl_tempo_estimado.config(text=f"⏳ Tempo estimado: {horas:02d}:{mins:02d}")
+            self.lbl_tempo_estimado.config(text=f"⏳ Tempo estimado: {self.formatar_minutos(minutos_estimados)}")
+        
+        # Áudio pronto à frente e parágrafos que ficaram esperando a síntese
+        if self.engine:
+            controle = self.engine.controle.resumo()
+            self.lbl_buffer.config(
+                text=f"📦 Buffer: {controle['buffer']:.0f}/{controle['alvo']:.0f}s • "
+                     f"janela {controle['profundidade']} • {controle['concorrencia']} sínteses • "
+                     f"⚠️ {controle['underruns']} travadas",
+                foreground=TemaEscuro.ACCENT_WARNING if controle['underruns'] else TemaEscuro.TEXT_SECONDARY
+            )
         
         if self.narrando:
             if self.pausado:
@@ -1442,20 +2052,73 @@ class NovelReaderGUI:
                                     bg=TemaEscuro.BG_TERCIARIO,
                                     fg=TemaEscuro.TEXT_SECONDARY)
     
-    def precarregar_proximo_paragrafo(self):
-        """Solicita pré-carregamento do próximo parágrafo."""
+    def palavras_restantes(self, paragrafo):
+        """Palavras do parágrafo (1-based) até o fim do capítulo (somas calculadas uma vez por capítulo)."""
+        capitulo, sufixos = self.sufixos_palavras
+        if capitulo is not self.conteudo_capitulo:
+            sufixos = [0] * (len(self.conteudo_capitulo) + 1)
+            for i in range(len(self.conteudo_capitulo) - 1, -1, -1):
+                sufixos[i] = sufixos[i + 1] + len(self.conteudo_capitulo[i].split())
+            self.sufixos_palavras = (self.conteudo_capitulo, sufixos)
+        return sufixos[min(max(paragrafo - 1, 0), len(sufixos) - 1)]
+    
+    @staticmethod
+    def formatar_minutos(minutos):
+        """Formata minutos como HH:MM (horas sem limite)."""
+        horas = int(minutos // 60)
+        mins = int(minutos % 60)
+        return f"{horas:02d}:{mins:02d}"
+    
+    def obter_conteudo_capitulo_seguinte(self):
+        """Retorna os parágrafos do próximo capítulo (lidos uma única vez)."""
+        proximo = self.capitulo_atual + 1
+        if self.capitulo_seguinte and self.capitulo_seguinte[0] == proximo:
+            return self.capitulo_seguinte[1]
+        
+        if not self.capitulos_disponiveis or proximo > max(self.capitulos_disponiveis):
+            return []
+        
+        capitulo = self.leitor.carregar_capitulo(proximo)
+        conteudo = capitulo['conteudo'] if capitulo else []
+        self.capitulo_seguinte = (proximo, conteudo)
+        return conteudo
+    
+    def precarregar_janela(self):
+        """
+        Solicita o pré-carregamento do parágrafo atual e dos próximos.
+        
+        A janela tem profundidade_precarregamento parágrafos (ou mais, se o
+        modelo de fala indicar que a síntese não acompanha a reprodução),
+        ordenados pela distância do playhead, e continua no capítulo seguinte
+        quando o atual acaba. Ela começa no próprio playhead: a síntese ainda
+        pendente do parágrafo que vai tocar não pode sair da janela (seria
+        cancelada e recomeçada do zero por narrar()).
+        """
         if not self.engine or not self.conteudo_capitulo:
             return
         
-        # Próximo parágrafo
-        proximo_idx = self.paragrafo_atual  # paragrafo_atual é 1-based
-        if 0 <= proximo_idx < len(self.conteudo_capitulo):
-            texto_proximo = self.conteudo_capitulo[proximo_idx]
-            self.engine.solicitar_precarregamento(texto_proximo)
+        inicio = self.paragrafo_atual - 1  # paragrafo_atual é 1-based
+        amostra = self.conteudo_capitulo[max(inicio, 0):inicio + self.profundidade_precarregamento]
+        caracteres = sum(len(p) for p in amostra) // max(1, len(amostra))
+        profundidade = self.engine.profundidade_janela(caracteres)
+        fim = inicio + profundidade
+        
+        textos = self.conteudo_capitulo[max(inicio, 0):fim]
+        if self.engine.capitulo_renderizado(self.capitulo_atual):
+            textos = [''] * len(textos)  # Já tem áudio pronto: nada a sintetizar
+        if len(textos) < profundidade:
+            faltam = profundidade - len(textos)
+            if not self.engine.capitulo_renderizado(self.capitulo_atual + 1):
+                textos = textos + self.obter_conteudo_capitulo_seguinte()[:faltam]
+        
+        self.engine.solicitar_precarregamento(textos, profundidade)
     
     def carregar_capitulo(self, numero):
         """Carrega um capítulo."""
-        capitulo = self.leitor.carregar_capitulo(numero)
+        if self.capitulo_seguinte and self.capitulo_seguinte[0] == numero and self.capitulo_seguinte[1]:
+            capitulo = {'conteudo': self.capitulo_seguinte[1]}
+        else:
+            capitulo = self.leitor.carregar_capitulo(numero)
         if capitulo:
             self.conteudo_capitulo = capitulo['conteudo']
             self.capitulo_atual = numero
@@ -1490,8 +2153,12 @@ class NovelReaderGUI:
             # Pausar/despausar
             self.pausado = not self.pausado
             if self.pausado:
+                if self.engine:
+                    self.engine.pausar()
                 self.btn_play_pause.config(text="▶️  CONTINUAR")
             else:
+                if self.engine:
+                    self.engine.despausar()
                 self.btn_play_pause.config(text="⏸️  PAUSAR")
             self.atualizar_status()
     
@@ -1512,22 +2179,34 @@ class NovelReaderGUI:
         """Loop principal de narração com highlight progressivo."""
         voz = self.combo_voz.get()
         
-        # Se já existe engine, trocar voz e limpar cache
+        # Se já existe engine, só trocar a voz (o cache de sons é por voz)
         if self.engine:
             self.engine.trocar_voz(voz)
         else:
-            self.engine = EngineNarracaoSimples(voz, self.musica.canal_narrador)
+            self.engine = EngineNarracaoSimples(voz, self.musica.canal_narrador,
+                                                self.profundidade_precarregamento)
         
+        self.engine.definir_novel(self.leitor.caminho_novel)
+        self.engine.definir_multi_vozes(self.leitor if self.multi_vozes.get() else None)
         self.engine.set_volume(self.volume_narracao.get() / 100)
         self.engine.set_velocidade(int(self.velocidade_narracao.get()))
+        self.engine.set_andamento_local(self.andamento_local.get())
+        if self.pausado:
+            self.engine.pausar()
+        else:
+            self.engine.despausar()
         
-        # Pré-carregar apenas o primeiro parágrafo
+        # Pré-carregar a janela a partir do parágrafo inicial
         print("🔄 Pré-carregando parágrafo inicial...")
+        self.engine.controle.reiniciar()
         if 1 <= self.paragrafo_atual <= len(self.conteudo_capitulo):
-            self.engine.solicitar_precarregamento(self.conteudo_capitulo[self.paragrafo_atual - 1])
-        time.sleep(0.5)  # Aguardar pré-carregamento do primeiro
+            self.precarregar_janela()
+            # Aguardar a síntese do primeiro (parar() cancela e libera a espera)
+            self.engine.aguardar_precarregamento(self.conteudo_capitulo[self.paragrafo_atual - 1])
         print("✓ Pronto para narrar")
         
+        falhas = 0  # Tentativas sem sucesso no parágrafo atual
+        posicao_falha = None
         while self.narrando:
             # Verificar se terminou o capítulo
             if self.paragrafo_atual > len(self.conteudo_capitulo):
@@ -1552,19 +2231,39 @@ class NovelReaderGUI:
             
             # Parágrafo atual
             paragrafo = self.conteudo_capitulo[self.paragrafo_atual - 1]
+            posicao = (self.capitulo_atual, self.paragrafo_atual)
+            if posicao != posicao_falha:
+                falhas = 0
             
-            # Atualizar UI
-            self.root.after(0, self.atualizar_display, paragrafo)
-            self.root.after(0, self.atualizar_status)
+            if falhas == 0:
+                # Atualizar UI
+                self.root.after(0, self.atualizar_display, paragrafo)
+                self.root.after(0, self.atualizar_status)
+                
+                # ANTES de narrar, renovar a janela (o atual segue nela, os próximos entram)
+                self.precarregar_janela()
             
-            # ANTES de narrar, solicitar pré-carregamento do próximo
-            self.precarregar_proximo_paragrafo()
+            # Narrar (instantâneo com cache); a pausa é tratada dentro do engine
+            concluido = self.engine.narrar(paragrafo, posicao)
+            if not self.narrando:
+                break
             
-            # Narrar com callback para verificar pausa (instantâneo com cache)
-            self.engine.narrar(paragrafo, callback_pausado=lambda: self.pausado)
+            if not concluido and self.engine.falhou:
+                falhas += 1
+                posicao_falha = posicao
+                # Nova tentativa não é underrun: o parágrafo já foi contado
+                self.engine.controle.reiniciar()
+                if falhas < self.TENTATIVAS_PARAGRAFO:
+                    espera = self.ESPERA_TENTATIVA * 2 ** (falhas - 1)
+                    print(f"🔁 Falha ao narrar o parágrafo {posicao[1]}, "
+                          f"tentando de novo em {espera:.0f}s...")
+                    self.engine.reprodutor.aguardar(espera)  # parar() acorda a espera
+                    continue
+                print(f"⏭️ Parágrafo {posicao[1]} pulado após {falhas} falhas")
+                concluido = True
             
-            # Próximo parágrafo (só se não pausou)
-            if not self.pausado and self.narrando:
+            # Próximo parágrafo (só se terminou de narrar este, ou se desistiu dele)
+            if concluido:
                 self.paragrafo_atual += 1
                 self.root.after(0, lambda p=self.paragrafo_atual: self.spin_paragrafo.set(str(p)))
         
@@ -1610,7 +2309,7 @@ class NovelReaderGUI:
     def capitulo_proximo(self):
         """Vai para próximo capítulo."""
         self.parar_narracao_completa()
-        if self.capitulo_atual < 2266:
+        if self.capitulo_atual < self.leitor.manifesto.ultimo():
             self.carregar_capitulo(self.capitulo_atual + 1)
             self.paragrafo_atual = 1
             self.spin_paragrafo.set('1')
@@ -1720,10 +2419,16 @@ class NovelReaderGUI:
                     # Carregar preferências
                     if 'voz' in dados:
                         self.combo_voz.set(dados['voz'])
+                    if 'multi_vozes' in dados:
+                        self.multi_vozes.set(bool(dados['multi_vozes']))
+                    if 'andamento_local' in dados:
+                        self.andamento_local.set(bool(dados['andamento_local']))
                     if 'volume_narracao' in dados:
                         self.volume_narracao.set(dados['volume_narracao'])
                     if 'volume_musica' in dados:
                         self.volume_musica.set(dados['volume_musica'])
+                    if 'profundidade_precarregamento' in dados:
+                        self.profundidade_precarregamento = max(1, int(dados['profundidade_precarregamento']))
                     
                     print(f"✓ Progresso carregado: Cap {self.capitulo_atual}, Par {self.paragrafo_atual}")
         except Exception as e:
@@ -1737,9 +2442,12 @@ class NovelReaderGUI:
                 'capitulo': self.capitulo_atual,
                 'paragrafo': self.paragrafo_atual,
                 'voz': self.combo_voz.get(),
+                'multi_vozes': self.multi_vozes.get(),
                 'volume_narracao': self.volume_narracao.get(),
                 'volume_musica': self.volume_musica.get(),
-                'velocidade': self.velocidade_narracao.get()
+                'velocidade': self.velocidade_narracao.get(),
+                'andamento_local': self.andamento_local.get(),
+                'profundidade_precarregamento': self.profundidade_precarregamento
             }
             with open(self.arquivo_progresso, 'w', encoding='utf-8') as f:
                 json.dump(dados, f, indent=2, ensure_ascii=False)
@@ -1858,6 +2566,7 @@ class NovelReaderGUI:
         else:
             # Voltar ao modo normal
             self.btn_modo_leitura.config(text="📖 Modo Leitura")
+            self.conteudo_exibido = None
             if self.conteudo_capitulo and self.paragrafo_atual <= len(self.conteudo_capitulo):
                 texto = self.conteudo_capitulo[self.paragrafo_atual - 1]
                 self.text_paragrafo.config(state='normal')
@@ -1871,6 +2580,7 @@ class NovelReaderGUI:
         if not self.conteudo_capitulo:
             return
         
+        self.conteudo_exibido = None
         self.text_paragrafo.config(state='normal')
         self.text_paragrafo.delete('1.0', tk.END)
         
@@ -0,0 +1,240 @@
+"""
+Renderização Offline de Capítulos
+Sintetiza capítulos inteiros para MP3 (com índice de parágrafos) antes de ouvir
+Uso: python renderizar_capitulos.py INICIO FIM [--novel PASTA] [--voz NOME] [--taxa PCT]
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'engines'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from leitor import LeitorNovel
+from narracao import EngineNarracao
+from servico_sintese import ServicoSintese
+from capitulos_renderizados import CapitulosRenderizados
+from modelo_fala import obter_modelo
+
+
+# Síntese estimada (segundos de parede) mantida em andamento além do capítulo atual
+JANELA_RENDERIZACAO = 60.0
+MAX_CAPITULOS_EM_ANDAMENTO = 8
+
+
+class DiarioRenderizacao:
+    """
+    Diário append-only (JSON Lines) dos capítulos já renderizados.
+
+    Permite retomar uma execução interrompida: um capítulo só é pulado se
+    o diário o marca como concluído com o mesmo conteúdo e os arquivos
+    ainda existem.
+    """
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self.concluidos = {}  # {numero: hash_conteudo}
+        if os.path.exists(caminho):
+            with open(caminho, 'r', encoding='utf-8') as f:
+                for linha in f:
+                    try:
+                        registro = json.loads(linha)
+                    except ValueError:
+                        continue  # Linha incompleta de uma execução interrompida
+                    if registro.get('status') == 'ok':
+                        self.concluidos[registro['numero']] = registro['hash']
+                    else:
+                        self.concluidos.pop(registro.get('numero'), None)
+
+    def registrar(self, numero: int, status: str, hash_conteudo: str = None, **extras):
+        registro = {'numero': numero, 'status': status, 'hash': hash_conteudo,
+                    'data': time.strftime('%Y-%m-%d %H:%M:%S'), **extras}
+        with open(self.caminho, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        if status == 'ok':
+            self.concluidos[numero] = hash_conteudo
+        else:
+            self.concluidos.pop(numero, None)
+
+    def concluido(self, numero: int, hash_conteudo: str) -> bool:
+        return self.concluidos.get(numero) == hash_conteudo
+
+
+def hash_capitulo(paragrafos) -> str:
+    """Digest do conteúdo do capítulo (detecta capítulos reextraídos)."""
+    return CapitulosRenderizados.hash_paragrafo('\n'.join(paragrafos))
+
+
+def renderizar_capitulos(caminho_novel: str, inicio: int, fim: int, voz: str = 'Francisca',
+                         taxa: int = 0, concorrencia: int = 4, tentativas: int = 3):
+    """
+    Renderiza um intervalo de capítulos.
+
+    Args:
+        caminho_novel: Pasta da novel
+        inicio: Primeiro capítulo
+        fim: Último capítulo (inclusivo)
+        voz: Nome da voz (Francisca, Thalita, Antonio, Raquel, Duarte)
+        taxa: Velocidade em percentual (-50 a +50)
+        concorrencia: Sínteses simultâneas
+        tentativas: Tentativas por parágrafo antes de desistir do capítulo
+    """
+    voz_id = EngineNarracao.VOZES.get(voz, EngineNarracao.VOZES['Francisca'])
+    taxa_str = ServicoSintese.formatar_taxa(taxa)
+
+    leitor = LeitorNovel(caminho_novel)
+    renderizados = CapitulosRenderizados(caminho_novel, voz_id, taxa_str)
+    os.makedirs(renderizados.pasta, exist_ok=True)
+    diario = DiarioRenderizacao(os.path.join(renderizados.pasta, 'diario.jsonl'))
+    servico = ServicoSintese(max_concorrencia=concorrencia)
+    modelo = obter_modelo()
+
+    disponiveis = set(leitor.listar_capitulos_disponiveis())
+    numeros = [n for n in range(inicio, fim + 1) if n in disponiveis]
+
+    print("\n" + "="*70)
+    print(f" RENDERIZAÇÃO OFFLINE - Capítulos {inicio} a {fim}")
+    print(f" 🎭 Voz: {voz} ({voz_id}) | ⚡ Taxa: {taxa_str} | 🔀 Concorrência: {concorrencia}")
+    print(f" 📁 Saída: {renderizados.pasta}")
+    print("="*70 + "\n")
+
+    # Capítulos a renderizar (pulando os já concluídos no diário)
+    fila = deque()
+    for numero in numeros:
+        capitulo = leitor.carregar_capitulo(numero)
+        if not capitulo:
+            continue
+        paragrafos = capitulo.get('conteudo', [])
+        hash_conteudo = hash_capitulo(paragrafos)
+        if diario.concluido(numero, hash_conteudo) and renderizados.disponivel(numero):
+            print(f"⏭️  Capítulo {numero} já renderizado")
+            continue
+        fila.append((numero, capitulo.get('titulo', ''), paragrafos, hash_conteudo))
+
+    if not fila:
+        print("✅ Nada a renderizar.")
+        servico.finalizar()
+        return
+
+    # Tempo de síntese estimado de cada capítulo (modelo de fala medido)
+    estimativas = {
+        numero: modelo.estimar_renderizacao([len(p) for p in paragrafos if p.strip()], concorrencia)
+        for numero, _, paragrafos, _ in fila
+    }
+    audio = sum(modelo.estimar_duracao(p, voz_id, taxa_str)
+                for _, _, paragrafos, _ in fila for p in paragrafos)
+    print(f"⏳ Estimativa: {audio / 3600:.1f} h de áudio, "
+          f"~{sum(estimativas.values()) / 60:.0f} min de renderização\n")
+
+    def submeter(ordem, paragrafos):
+        # Prioridade: capítulo atual antes do seguinte, parágrafos em ordem
+        return [
+            servico.sintetizar(p, voz_id, taxa_str, prioridade=ordem * 100000 + i) if p.strip() else None
+            for i, p in enumerate(paragrafos)
+        ]
+
+    total = len(fila)
+    inicio_execucao = time.time()
+    em_andamento = deque()  # (numero, titulo, paragrafos, hash, futuros)
+    ordem = 0
+
+    try:
+        while fila or em_andamento:
+            # Manter capítulos seguintes já sendo sintetizados (sem pausa entre capítulos):
+            # pelo menos o próximo, e mais enquanto a síntese pendente estimada for curta
+            while fila and (len(em_andamento) < 2 or (
+                    len(em_andamento) < MAX_CAPITULOS_EM_ANDAMENTO
+                    and sum(estimativas[item[0]] for item in em_andamento) < JANELA_RENDERIZACAO)):
+                numero, titulo, paragrafos, hash_conteudo = fila.popleft()
+                em_andamento.append((numero, titulo, paragrafos, hash_conteudo,
+                                     submeter(ordem, paragrafos)))
+                ordem += 1
+
+            numero, titulo, paragrafos, hash_conteudo, futuros = em_andamento.popleft()
+            inicio_cap = time.time()
+            arquivos = []
+            falhou = False
+
+            for i, futuro in enumerate(futuros):
+                if futuro is None:
+                    arquivos.append(None)
+                    continue
+                for tentativa in range(1, tentativas + 1):
+                    try:
+                        arquivos.append(futuro.result())
+                        break
+                    except Exception as e:
+                        if tentativa == tentativas:
+                            print(f"   ❌ Parágrafo {i + 1}: {e}")
+                            falhou = True
+                            break
+                        time.sleep(2 ** tentativa)
+                        futuro = servico.sintetizar(paragrafos[i], voz_id, taxa_str, prioridade=0)
+                if falhou:
+                    break
+
+            if falhou:
+                for futuro in futuros:
+                    if futuro:
+                        futuro.cancel()
+                diario.registrar(numero, 'erro', hash_conteudo)
+                print(f"❌ Capítulo {numero} não renderizado (será refeito na próxima execução)")
+                continue
+
+            sidecar = renderizados.gravar(numero, titulo, paragrafos, arquivos)
+            diario.registrar(numero, 'ok', hash_conteudo, duracao=sidecar['duracao_total'])
+
+            feitos = total - len(fila) - len(em_andamento)
+            minutos = sidecar['duracao_total'] / 60
+            restante = sum(estimativas[item[0]] for item in list(fila) + list(em_andamento))
+            print(f"✓ [{feitos}/{total}] Capítulo {numero}: {len(paragrafos)} parágrafos, "
+                  f"{minutos:.1f} min de áudio em {time.time() - inicio_cap:.1f}s "
+                  f"(~{restante / 60:.0f} min restantes)")
+
+    except KeyboardInterrupt:
+        print("\n\n⏸️ Renderização interrompida. Execute novamente para continuar.")
+        for *_, futuros in em_andamento:
+            for futuro in futuros:
+                if futuro:
+                    futuro.cancel()
+    finally:
+        servico.finalizar()
+
+    print(f"\n⏱️ Tempo total: {(time.time() - inicio_execucao) / 60:.1f} min")
+
+
+def main():
+    """Função principal para uso via CLI"""
+    parser = argparse.ArgumentParser(description='Renderiza capítulos para áudio antes de ouvir')
+    parser.add_argument('inicio', type=int, help='Primeiro capítulo')
+    parser.add_argument('fim', type=int, nargs='?', help='Último capítulo (padrão: igual ao início)')
+    parser.add_argument('--novel', type=str, default='./novels/martial_world', help='Pasta da novel')
+    parser.add_argument('--voz', type=str, default='Francisca', choices=list(EngineNarracao.VOZES))
+    parser.add_argument('--taxa', type=int, default=0, help='Velocidade em %% (-50 a +50)')
+    parser.add_argument('--concorrencia', type=int, default=4, help='Sínteses simultâneas')
+
+    args = parser.parse_args()
+
+    renderizar_capitulos(
+        args.novel,
+        args.inicio,
+        args.fim if args.fim is not None else args.inicio,
+        args.voz,
+        args.taxa,
+        args.concorrencia
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Análise de Diálogos da Novel
+Segmenta todos os capítulos uma vez (narração, diálogo e personagem) em
+processos paralelos e grava o índice de segmentos de cada capítulo
+Uso: python src/analise_dialogos.py [INICIO FIM] [--novel PASTA] [--processos N] [--forcar]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from leitor import LeitorNovel
+from indice_segmentos import IndiceSegmentos
+
+
+def segmentar_capitulo(paragrafos: List[str]) -> List[List]:
+    """
+    Segmenta os parágrafos de um capítulo (executado nos processos de trabalho).
+
+    Returns:
+        Um registro [crc32, segmentos] por parágrafo
+    """
+    return [
+        [IndiceSegmentos.assinatura(texto), LeitorNovel.localizar_segmentos(texto)]
+        for texto in paragrafos
+    ]
+
+
+def analisar_novel(caminho_novel: str, inicio: Optional[int] = None, fim: Optional[int] = None,
+                   processos: Optional[int] = None, forcar: bool = False) -> Dict:
+    """
+    Gera o índice de segmentos dos capítulos de uma novel.
+
+    Capítulos com índice em dia (mesmas regras e mesmos parágrafos) são
+    pulados. As aparições dos personagens encontrados vão para a wiki.
+
+    Args:
+        caminho_novel: Pasta da novel
+        inicio: Primeiro capítulo (padrão: o primeiro disponível)
+        fim: Último capítulo, inclusivo (padrão: o último disponível)
+        processos: Processos de trabalho (padrão: número de CPUs)
+        forcar: Refazer mesmo capítulos já indexados
+
+    Returns:
+        Resumo com 'analisados', 'pulados' e 'segmentos'
+    """
+    leitor = LeitorNovel(caminho_novel)
+    numeros = [
+        n for n in leitor.listar_capitulos_disponiveis()
+        if (inicio is None or n >= inicio) and (fim is None or n <= fim)
+    ]
+    processos = processos or os.cpu_count() or 1
+    resumo = {'analisados': 0, 'pulados': 0, 'segmentos': 0}
+
+    def pendentes():
+        for numero in numeros:
+            capitulo = leitor.carregar_capitulo(numero)
+            if not capitulo:
+                continue
+            paragrafos = capitulo.get('conteudo', [])
+            if not forcar and leitor.segmentos.atualizado(numero, paragrafos):
+                resumo['pulados'] += 1
+                continue
+            yield numero, paragrafos
+
+    print(f"\n🔎 Analisando {len(numeros)} capítulos com {processos} processos...")
+    inicio_execucao = time.time()
+
+    fila = pendentes()
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        em_andamento = {}
+
+        def submeter():
+            # Poucos capítulos por processo em memória de cada vez
+            while len(em_andamento) < processos * 4:
+                proximo = next(fila, None)
+                if proximo is None:
+                    return
+                numero, paragrafos = proximo
+                em_andamento[executor.submit(segmentar_capitulo, paragrafos)] = numero
+
+        submeter()
+        while em_andamento:
+            concluidos, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                numero = em_andamento.pop(futuro)
+                registros = futuro.result()
+                leitor.segmentos.gravar(numero, registros)
+
+                for _, segmentos in registros:
+                    resumo['segmentos'] += len(segmentos)
+                    for segmento in segmentos:
+                        if segmento[0] == 'd':
+                            leitor.wiki.registrar_aparicao(segmento[3], numero)
+
+                resumo['analisados'] += 1
+                if resumo['analisados'] % 100 == 0:
+                    print(f"   ✓ {resumo['analisados']} capítulos analisados")
+            submeter()
+
+    leitor.wiki.descarregar()
+
+    print(f"✅ {resumo['analisados']} analisados, {resumo['pulados']} já em dia, "
+          f"{resumo['segmentos']} segmentos em {time.time() - inicio_execucao:.1f}s")
+    return resumo
+
+
+def main():
+    """Função principal para uso via CLI"""
+    parser = argparse.ArgumentParser(description='Segmenta diálogos de todos os capítulos')
+    parser.add_argument('inicio', type=int, nargs='?', help='Primeiro capítulo')
+    parser.add_argument('fim', type=int, nargs='?', help='Último capítulo')
+    parser.add_argument('--novel', type=str, default='./novels/martial_world', help='Pasta da novel')
+    parser.add_argument('--processos', type=int, default=None, help='Processos de trabalho')
+    parser.add_argument('--forcar', action='store_true', help='Refazer capítulos já indexados')
+
+    args = parser.parse_args()
+
+    analisar_novel(args.novel, args.inicio, args.fim, args.processos, args.forcar)
+
+
+if __name__ == "__main__":
+    main()
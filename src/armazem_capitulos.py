@@ -0,0 +1,401 @@
+"""
+Armazém Compacto de Capítulos
+Guarda a novel inteira em um arquivo de dados append-only com índice de offsets
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional
+
+
+class ArmazemCapitulos:
+    """
+    Armazém de capítulos em dois arquivos dentro da pasta da novel.
+
+    - capitulos.dat: registros de capítulo gravados sempre no fim do arquivo.
+      Cada capítulo é [qtd_paragrafos][metadados][parágrafo 1]...[parágrafo N],
+      e cada item é um registro [flag][tamanho][bytes] com compressão zlib
+      opcional (só é usada quando reduz o tamanho).
+    - capitulos.idx: entradas fixas (numero, offset, tamanho, gravado em ns).
+      Regravar um capítulo só acrescenta uma nova entrada; a última vence.
+      O instante da gravação permite ao leitor preferir um cap_NNNN.json
+      mais novo (ex: reextraído depois da importação).
+
+    A leitura é feita por mmap, então carregar um capítulo custa uma busca no
+    dicionário do índice mais a decodificação só dos bytes daquele capítulo.
+    """
+
+    ARQUIVO_DADOS = 'capitulos.dat'
+    ARQUIVO_INDICE = 'capitulos.idx'
+
+    MAGICO_DADOS = b'NRCAPDAT'
+    MAGICO_INDICE = b'NRCAPIDX'
+    VERSAO = 2
+    VERSOES_LIDAS = (1, 2)  # Versão 1: índice sem o instante da gravação
+
+    _CABECALHO = struct.Struct('<8sH')
+    _ENTRADAS = {
+        1: struct.Struct('<IQI'),  # numero, offset, tamanho
+        2: struct.Struct('<IQIQ')  # numero, offset, tamanho, gravado (time_ns)
+    }
+    _REGISTRO = struct.Struct('<BI')  # flag, tamanho
+    _CONTAGEM = struct.Struct('<I')
+
+    FLAG_COMPRIMIDO = 0x01
+
+    def __init__(self, caminho_novel: str, comprimir: bool = True):
+        """
+        Abre (ou cria) o armazém de uma novel.
+
+        Args:
+            caminho_novel: Pasta da novel
+            comprimir: Comprimir registros novos com zlib quando compensar
+        """
+        self.caminho_novel = caminho_novel
+        self.caminho_dados = os.path.join(caminho_novel, self.ARQUIVO_DADOS)
+        self.caminho_indice = os.path.join(caminho_novel, self.ARQUIVO_INDICE)
+        self.comprimir = comprimir
+        self.lock = threading.Lock()
+
+        self.indice = {}  # {numero: (offset, tamanho)}
+        self.gravados = {}  # {numero: instante da gravação em ns}
+        self._mapa = None
+        self._tamanho_mapa = 0
+        self._arquivo_leitura = None
+
+        os.makedirs(caminho_novel, exist_ok=True)
+        self._preparar_arquivo(self.caminho_dados, self.MAGICO_DADOS)
+        self.versao_indice = self._preparar_arquivo(self.caminho_indice, self.MAGICO_INDICE)
+        self._entrada = self._ENTRADAS[self.versao_indice]
+        self._carregar_indice()
+
+    @classmethod
+    def existe(cls, caminho_novel: str) -> bool:
+        """Indica se a novel já tem um armazém compacto."""
+        return (os.path.exists(os.path.join(caminho_novel, cls.ARQUIVO_DADOS)) and
+                os.path.exists(os.path.join(caminho_novel, cls.ARQUIVO_INDICE)))
+
+    def _preparar_arquivo(self, caminho: str, magico: bytes) -> int:
+        """Cria o arquivo com cabeçalho ou valida o cabeçalho existente. Retorna a versão."""
+        if not os.path.exists(caminho) or os.path.getsize(caminho) == 0:
+            with open(caminho, 'wb') as f:
+                f.write(self._CABECALHO.pack(magico, self.VERSAO))
+            return self.VERSAO
+
+        with open(caminho, 'rb') as f:
+            cabecalho = f.read(self._CABECALHO.size)
+        if len(cabecalho) < self._CABECALHO.size:
+            raise ValueError(f"Arquivo corrompido: {caminho}")
+        magico_lido, versao = self._CABECALHO.unpack(cabecalho)
+        if magico_lido != magico or versao not in self.VERSOES_LIDAS:
+            raise ValueError(f"Formato não reconhecido: {caminho}")
+        return versao
+
+    def _carregar_indice(self):
+        """Lê o índice inteiro para memória (última entrada de cada capítulo vence)."""
+        tamanho_dados = os.path.getsize(self.caminho_dados)
+
+        with open(self.caminho_indice, 'rb') as f:
+            f.seek(self._CABECALHO.size)
+            bruto = f.read()
+
+        # Versão 1 não guarda o instante: vale o da última gravação do índice
+        gravado_indice = os.stat(self.caminho_indice).st_mtime_ns
+
+        # Ignora uma entrada final incompleta (gravação interrompida)
+        util = len(bruto) - len(bruto) % self._entrada.size
+        for numero, offset, tamanho, *gravado in self._entrada.iter_unpack(bruto[:util]):
+            if offset + tamanho <= tamanho_dados:
+                self.indice[numero] = (offset, tamanho)
+                self.gravados[numero] = gravado[0] if gravado else gravado_indice
+
+    def _mapear(self, tamanho_necessario: int):
+        """Garante um mmap cobrindo pelo menos tamanho_necessario bytes (chamar com lock)."""
+        if self._mapa is not None and self._tamanho_mapa >= tamanho_necessario:
+            return
+
+        if self._mapa is not None:
+            self._mapa.close()
+        if self._arquivo_leitura is None:
+            self._arquivo_leitura = open(self.caminho_dados, 'rb')
+
+        self._tamanho_mapa = os.path.getsize(self.caminho_dados)
+        self._mapa = mmap.mmap(self._arquivo_leitura.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # ------------------------------------------------------------------
+    # Registros
+    # ------------------------------------------------------------------
+
+    def _codificar_registro(self, dados: bytes) -> bytes:
+        flag = 0
+        if self.comprimir and len(dados) > 64:
+            comprimido = zlib.compress(dados, 6)
+            if len(comprimido) < len(dados):
+                dados = comprimido
+                flag = self.FLAG_COMPRIMIDO
+        return self._REGISTRO.pack(flag, len(dados)) + dados
+
+    def _ler_registro(self, buffer, pos: int):
+        flag, tamanho = self._REGISTRO.unpack_from(buffer, pos)
+        inicio = pos + self._REGISTRO.size
+        dados = bytes(buffer[inicio:inicio + tamanho])
+        if flag & self.FLAG_COMPRIMIDO:
+            dados = zlib.decompress(dados)
+        return dados.decode('utf-8'), inicio + tamanho
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    def adicionar(self, dados_capitulo: Dict, gravado: Optional[int] = None):
+        """
+        Acrescenta um capítulo ao armazém (substitui uma versão anterior).
+
+        Args:
+            dados_capitulo: Dicionário no mesmo formato dos arquivos cap_NNNN.json
+            gravado: Instante da versão em ns (padrão: agora; compactar() preserva o original)
+        """
+        numero = int(dados_capitulo.get('numero', 0))
+        conteudo = dados_capitulo.get('conteudo', [])
+        metadados = {k: v for k, v in dados_capitulo.items() if k != 'conteudo'}
+
+        partes = [
+            self._CONTAGEM.pack(len(conteudo)),
+            self._codificar_registro(
+                json.dumps(metadados, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            ),
+        ]
+        for paragrafo in conteudo:
+            partes.append(self._codificar_registro(paragrafo.encode('utf-8')))
+        registro = b''.join(partes)
+
+        with self.lock:
+            # Dados primeiro, índice depois: uma queda no meio nunca aponta para lixo
+            with open(self.caminho_dados, 'ab') as f:
+                offset = f.tell()
+                f.write(registro)
+                f.flush()
+                os.fsync(f.fileno())
+
+            gravado = gravado or time.time_ns()
+            if self.versao_indice == 1:
+                entrada = self._entrada.pack(numero, offset, len(registro))
+            else:
+                entrada = self._entrada.pack(numero, offset, len(registro), gravado)
+            with open(self.caminho_indice, 'ab') as f:
+                f.write(entrada)
+
+            self.indice[numero] = (offset, len(registro))
+            self.gravados[numero] = gravado
+
+    def obter(self, numero: int) -> Optional[Dict]:
+        """
+        Lê um capítulo.
+
+        Args:
+            numero: Número do capítulo
+
+        Returns:
+            Dicionário do capítulo (com 'conteudo') ou None se não existir
+        """
+        with self.lock:
+            entrada = self.indice.get(numero)
+            if entrada is None:
+                return None
+            offset, tamanho = entrada
+            self._mapear(offset + tamanho)
+            trecho = self._mapa[offset:offset + tamanho]
+
+        quantidade = self._CONTAGEM.unpack_from(trecho, 0)[0]
+        meta_json, pos = self._ler_registro(trecho, self._CONTAGEM.size)
+        capitulo = json.loads(meta_json)
+
+        conteudo = []
+        for _ in range(quantidade):
+            paragrafo, pos = self._ler_registro(trecho, pos)
+            conteudo.append(paragrafo)
+        capitulo['conteudo'] = conteudo
+        return capitulo
+
+    def gravado_em(self, numero: int) -> Optional[int]:
+        """Instante (ns, como st_mtime_ns) em que o capítulo foi gravado, ou None."""
+        with self.lock:
+            return self.gravados.get(numero)
+
+    def mais_recente_que(self, numero: int, caminho_json: Optional[str]) -> bool:
+        """
+        Indica se a versão do armazém deve ser usada em vez do JSON.
+
+        Args:
+            numero: Número do capítulo
+            caminho_json: cap_NNNN.json do mesmo capítulo (None se não existe)
+
+        Returns:
+            True se o capítulo está no armazém e o JSON não é mais novo que ele
+        """
+        gravado = self.gravado_em(numero)
+        if gravado is None:
+            return False
+        if caminho_json is None:
+            return True
+        try:
+            return os.stat(caminho_json).st_mtime_ns <= gravado
+        except OSError:
+            return True
+
+    def numeros(self) -> List[int]:
+        """Lista os números de capítulos guardados, em ordem."""
+        with self.lock:
+            return sorted(self.indice)
+
+    def __contains__(self, numero: int) -> bool:
+        return numero in self.indice
+
+    def __len__(self) -> int:
+        return len(self.indice)
+
+    def fechar(self):
+        """Libera o mmap e o arquivo de leitura."""
+        with self.lock:
+            if self._mapa is not None:
+                self._mapa.close()
+                self._mapa = None
+                self._tamanho_mapa = 0
+            if self._arquivo_leitura is not None:
+                self._arquivo_leitura.close()
+                self._arquivo_leitura = None
+
+    # ------------------------------------------------------------------
+    # Importação / exportação da estrutura de pastas
+    # ------------------------------------------------------------------
+
+    def importar_pasta(self, pasta_capitulos: Optional[str] = None, substituir: bool = False) -> int:
+        """
+        Importa os arquivos cap_NNNN.json de uma pasta.
+
+        Args:
+            pasta_capitulos: Pasta com os JSONs (padrão: <novel>/capitulos)
+            substituir: Regravar capítulos que já estão no armazém mesmo
+                        quando o JSON não é mais novo
+
+        Returns:
+            Quantidade de capítulos importados
+        """
+        pasta = pasta_capitulos or os.path.join(self.caminho_novel, 'capitulos')
+        if not os.path.isdir(pasta):
+            print(f"⚠️ Pasta não encontrada: {pasta}")
+            return 0
+
+        importados = 0
+        for arquivo in sorted(os.listdir(pasta)):
+            if not (arquivo.startswith('cap_') and arquivo.endswith('.json')):
+                continue
+
+            try:
+                with open(os.path.join(pasta, arquivo), 'r', encoding='utf-8') as f:
+                    capitulo = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"❌ Erro ao ler {arquivo}: {e}")
+                continue
+
+            if 'numero' not in capitulo:
+                capitulo['numero'] = int(arquivo[4:-5])
+            # Já importado: só regrava se o JSON for mais novo (ex: reextraído)
+            if (not substituir and
+                    self.mais_recente_que(capitulo['numero'], os.path.join(pasta, arquivo))):
+                continue
+
+            self.adicionar(capitulo)
+            importados += 1
+
+        print(f"✓ {importados} capítulos importados para {self.ARQUIVO_DADOS}")
+        return importados
+
+    def exportar_pasta(self, pasta_destino: Optional[str] = None) -> int:
+        """
+        Exporta o armazém de volta para arquivos cap_NNNN.json.
+
+        Args:
+            pasta_destino: Pasta de saída (padrão: <novel>/capitulos)
+
+        Returns:
+            Quantidade de capítulos exportados
+        """
+        pasta = pasta_destino or os.path.join(self.caminho_novel, 'capitulos')
+        os.makedirs(pasta, exist_ok=True)
+
+        exportados = 0
+        for numero in self.numeros():
+            capitulo = self.obter(numero)
+            caminho = os.path.join(pasta, f"cap_{numero:04d}.json")
+            with open(caminho, 'w', encoding='utf-8') as f:
+                json.dump(capitulo, f, ensure_ascii=False, indent=2)
+            exportados += 1
+
+        print(f"✓ {exportados} capítulos exportados para {pasta}")
+        return exportados
+
+    def compactar(self):
+        """Regrava o armazém sem as versões antigas de capítulos substituídos."""
+        capitulos = [(self.obter(numero), self.gravados[numero]) for numero in self.numeros()]
+        self.fechar()
+
+        for caminho in (self.caminho_dados, self.caminho_indice):
+            os.replace(caminho, caminho + '.bak')
+        try:
+            self.indice = {}
+            self.gravados = {}
+            self._preparar_arquivo(self.caminho_dados, self.MAGICO_DADOS)
+            self.versao_indice = self._preparar_arquivo(self.caminho_indice, self.MAGICO_INDICE)
+            self._entrada = self._ENTRADAS[self.versao_indice]
+            for capitulo, gravado in capitulos:
+                self.adicionar(capitulo, gravado)
+        except BaseException:
+            for caminho in (self.caminho_dados, self.caminho_indice):
+                os.replace(caminho + '.bak', caminho)
+            raise
+
+        for caminho in (self.caminho_dados, self.caminho_indice):
+            os.remove(caminho + '.bak')
+
+
+def _tamanho_pasta(pasta: str) -> int:
+    total = 0
+    if os.path.isdir(pasta):
+        for entrada in os.scandir(pasta):
+            if entrada.is_file():
+                total += entrada.stat().st_size
+    return total
+
+
+# Uso via linha de comando
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ('importar', 'exportar', 'compactar'):
+        print("Uso:")
+        print("  python src/armazem_capitulos.py importar  ./novels/martial_world")
+        print("  python src/armazem_capitulos.py exportar  ./novels/martial_world [pasta_destino]")
+        print("  python src/armazem_capitulos.py compactar ./novels/martial_world")
+        sys.exit(1)
+
+    comando, caminho_novel = sys.argv[1], sys.argv[2]
+    armazem = ArmazemCapitulos(caminho_novel)
+
+    if comando == 'importar':
+        armazem.importar_pasta()
+        tamanho_json = _tamanho_pasta(os.path.join(caminho_novel, 'capitulos'))
+        tamanho_armazem = (os.path.getsize(armazem.caminho_dados) +
+                           os.path.getsize(armazem.caminho_indice))
+        print(f"📦 JSON: {tamanho_json / 1024:.0f} KB → armazém: {tamanho_armazem / 1024:.0f} KB")
+    elif comando == 'exportar':
+        armazem.exportar_pasta(sys.argv[3] if len(sys.argv) > 3 else None)
+    else:
+        armazem.compactar()
+        print(f"✓ Armazém compactado ({len(armazem)} capítulos)")
+
+    armazem.fechar()
@@ -0,0 +1,114 @@
+"""
+Divisor de Frases
+Quebra parágrafos longos em frases para sintetizar e tocar por partes,
+respeitando diálogos entre aspas, travessões e abreviações do português
+"""
+
+import re
+from bisect import bisect_right
+from typing import List, Tuple
+
+from leitor import LeitorNovel
+
+
+# Pontuação final (com aspas/parênteses de fechamento) seguida de espaço
+FIM_FRASE = re.compile(r'[.!?…]+["”»\')]*(\s+)')
+
+# Palavras que terminam em ponto sem encerrar a frase
+ABREVIACOES = {
+    'sr', 'sra', 'srta', 'dr', 'dra', 'prof', 'profa', 'sto', 'sta', 'exa',
+    'exmo', 'exma', 'cap', 'pág', 'pag', 'nº', 'no', 'vol', 'séc', 'gen', 'cel'
+}
+
+ABERTURAS = '"“«\''
+TRAVESSOES = '—–'
+
+
+def _abreviacao(texto: str, ponto: int) -> bool:
+    """Indica se o ponto em texto[ponto] fecha uma abreviação (Sr., Dra., J.)."""
+    if texto[ponto] != '.':
+        return False
+    palavra = re.search(r'(\w+)$', texto[max(0, ponto - 12):ponto])
+    if not palavra:
+        return False
+    palavra = palavra.group(1)
+    return palavra.lower() in ABREVIACOES or (len(palavra) == 1 and palavra.isupper())
+
+
+def _inicia_frase(texto: str, posicao: int) -> bool:
+    """A partir de posicao começa uma frase nova (maiúscula, número ou fala nova)?"""
+    caractere = texto[posicao]
+    if caractere in TRAVESSOES:
+        # "— disse ele" continua a fala anterior; "— Vamos!" é fala nova
+        fala = LeitorNovel.PADRAO_TRAVESSAO.match(texto, posicao)
+        caractere = fala.group(1)[:1] if fala else ''
+    elif caractere in ABERTURAS:
+        caractere = texto[posicao + 1:posicao + 2]
+    return caractere.isupper() or caractere.isdigit()
+
+
+def localizar_frases(texto: str, minimo: int = 40, maximo_protegido: int = 400) -> List[Tuple[int, int]]:
+    """
+    Localiza as frases de um texto (offsets, sem copiar).
+
+    Não corta dentro de diálogos entre aspas (os mesmos de
+    LeitorNovel.PADRAO_ASPAS, incluindo o "disse fulano" que os segue),
+    a não ser que o diálogo passe de maximo_protegido caracteres.
+
+    Args:
+        texto: Parágrafo
+        minimo: Frases mais curtas que isso são juntadas à seguinte
+        maximo_protegido: Tamanho máximo de um diálogo mantido inteiro
+
+    Returns:
+        Lista de (inicio, fim) cobrindo o texto sem os espaços das bordas
+    """
+    protegidos = [
+        match.span() for match in LeitorNovel.PADRAO_ASPAS.finditer(texto)
+        if match.end() - match.start() <= maximo_protegido
+    ]
+    inicios_protegidos = [inicio for inicio, _ in protegidos]
+
+    def protegido(posicao: int) -> bool:
+        i = bisect_right(inicios_protegidos, posicao) - 1
+        return i >= 0 and protegidos[i][0] < posicao < protegidos[i][1]
+
+    frases = []
+    inicio = len(texto) - len(texto.lstrip())
+    for match in FIM_FRASE.finditer(texto):
+        fim, proximo = match.start(1), match.end()
+        if proximo >= len(texto):
+            break
+        if _abreviacao(texto, match.start()) or not _inicia_frase(texto, proximo) or protegido(fim):
+            continue
+        frases.append((inicio, fim))
+        inicio = proximo
+    fim_texto = len(texto.rstrip())
+    if inicio < fim_texto:
+        frases.append((inicio, fim_texto))
+
+    # Juntar frases curtas à seguinte (a última curta vai para a anterior)
+    agrupadas = []
+    for inicio, fim in frases:
+        if agrupadas and agrupadas[-1][1] - agrupadas[-1][0] < minimo:
+            agrupadas[-1] = (agrupadas[-1][0], fim)
+        else:
+            agrupadas.append((inicio, fim))
+    if len(agrupadas) > 1 and agrupadas[-1][1] - agrupadas[-1][0] < minimo:
+        ultima = agrupadas.pop()
+        agrupadas[-1] = (agrupadas[-1][0], ultima[1])
+    return agrupadas
+
+
+def dividir_frases(texto: str, minimo: int = 40) -> List[str]:
+    """
+    Divide um parágrafo em frases.
+
+    Args:
+        texto: Parágrafo
+        minimo: Frases mais curtas que isso são juntadas à seguinte
+
+    Returns:
+        Lista de frases (o parágrafo inteiro se não houver onde cortar)
+    """
+    return [texto[inicio:fim] for inicio, fim in localizar_frases(texto, minimo)] or [texto]
@@ -110,6 +110,47 @@ class GerenciadorVozes:
         """
         return self.mapeamento_personagens.get(nome_personagem)
     
+    def obter_voz_edge(self, voz_config: Optional[Dict], padrao: str) -> str:
+        """
+        Resolve a voz do Edge TTS de uma configuração de voz.
+        
+        Usa o campo 'voz_edge' da própria configuração ou, para personagens,
+        o da voz referenciada por 'voz_id' em vozes_disponiveis.
+        
+        Args:
+            voz_config: Configuração de voz (de personagem ou do narrador)
+            padrao: Voz usada quando a configuração não define uma voz do Edge
+            
+        Returns:
+            ID da voz do Edge TTS (ex: pt-BR-AntonioNeural)
+        """
+        if not voz_config:
+            return padrao
+        if voz_config.get('voz_edge'):
+            return voz_config['voz_edge']
+        
+        voz_id = voz_config.get('voz_id')
+        for voz in self.vozes_disponiveis:
+            if voz_id and voz.get('id') == voz_id:
+                return voz.get('voz_edge') or padrao
+        return padrao
+    
+    def ganhos_voz_edge(self) -> Dict[str, float]:
+        """
+        Ganho de volume por voz do Edge TTS.
+        
+        Vozes diferentes saem do TTS com volumes diferentes; o campo opcional
+        'ganho_db' de cada voz em vozes_disponiveis iguala o volume na reprodução.
+        
+        Returns:
+            Dicionário {voz_edge: ganho em dB}
+        """
+        return {
+            voz['voz_edge']: float(voz['ganho_db'])
+            for voz in self.vozes_disponiveis
+            if voz.get('voz_edge') and voz.get('ganho_db')
+        }
+    
     def obter_voz_narrador(self) -> Dict:
         """
         Obtém a configuração da voz do narrador padrão.
@@ -0,0 +1,119 @@
+"""
+Índice de Segmentos
+Narrações e diálogos de cada parágrafo, já separados e com o personagem,
+gravados por capítulo para consulta direta
+"""
+
+import json
+import os
+import threading
+import zlib
+from typing import List, Optional
+
+
+class IndiceSegmentos:
+    """
+    Segmentação persistida em <novel>/segmentos/cap_NNNN.json.
+
+    Cada parágrafo vira um registro compacto [crc32 do texto, segmentos],
+    e cada segmento é [tipo, inicio, fim] para narração ('n') ou
+    [tipo, inicio, fim, personagem] para diálogo ('d'), com os offsets no
+    texto do parágrafo. O crc32 detecta parágrafos alterados depois da
+    análise; a versão identifica as regras de segmentação que geraram o
+    arquivo, então mudar os padrões invalida o índice inteiro.
+    """
+
+    PASTA = 'segmentos'
+
+    def __init__(self, caminho_novel: str, versao: str):
+        """
+        Args:
+            caminho_novel: Pasta da novel
+            versao: Identificador das regras de segmentação em uso
+        """
+        self.pasta = os.path.join(caminho_novel, self.PASTA)
+        self.versao = versao
+        self.lock = threading.Lock()
+        self._capitulos = {}  # {numero: (mtime, paragrafos)}
+
+    @staticmethod
+    def assinatura(texto: str) -> int:
+        """Checksum do parágrafo (detecta textos alterados)."""
+        return zlib.crc32(texto.encode('utf-8'))
+
+    def caminho(self, numero: int) -> str:
+        return os.path.join(self.pasta, f"cap_{numero:04d}.json")
+
+    def gravar(self, numero: int, paragrafos: List[List]):
+        """
+        Grava a segmentação de um capítulo.
+
+        Args:
+            numero: Número do capítulo
+            paragrafos: Um registro [crc32, segmentos] por parágrafo
+        """
+        os.makedirs(self.pasta, exist_ok=True)
+        caminho = self.caminho(numero)
+        temp = caminho + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump({'versao': self.versao, 'numero': numero, 'paragrafos': paragrafos},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp, caminho)
+
+        with self.lock:
+            self._capitulos.pop(numero, None)
+
+    def obter(self, numero: int) -> Optional[List[List]]:
+        """Lê (com cache) os registros de um capítulo, ou None se não houver índice válido."""
+        caminho = self.caminho(numero)
+        try:
+            mtime = os.stat(caminho).st_mtime_ns
+        except OSError:
+            return None
+
+        with self.lock:
+            em_cache = self._capitulos.get(numero)
+            if em_cache and em_cache[0] == mtime:
+                return em_cache[1]
+
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if dados.get('versao') != self.versao:
+            return None
+
+        paragrafos = dados.get('paragrafos', [])
+        with self.lock:
+            self._capitulos[numero] = (mtime, paragrafos)
+        return paragrafos
+
+    def segmentos_paragrafo(self, numero: int, indice: int, texto: str) -> Optional[List[List]]:
+        """
+        Registros de segmentos de um parágrafo.
+
+        Args:
+            numero: Número do capítulo
+            indice: Índice do parágrafo (0-based)
+            texto: Texto atual do parágrafo
+
+        Returns:
+            Lista de segmentos ou None se o parágrafo não está indexado
+            (ou mudou desde a análise)
+        """
+        paragrafos = self.obter(numero)
+        if not paragrafos or not 0 <= indice < len(paragrafos):
+            return None
+        crc, segmentos = paragrafos[indice]
+        if crc != self.assinatura(texto):
+            return None
+        return segmentos
+
+    def atualizado(self, numero: int, paragrafos: List[str]) -> bool:
+        """Indica se o índice do capítulo corresponde aos parágrafos informados."""
+        registros = self.obter(numero)
+        if registros is None or len(registros) != len(paragrafos):
+            return False
+        return all(crc == self.assinatura(texto)
+                   for (crc, _), texto in zip(registros, paragrafos))
@@ -3,15 +3,30 @@ Leitor e Narrador de Novels com TTS
 Lê capítulos e narra com vozes diferenciadas
 """
 
+import hashlib
 import json
 import os
 import re
 from typing import Dict, List, Optional
 from gerenciador_vozes import GerenciadorVozes
 from wiki_personagens import WikiPersonagens
+from armazem_capitulos import ArmazemCapitulos
+from manifesto_capitulos import ManifestoCapitulos
+from indice_segmentos import IndiceSegmentos
 
 
 class LeitorNovel:
+    # Padrões comuns de diálogo
+    # Exemplo: "Fala do personagem" disse João
+    # Exemplo: — Fala do personagem — disse Maria
+    PADRAO_ASPAS = re.compile(r'"([^"]+)"(?:\s+(?:disse|perguntou|gritou|sussurrou)\s+(\w+))?')
+    PADRAO_TRAVESSAO = re.compile(
+        r'[—–]\s*([^—–\n]+?)(?:\s+[—–]\s+(?:disse|perguntou|gritou|sussurrou)\s+(\w+))?'
+    )
+    
+    # Muda quando os padrões mudam (invalida o índice de segmentos)
+    VERSAO_SEGMENTACAO = hashlib.sha1(PADRAO_ASPAS.pattern.encode('utf-8')).hexdigest()[:12]
+    
     def __init__(self, caminho_novel: str):
         """
         Inicializa o leitor de novel.
@@ -22,7 +37,24 @@ class LeitorNovel:
         self.caminho_novel = caminho_novel
         self.metadata = self._carregar_metadata()
         self.gerenciador_vozes = GerenciadorVozes()
-        self.wiki = WikiPersonagens(caminho_novel)
+        # Novels longas ligam "aparicoes_sqlite" no metadata.json (aparições indexadas em SQLite)
+        self.wiki = WikiPersonagens(
+            caminho_novel, usar_sqlite=bool(self.metadata.get('aparicoes_sqlite', False))
+        )
+        
+        # Armazém compacto (capitulos.dat/.idx), se a novel já foi importada
+        self.armazem = None
+        if ArmazemCapitulos.existe(caminho_novel):
+            try:
+                self.armazem = ArmazemCapitulos(caminho_novel)
+            except ValueError as e:
+                print(f"⚠️ Armazém de capítulos ignorado: {e}")
+        
+        # Índice persistido dos capítulos (evita varrer a pasta a cada listagem)
+        self.manifesto = ManifestoCapitulos(caminho_novel, self.armazem)
+        
+        # Segmentação pré-calculada (ver analise_dialogos.py)
+        self.segmentos = IndiceSegmentos(caminho_novel, self.VERSAO_SEGMENTACAO)
         
         # Estado da leitura
         self.capitulo_atual = 0
@@ -47,78 +79,135 @@ class LeitorNovel:
             Dicionário com dados do capítulo ou None
         """
         # Tenta com 3 dígitos primeiro, depois 4
+        caminho_capitulo = None
         for formato in [f'cap_{numero:03d}.json', f'cap_{numero:04d}.json']:
-            caminho_capitulo = os.path.join(
-                self.caminho_novel, 
-                'capitulos', 
-                formato
-            )
-            
-            if os.path.exists(caminho_capitulo):
-                with open(caminho_capitulo, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            caminho = os.path.join(self.caminho_novel, 'capitulos', formato)
+            if os.path.exists(caminho):
+                caminho_capitulo = caminho
+                break
+        
+        # Armazém compacto: busca direta pelo índice, a não ser que o JSON seja mais novo
+        if self.armazem is not None and self.armazem.mais_recente_que(numero, caminho_capitulo):
+            capitulo = self.armazem.obter(numero)
+            if capitulo:
+                return capitulo
+        
+        if caminho_capitulo:
+            with open(caminho_capitulo, 'r', encoding='utf-8') as f:
+                return json.load(f)
         
         print(f"Capítulo {numero} não encontrado")
         return None
     
-    def identificar_dialogos(self, texto: str) -> List[Dict]:
+    @classmethod
+    def localizar_segmentos(cls, texto: str) -> List[List]:
         """
-        Identifica diálogos no texto.
+        Localiza narrações e diálogos no texto sem copiar os trechos.
         
         Args:
             texto: Texto para análise
             
         Returns:
-            Lista de dicionários com diálogos e narrações
+            Registros ['n', inicio, fim] (narração) ou
+            ['d', inicio, fim, personagem] (diálogo), com offsets no texto
         """
-        segmentos = []
-        
-        # Padrões comuns de diálogo
-        # Exemplo: "Fala do personagem" disse João
-        # Exemplo: — Fala do personagem — disse Maria
-        
-        # Padrão básico: aspas duplas
-        padrao_aspas = r'"([^"]+)"(?:\s+(?:disse|perguntou|gritou|sussurrou)\s+(\w+))?'
-        
-        # Padrão travessão
-        padrao_travessao = r'[—–]\s*([^—–\n]+?)(?:\s+[—–]\s+(?:disse|perguntou|gritou|sussurrou)\s+(\w+))?'
-        
+        registros = []
         ultima_posicao = 0
         
-        # Processa o texto
-        for match in re.finditer(padrao_aspas, texto):
-            # Adiciona narração antes do diálogo
+        def narracao(inicio, fim):
+            trecho = texto[inicio:fim]
+            conteudo = trecho.strip()
+            if conteudo:
+                inicio += len(trecho) - len(trecho.lstrip())
+                registros.append(['n', inicio, inicio + len(conteudo)])
+        
+        for match in cls.PADRAO_ASPAS.finditer(texto):
+            # Narração antes do diálogo
             if match.start() > ultima_posicao:
-                narracao = texto[ultima_posicao:match.start()].strip()
-                if narracao:
-                    segmentos.append({
-                        'tipo': 'narracao',
-                        'texto': narracao
-                    })
-            
-            # Adiciona diálogo
-            dialogo = match.group(1)
-            personagem = match.group(2) if match.group(2) else 'desconhecido'
-            
-            segmentos.append({
-                'tipo': 'dialogo',
-                'texto': dialogo,
-                'personagem': personagem
-            })
+                narracao(ultima_posicao, match.start())
             
+            inicio, fim = match.span(1)
+            registros.append(['d', inicio, fim, match.group(2) or 'desconhecido'])
             ultima_posicao = match.end()
         
-        # Adiciona narração final
+        # Narração final
         if ultima_posicao < len(texto):
-            narracao = texto[ultima_posicao:].strip()
-            if narracao:
+            narracao(ultima_posicao, len(texto))
+        
+        return registros
+    
+    @staticmethod
+    def expandir_segmentos(texto: str, registros: List[List]) -> List[Dict]:
+        """Converte registros de localizar_segmentos em dicionários com o texto."""
+        segmentos = []
+        for registro in registros:
+            if registro[0] == 'n':
+                segmentos.append({'tipo': 'narracao', 'texto': texto[registro[1]:registro[2]]})
+            else:
                 segmentos.append({
-                    'tipo': 'narracao',
-                    'texto': narracao
+                    'tipo': 'dialogo',
+                    'texto': texto[registro[1]:registro[2]],
+                    'personagem': registro[3]
                 })
-        
         return segmentos
     
+    def identificar_dialogos(self, texto: str) -> List[Dict]:
+        """
+        Identifica diálogos no texto.
+        
+        Args:
+            texto: Texto para análise
+            
+        Returns:
+            Lista de dicionários com diálogos e narrações
+        """
+        return self.expandir_segmentos(texto, self.localizar_segmentos(texto))
+    
+    def _segmentos_paragrafo(self, numero: Optional[int], indice: int, texto: str) -> List[Dict]:
+        """Segmentos de um parágrafo, do índice se estiver em dia ou analisando na hora."""
+        registros = None
+        if numero is not None:
+            registros = self.segmentos.segmentos_paragrafo(numero, indice, texto)
+        if registros is None:
+            registros = self.localizar_segmentos(texto)
+        return self.expandir_segmentos(texto, registros)
+    
+    def _voz_segmento(self, segmento: Dict) -> Optional[Dict]:
+        """Configuração de voz de um segmento (narrador para falas sem voz definida)."""
+        if segmento['tipo'] == 'dialogo':
+            voz_config = self.gerenciador_vozes.obter_voz_personagem(segmento['personagem'])
+            if voz_config:
+                return voz_config
+        return self.gerenciador_vozes.obter_voz_narrador()
+    
+    def obter_segmentos_paragrafo(self, numero: Optional[int], indice: int,
+                                  texto: Optional[str] = None) -> List[Dict]:
+        """
+        Segmentos de um parágrafo com a voz de cada um.
+        
+        Com o capítulo analisado (analise_dialogos.py) a consulta é direta no
+        índice; parágrafos não indexados ou alterados são analisados na hora.
+        
+        Args:
+            numero: Número do capítulo (None: analisar o texto sem consultar o índice)
+            indice: Índice do parágrafo (0-based)
+            texto: Texto do parágrafo (se omitido, o capítulo é carregado)
+            
+        Returns:
+            Lista de segmentos com tipo, texto, personagem e voz_config
+        """
+        if texto is None:
+            capitulo = self.carregar_capitulo(numero)
+            paragrafos = capitulo.get('conteudo', []) if capitulo else []
+            if not 0 <= indice < len(paragrafos):
+                return []
+            texto = paragrafos[indice]
+        
+        return [
+            {**segmento, 'voz_config': self._voz_segmento(segmento)}
+            for segmento in self._segmentos_paragrafo(numero, indice, texto)
+        ]
+    
     def processar_capitulo(self, numero: int) -> List[Dict]:
         """
         Processa um capítulo completo, separando narrações e diálogos.
@@ -135,30 +224,22 @@ class LeitorNovel:
         
         segmentos_processados = []
         
-        for paragrafo in capitulo.get('conteudo', []):
-            segmentos = self.identificar_dialogos(paragrafo)
+        for indice, paragrafo in enumerate(capitulo.get('conteudo', [])):
+            segmentos = self._segmentos_paragrafo(numero, indice, paragrafo)
             
             for segmento in segmentos:
-                voz_config = None
-                
-                if segmento['tipo'] == 'narracao':
-                    voz_config = self.gerenciador_vozes.obter_voz_narrador()
-                else:
-                    personagem = segmento['personagem']
-                    voz_config = self.gerenciador_vozes.obter_voz_personagem(personagem)
-                    
+                if segmento['tipo'] == 'dialogo':
                     # Registra aparição do personagem
-                    self.wiki.registrar_aparicao(personagem, numero)
-                    
-                    # Se não tem voz definida, usa voz do narrador
-                    if not voz_config:
-                        voz_config = self.gerenciador_vozes.obter_voz_narrador()
+                    self.wiki.registrar_aparicao(segmento['personagem'], numero)
                 
                 segmentos_processados.append({
                     **segmento,
-                    'voz_config': voz_config
+                    'voz_config': self._voz_segmento(segmento)
                 })
         
+        # Aparições acumuladas em memória: uma gravação por capítulo
+        self.wiki.descarregar()
+        
         return segmentos_processados
     
     def narrar_capitulo(self, numero: int):
@@ -207,19 +288,8 @@ class LeitorNovel:
         Returns:
             Lista de números de capítulos
         """
-        pasta_capitulos = os.path.join(self.caminho_novel, 'capitulos')
-        if not os.path.exists(pasta_capitulos):
-            return []
-        
-        capitulos = []
-        for arquivo in os.listdir(pasta_capitulos):
-            if arquivo.startswith('cap_') and arquivo.endswith('.json'):
-                # Remove 'cap_' e '.json' e converte para int
-                numero_str = arquivo.replace('cap_', '').replace('.json', '')
-                numero = int(numero_str)
-                capitulos.append(numero)
-        
-        return sorted(capitulos)
+        self.manifesto.atualizar()
+        return self.manifesto.numeros()
 
 
 # Exemplo de uso
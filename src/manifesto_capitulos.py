@@ -0,0 +1,223 @@
+"""
+Manifesto de Capítulos
+Índice persistido dos capítulos de uma novel (título, parágrafos, palavras)
+"""
+
+import json
+import os
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from armazem_capitulos import ArmazemCapitulos
+
+
+class ManifestoCapitulos:
+    """
+    Índice dos capítulos salvo em <novel>/manifesto.json.
+
+    Cada entrada guarda número, título, quantidade de parágrafos, quantidade
+    de palavras e a versão da origem (mtime do JSON ou offset no armazém).
+    A atualização é incremental: se a pasta de capítulos (mtime, quantidade
+    de cap_*.json e o maior mtime entre eles) e o tamanho do índice do
+    armazém não mudaram, nada é lido; se mudaram, só os capítulos com versão
+    diferente são reabertos. O maior mtime pega um cap_*.json regravado no
+    lugar (ex: reextraído), que não muda o mtime da pasta.
+    """
+
+    ARQUIVO = 'manifesto.json'
+    VERSAO = 1
+
+    def __init__(self, caminho_novel: str, armazem: Optional[ArmazemCapitulos] = None):
+        """
+        Args:
+            caminho_novel: Pasta da novel
+            armazem: Armazém compacto já aberto (opcional)
+        """
+        self.caminho_novel = caminho_novel
+        self.pasta_capitulos = os.path.join(caminho_novel, 'capitulos')
+        self.caminho_arquivo = os.path.join(caminho_novel, self.ARQUIVO)
+        self.armazem = armazem
+        self.lock = threading.Lock()
+
+        self.capitulos = {}  # {numero: entrada}
+        self.assinatura = None  # Estado das origens na última atualização
+        self._somas = None  # (números em ordem, palavras do capítulo i até o fim)
+        self._carregar()
+
+    def _carregar(self):
+        """Lê o manifesto salvo, se houver e for da versão atual."""
+        if not os.path.exists(self.caminho_arquivo):
+            return
+        try:
+            with open(self.caminho_arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Manifesto ignorado: {e}")
+            return
+
+        if dados.get('versao') != self.VERSAO:
+            return
+        self.assinatura = dados.get('assinatura')
+        self.capitulos = {int(n): entrada for n, entrada in dados.get('capitulos', {}).items()}
+        self._somas = None
+
+    def salvar(self):
+        """Grava o manifesto (substituição atômica)."""
+        dados = {
+            'versao': self.VERSAO,
+            'assinatura': self.assinatura,
+            'capitulos': {str(n): self.capitulos[n] for n in sorted(self.capitulos)}
+        }
+        temp = self.caminho_arquivo + '.tmp'
+        try:
+            with open(temp, 'w', encoding='utf-8') as f:
+                json.dump(dados, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp, self.caminho_arquivo)
+        except OSError as e:
+            print(f"⚠️ Não foi possível salvar o manifesto: {e}")
+
+    def _assinatura_atual(self) -> List:
+        """Resumo barato do estado das origens (stat da pasta, dos JSONs e do índice)."""
+        mtime_pasta = None
+        quantidade = 0
+        mtime_max = 0
+        if os.path.isdir(self.pasta_capitulos):
+            mtime_pasta = os.stat(self.pasta_capitulos).st_mtime_ns
+            for entrada in os.scandir(self.pasta_capitulos):
+                if entrada.name.startswith('cap_') and entrada.name.endswith('.json'):
+                    quantidade += 1
+                    mtime_max = max(mtime_max, entrada.stat().st_mtime_ns)
+        tamanho_indice = None
+        if self.armazem is not None:
+            tamanho_indice = os.path.getsize(self.armazem.caminho_indice)
+        return [mtime_pasta, quantidade, mtime_max, tamanho_indice]
+
+    @staticmethod
+    def _resumir(capitulo: Dict, fonte: str, versao) -> Dict:
+        conteudo = capitulo.get('conteudo', [])
+        return {
+            'numero': int(capitulo.get('numero', 0)),
+            'titulo': capitulo.get('titulo', ''),
+            'paragrafos': len(conteudo),
+            'palavras': sum(len(p.split()) for p in conteudo),
+            'fonte': fonte,
+            'versao': versao
+        }
+
+    def atualizar(self, forcar: bool = False) -> bool:
+        """
+        Sincroniza o manifesto com os arquivos da novel.
+
+        Args:
+            forcar: Verificar cada arquivo mesmo se a pasta não mudou
+
+        Returns:
+            True se alguma entrada mudou
+        """
+        with self.lock:
+            assinatura = self._assinatura_atual()
+            if not forcar and assinatura == self.assinatura:
+                return False
+
+            novos = {}
+
+            # Arquivos JSON: só o stat agora, leitura apenas se não houver versão mais nova no armazém
+            arquivos = {}  # {numero: (nome, caminho, mtime)}
+            if os.path.isdir(self.pasta_capitulos):
+                for entrada in os.scandir(self.pasta_capitulos):
+                    nome = entrada.name
+                    if not (nome.startswith('cap_') and nome.endswith('.json')):
+                        continue
+                    try:
+                        numero = int(nome[4:-5])
+                    except ValueError:
+                        continue
+                    # Com cap_001 e cap_0001, vale o de 3 dígitos (como em LeitorNovel)
+                    if numero not in arquivos or nome == f'cap_{numero:03d}.json':
+                        arquivos[numero] = (nome, entrada.path, entrada.stat().st_mtime_ns)
+
+            # Armazém compacto vence, a não ser que o JSON seja mais novo (mesma regra de LeitorNovel)
+            if self.armazem is not None:
+                for numero in self.armazem.numeros():
+                    gravado = self.armazem.gravado_em(numero)
+                    if numero in arquivos and arquivos[numero][2] > gravado:
+                        continue
+                    offset = self.armazem.indice[numero][0]
+                    atual = self.capitulos.get(numero)
+                    if atual and atual['fonte'] == 'armazem' and atual['versao'] == offset:
+                        novos[numero] = atual
+                        continue
+                    capitulo = self.armazem.obter(numero)
+                    if capitulo:
+                        capitulo.setdefault('numero', numero)
+                        novos[numero] = self._resumir(capitulo, 'armazem', offset)
+
+            for numero, (nome, caminho, mtime) in arquivos.items():
+                if numero in novos:
+                    continue
+
+                atual = self.capitulos.get(numero)
+                if atual and atual['fonte'] == nome and atual['versao'] == mtime:
+                    novos[numero] = atual
+                    continue
+
+                try:
+                    with open(caminho, 'r', encoding='utf-8') as f:
+                        capitulo = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Erro ao indexar {nome}: {e}")
+                    continue
+                capitulo['numero'] = numero
+                novos[numero] = self._resumir(capitulo, nome, mtime)
+
+            mudou = novos != self.capitulos
+            self.capitulos = novos
+            self.assinatura = assinatura
+            if mudou:
+                self._somas = None
+
+        if mudou:
+            print(f"📇 Manifesto atualizado: {len(novos)} capítulos")
+        self.salvar()
+        return mudou
+
+    def numeros(self) -> List[int]:
+        """Números dos capítulos indexados, em ordem."""
+        return sorted(self.capitulos)
+
+    def obter(self, numero: int) -> Optional[Dict]:
+        """Entrada do manifesto de um capítulo (ou None)."""
+        return self.capitulos.get(numero)
+
+    def total(self) -> int:
+        """Quantidade de capítulos indexados."""
+        return len(self.capitulos)
+
+    def _indice_palavras(self):
+        """Números em ordem e somas de sufixo das palavras (calculados uma vez por versão)."""
+        with self.lock:
+            if self._somas is None:
+                numeros = sorted(self.capitulos)
+                sufixos = [0] * (len(numeros) + 1)
+                for i in range(len(numeros) - 1, -1, -1):
+                    sufixos[i] = sufixos[i + 1] + self.capitulos[numeros[i]]['palavras']
+                self._somas = (numeros, sufixos)
+            return self._somas
+
+    def ultimo(self) -> int:
+        """Número do último capítulo (0 se não houver nenhum)."""
+        numeros, _ = self._indice_palavras()
+        return numeros[-1] if numeros else 0
+
+    def total_palavras(self, a_partir_de: int = None) -> int:
+        """
+        Soma as palavras dos capítulos (busca binária nas somas de sufixo).
+
+        Args:
+            a_partir_de: Contar só capítulos com número maior ou igual a este
+        """
+        numeros, sufixos = self._indice_palavras()
+        if a_partir_de is None:
+            return sufixos[0]
+        return sufixos[bisect_left(numeros, a_partir_de)]
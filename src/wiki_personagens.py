@@ -3,19 +3,198 @@ Sistema de Wiki de Personagens
 Identifica e mantém registro de personagens das novels
 """
 
+import atexit
 import json
 import os
+import sqlite3
+import threading
+import weakref
 from typing import Dict, List, Optional
 import re
 
 
+# Wikis com escrita pendente possível; descarregadas uma vez na saída do programa
+# (WeakSet: não mantém vivas as wikis que ninguém mais usa)
+_WIKIS_ABERTAS = weakref.WeakSet()
+
+
+def _descarregar_wikis():
+    """Grava as alterações pendentes de todas as wikis ainda abertas."""
+    for wiki in list(_WIKIS_ABERTAS):
+        wiki.descarregar()
+
+
+atexit.register(_descarregar_wikis)
+
+
+class AparicoesSQLite:
+    """
+    Aparições de personagens em SQLite (aparicoes.db ao lado do personagens.json).
+
+    A chave primária (personagem, capitulo) serve de índice para as consultas
+    por personagem; um segundo índice atende às consultas por capítulo.
+    As inserções ficam na transação aberta até commit().
+    """
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.execute('''
+            CREATE TABLE IF NOT EXISTS aparicoes (
+                personagem TEXT NOT NULL,
+                capitulo INTEGER NOT NULL,
+                PRIMARY KEY (personagem, capitulo)
+            ) WITHOUT ROWID
+        ''')
+        self.conexao.execute(
+            'CREATE INDEX IF NOT EXISTS idx_aparicoes_capitulo ON aparicoes (capitulo)'
+        )
+        self.conexao.commit()
+
+    def registrar(self, personagem: str, capitulo: int) -> bool:
+        """Registra a aparição. Retorna True se ela ainda não existia."""
+        cursor = self.conexao.execute(
+            'INSERT OR IGNORE INTO aparicoes (personagem, capitulo) VALUES (?, ?)',
+            (personagem, capitulo)
+        )
+        return cursor.rowcount > 0
+
+    def importar(self, personagem: str, capitulos: List[int]):
+        self.conexao.executemany(
+            'INSERT OR IGNORE INTO aparicoes (personagem, capitulo) VALUES (?, ?)',
+            [(personagem, c) for c in capitulos]
+        )
+
+    def capitulos(self, personagem: str) -> List[int]:
+        return [c for (c,) in self.conexao.execute(
+            'SELECT capitulo FROM aparicoes WHERE personagem = ? ORDER BY capitulo',
+            (personagem,)
+        )]
+
+    def total(self, personagem: str) -> int:
+        return self.conexao.execute(
+            'SELECT COUNT(*) FROM aparicoes WHERE personagem = ?', (personagem,)
+        ).fetchone()[0]
+
+    def personagens(self, capitulo: int) -> List[str]:
+        return [p for (p,) in self.conexao.execute(
+            'SELECT personagem FROM aparicoes WHERE capitulo = ? ORDER BY personagem',
+            (capitulo,)
+        )]
+
+    def commit(self):
+        self.conexao.commit()
+
+    def fechar(self):
+        self.conexao.commit()
+        self.conexao.close()
+
+
+# Limite de palavra em uma posição do texto (mesma regra do \b da regex)
+LIMITE_PALAVRA = re.compile(r'\b')
+
+
+def montar_trie(termos) -> Dict:
+    """Trie de caracteres dos termos; a chave '' marca o fim de um termo."""
+    trie = {}
+    for termo in termos:
+        no = trie
+        for caractere in termo:
+            no = no.setdefault(caractere, {})
+        no[''] = {}
+    return trie
+
+
+def _padrao_trie(no: Dict) -> str:
+    """
+    Gera a expressão regular de uma trie de termos.
+
+    Termos com o mesmo prefixo compartilham o ramo (ex: 'yi(?: yun)?'), então
+    em cada posição do texto o motor de regex testa só os caracteres que
+    continuam algum nome, como um autômato, em vez de tentar cada nome.
+    """
+    alternativas = [re.escape(c) + _padrao_trie(filho) for c, filho in sorted(no.items()) if c]
+    if not alternativas:
+        return ''
+    if len(alternativas) == 1 and '' not in no:
+        return alternativas[0]
+    grupo = '(?:' + '|'.join(alternativas) + ')'
+    # Fim de termo: o resto é opcional (quantificador guloso prefere o termo mais longo)
+    return grupo + '?' if '' in no else grupo
+
+
+def compilar_identificador(termos: Dict[str, str]) -> Optional['re.Pattern']:
+    """
+    Compila um único padrão que encontra qualquer um dos termos.
+
+    O termo fica dentro de um lookahead, então o padrão não consome texto e
+    finditer() testa cada início de palavra, inclusive os que estão dentro
+    de um termo já encontrado ("Ming" em "Lin Ming"). O grupo 1 é o termo
+    mais longo que começa ali; os mais curtos com o mesmo início ("Yi" em
+    "Yi Yun") são prefixos dele (ver termos_no_inicio).
+
+    Args:
+        termos: {termo em minúsculas: nome do personagem}
+
+    Returns:
+        Regex compilada (case-insensitive, com limites de palavra) ou None se não há termos
+    """
+    trie = montar_trie(termos)
+    if not trie:
+        return None
+    return re.compile(rf'\b(?=({_padrao_trie(trie)})\b)', re.IGNORECASE)
+
+
+def termos_no_inicio(texto: str, inicio: int, maior: str, trie: Dict) -> List[str]:
+    """
+    Todos os termos que começam em texto[inicio] e terminam em limite de palavra.
+
+    Args:
+        texto: Texto analisado
+        inicio: Posição do início do termo
+        maior: Termo mais longo encontrado ali (grupo 1 do identificador), em minúsculas
+        trie: Trie dos termos (montar_trie)
+
+    Returns:
+        Termos do mais curto ao mais longo
+    """
+    encontrados = []
+    no = trie
+    for i, caractere in enumerate(maior):
+        no = no.get(caractere)
+        if no is None:
+            break
+        if '' in no and LIMITE_PALAVRA.match(texto, inicio + i + 1):
+            encontrados.append(maior[:i + 1])
+    return encontrados
+
+
 class WikiPersonagens:
-    def __init__(self, caminho_novel: str):
+    """
+    Wiki de personagens com escrita adiada (write-behind).
+
+    As alterações ficam em memória e marcam a wiki como alterada; o
+    personagens.json só é regravado em descarregar(), chamado pelo leitor
+    no fim de cada capítulo, por um timer após a primeira alteração
+    pendente e na saída do programa.
+    """
+
+    # Segundos entre a primeira alteração pendente e a gravação automática
+    INTERVALO_DESCARGA = 5.0
+
+    def __init__(self, caminho_novel: str, usar_sqlite: bool = False,
+                 intervalo_descarga: Optional[float] = None):
         """
         Inicializa a wiki para uma novel específica.
         
         Args:
             caminho_novel: Caminho da pasta da novel
+            usar_sqlite: Guardar as aparições em aparicoes.db (SQLite) em vez
+                         de listas no personagens.json. Um aparicoes.db já
+                         existente é sempre usado (as aparições migradas só
+                         estão nele)
+            intervalo_descarga: Segundos até a gravação automática
+                                (None = padrão, 0 = só em descarregar())
         """
         self.caminho_novel = caminho_novel
         self.caminho_personagens = os.path.join(
@@ -27,6 +206,23 @@ class WikiPersonagens:
             self.caminho_personagens, 'personagens.json'
         )
         self.personagens = self._carregar_wiki()
+        
+        # Estado da escrita adiada
+        self.lock = threading.RLock()
+        self.alterado = False
+        self.intervalo_descarga = (self.INTERVALO_DESCARGA if intervalo_descarga is None
+                                   else intervalo_descarga)
+        self._timer = None
+        self._aparicoes_json = {}  # {nome: set(capitulos)} para não varrer as listas
+        self._identificador = None  # (regex, {termo: nome}), refeito quando nomes mudam
+        
+        self.aparicoes_db = None
+        caminho_db = os.path.join(self.caminho_personagens, 'aparicoes.db')
+        if usar_sqlite or os.path.exists(caminho_db):
+            self.aparicoes_db = AparicoesSQLite(caminho_db)
+            self._migrar_aparicoes()
+        
+        _WIKIS_ABERTAS.add(self)
     
     def _carregar_wiki(self) -> Dict:
         """Carrega a wiki de personagens do arquivo."""
@@ -35,10 +231,60 @@ class WikiPersonagens:
                 return json.load(f)
         return {}
     
+    def _migrar_aparicoes(self):
+        """Move as listas de aparições do JSON para o SQLite (uma vez)."""
+        migrados = False
+        for nome, info in self.personagens.items():
+            if info.get('aparicoes'):
+                self.aparicoes_db.importar(nome, info['aparicoes'])
+                migrados = True
+            info.pop('aparicoes', None)
+        if migrados:
+            self.aparicoes_db.commit()
+            self.alterado = True
+            self.descarregar()
+    
     def salvar_wiki(self):
-        """Salva a wiki de personagens no arquivo."""
-        with open(self.arquivo_wiki, 'w', encoding='utf-8') as f:
-            json.dump(self.personagens, f, ensure_ascii=False, indent=2)
+        """Salva a wiki de personagens no arquivo imediatamente."""
+        with self.lock:
+            self.alterado = True
+            self.descarregar()
+    
+    def _marcar_alterado(self):
+        """Marca alterações pendentes e agenda a gravação automática."""
+        self.alterado = True
+        if self.intervalo_descarga and self._timer is None:
+            self._timer = threading.Timer(self.intervalo_descarga, self.descarregar)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def descarregar(self):
+        """Grava as alterações pendentes (personagens.json e aparições)."""
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            
+            if self.aparicoes_db is not None:
+                self.aparicoes_db.commit()
+            
+            if not self.alterado:
+                return
+            
+            temp = self.arquivo_wiki + '.tmp'
+            with open(temp, 'w', encoding='utf-8') as f:
+                json.dump(self.personagens, f, ensure_ascii=False, indent=2)
+            os.replace(temp, self.arquivo_wiki)
+            self.alterado = False
+    
+    def fechar(self):
+        """Grava o que estiver pendente e fecha o banco de aparições."""
+        self.descarregar()
+        if self.aparicoes_db is not None:
+            with self.lock:
+                self.aparicoes_db.fechar()
+                self.aparicoes_db = None
+        _WIKIS_ABERTAS.discard(self)
     
     def adicionar_personagem(self, nome: str, descricao: str = '', 
                             voz_id: Optional[str] = None, 
@@ -52,21 +298,24 @@ class WikiPersonagens:
             voz_id: ID da voz associada
             primeiro_aparecimento: Capítulo de primeira aparição
         """
-        if nome in self.personagens:
-            print(f"Personagem '{nome}' já existe na wiki")
-            return
-        
-        self.personagens[nome] = {
-            'nome': nome,
-            'descricao': descricao,
-            'voz_id': voz_id,
-            'primeiro_aparecimento': primeiro_aparecimento,
-            'aparicoes': [],
-            'dialogos_exemplo': [],
-            'caracteristicas': []
-        }
-        
-        self.salvar_wiki()
+        with self.lock:
+            if nome in self.personagens:
+                print(f"Personagem '{nome}' já existe na wiki")
+                return
+            
+            self.personagens[nome] = {
+                'nome': nome,
+                'descricao': descricao,
+                'voz_id': voz_id,
+                'primeiro_aparecimento': primeiro_aparecimento,
+                'dialogos_exemplo': [],
+                'caracteristicas': []
+            }
+            if self.aparicoes_db is None:
+                self.personagens[nome]['aparicoes'] = []
+            
+            self._identificador = None
+            self._marcar_alterado()
         print(f"Personagem '{nome}' adicionado à wiki")
     
     def atualizar_personagem(self, nome: str, **kwargs):
@@ -81,10 +330,33 @@ class WikiPersonagens:
             print(f"Personagem '{nome}' não encontrado")
             return
         
-        self.personagens[nome].update(kwargs)
-        self.salvar_wiki()
+        with self.lock:
+            self.personagens[nome].update(kwargs)
+            self._identificador = None
+            self._marcar_alterado()
         print(f"Personagem '{nome}' atualizado")
     
+    def adicionar_alias(self, nome: str, alias: str, titulo: bool = False):
+        """
+        Adiciona outro nome pelo qual o personagem é citado.
+        
+        Args:
+            nome: Nome do personagem
+            alias: Apelido ou forma alternativa (ex: 'Pequeno Yun')
+            titulo: Se True, guarda como título (ex: 'Ancião Lin')
+        """
+        if nome not in self.personagens:
+            print(f"Personagem '{nome}' não encontrado")
+            return
+        
+        campo = 'titulos' if titulo else 'aliases'
+        with self.lock:
+            lista = self.personagens[nome].setdefault(campo, [])
+            if alias not in lista:
+                lista.append(alias)
+                self._identificador = None
+                self._marcar_alterado()
+    
     def associar_voz(self, nome: str, voz_id: str):
         """
         Associa uma voz a um personagem.
@@ -96,8 +368,9 @@ class WikiPersonagens:
         if nome not in self.personagens:
             self.adicionar_personagem(nome, voz_id=voz_id)
         else:
-            self.personagens[nome]['voz_id'] = voz_id
-            self.salvar_wiki()
+            with self.lock:
+                self.personagens[nome]['voz_id'] = voz_id
+                self._marcar_alterado()
         
         print(f"Voz '{voz_id}' associada a '{nome}'")
     
@@ -115,9 +388,19 @@ class WikiPersonagens:
                 primeiro_aparecimento=f"Capítulo {numero_capitulo}"
             )
         
-        if numero_capitulo not in self.personagens[nome]['aparicoes']:
-            self.personagens[nome]['aparicoes'].append(numero_capitulo)
-            self.salvar_wiki()
+        with self.lock:
+            if self.aparicoes_db is not None:
+                self.aparicoes_db.registrar(nome, numero_capitulo)
+                return
+            
+            aparicoes = self.personagens[nome].setdefault('aparicoes', [])
+            vistos = self._aparicoes_json.get(nome)
+            if vistos is None:
+                vistos = self._aparicoes_json[nome] = set(aparicoes)
+            if numero_capitulo not in vistos:
+                vistos.add(numero_capitulo)
+                aparicoes.append(numero_capitulo)
+                self._marcar_alterado()
     
     def adicionar_dialogo_exemplo(self, nome: str, dialogo: str):
         """
@@ -130,13 +413,52 @@ class WikiPersonagens:
         if nome not in self.personagens:
             return
         
-        if len(self.personagens[nome]['dialogos_exemplo']) < 5:
-            self.personagens[nome]['dialogos_exemplo'].append(dialogo)
-            self.salvar_wiki()
+        with self.lock:
+            if len(self.personagens[nome]['dialogos_exemplo']) < 5:
+                self.personagens[nome]['dialogos_exemplo'].append(dialogo)
+                self._marcar_alterado()
+    
+    def obter_aparicoes(self, nome: str) -> List[int]:
+        """
+        Obtém os capítulos em que um personagem aparece.
+        
+        Args:
+            nome: Nome do personagem
+            
+        Returns:
+            Lista de números de capítulos
+        """
+        with self.lock:
+            if self.aparicoes_db is not None:
+                return self.aparicoes_db.capitulos(nome)
+            return sorted(self.personagens.get(nome, {}).get('aparicoes', []))
+    
+    def total_aparicoes(self, nome: str) -> int:
+        """Número de capítulos em que o personagem aparece."""
+        with self.lock:
+            if self.aparicoes_db is not None:
+                return self.aparicoes_db.total(nome)
+            return len(self.personagens.get(nome, {}).get('aparicoes', []))
+    
+    def personagens_no_capitulo(self, numero_capitulo: int) -> List[str]:
+        """
+        Lista os personagens que aparecem em um capítulo.
+        
+        Args:
+            numero_capitulo: Número do capítulo
+            
+        Returns:
+            Lista de nomes de personagens
+        """
+        with self.lock:
+            if self.aparicoes_db is not None:
+                return self.aparicoes_db.personagens(numero_capitulo)
+            return [nome for nome, info in self.personagens.items()
+                    if numero_capitulo in info.get('aparicoes', [])]
     
     def identificar_personagens_texto(self, texto: str) -> List[str]:
         """
-        Identifica personagens conhecidos em um texto.
+        Identifica personagens conhecidos em um texto (pelo nome, aliases e títulos).
         
         Args:
             texto: Texto para análise
@@ -144,14 +466,34 @@ class WikiPersonagens:
         Returns:
             Lista de nomes de personagens encontrados
         """
-        personagens_encontrados = []
+        padrao, trie, termos, ordem = self._obter_identificador()
+        if padrao is None:
+            return []
         
-        for nome in self.personagens.keys():
-            # Busca pelo nome completo ou variações
-            if re.search(rf'\b{re.escape(nome)}\b', texto, re.IGNORECASE):
-                personagens_encontrados.append(nome)
+        # Uma passada pelo texto; nomes contidos em outros também contam ("Ming" em "Lin Ming")
+        encontrados = set()
+        for match in padrao.finditer(texto):
+            for termo in termos_no_inicio(texto, match.start(), match.group(1).lower(), trie):
+                nome = termos.get(termo)
+                if nome is not None:
+                    encontrados.add(nome)
         
-        return personagens_encontrados
+        return sorted(encontrados, key=ordem.get)
+    
+    def _obter_identificador(self):
+        """Retorna (regex, trie, {termo: nome}, {nome: ordem}), compilando se a wiki mudou."""
+        with self.lock:
+            if self._identificador is None:
+                termos = {}
+                for nome, info in self.personagens.items():
+                    for termo in [nome, *info.get('aliases', []), *info.get('titulos', [])]:
+                        termo = termo.strip().lower()
+                        if termo:
+                            termos.setdefault(termo, nome)
+                ordem = {nome: i for i, nome in enumerate(self.personagens)}
+                self._identificador = (compilar_identificador(termos), montar_trie(termos),
+                                       termos, ordem)
+            return self._identificador
     
     def listar_personagens(self) -> List[str]:
         """
@@ -172,7 +514,10 @@ class WikiPersonagens:
         Returns:
             Dicionário com informações ou None
         """
-        return self.personagens.get(nome)
+        info = self.personagens.get(nome)
+        if info is not None and self.aparicoes_db is not None:
+            info = {**info, 'aparicoes': self.obter_aparicoes(nome)}
+        return info
     
     def exportar_resumo(self) -> str:
         """
@@ -191,7 +536,7 @@ class WikiPersonagens:
                 resumo += f"  Voz: {info['voz_id']}\n"
             if info.get('primeiro_aparecimento'):
                 resumo += f"  Primeira aparição: {info['primeiro_aparecimento']}\n"
-            resumo += f"  Total de aparições: {len(info.get('aparicoes', []))}\n\n"
+            resumo += f"  Total de aparições: {self.total_aparicoes(nome)}\n\n"
         
         return resumo
 